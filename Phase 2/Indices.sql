@@ -35,3 +35,18 @@ CREATE INDEX idx_buildings_LID ON buildings (LID);
 CREATE INDEX idx_loc_uni_campus_name ON location (university_id, campus_name, name);
 
 
+-- keyset pagination of a university's locations ordered by name (LID is the implicit PK suffix)
+CREATE INDEX idx_location_uni_name ON location (university_id, name);
+
+-- type-filtered location listings: one range scan per (university, type), already ordered by name
+CREATE INDEX idx_location_uni_type_name ON location (university_id, location_type, name);
+
+-- rooms of a building (DeleteLocation clears their building when it is deleted)
+CREATE INDEX idx_location_building ON location (building_LID);
+
+-- name lookups of /api/locationRatings, /api/reviews and /api/addReview (one probe per university + name)
+CREATE INDEX idx_location_uni_name_key ON location (university_id, name_key);
+
+-- keyset-paginated review listings of a location (review_pages.py): newest / oldest first and best / worst first
+CREATE INDEX idx_ratings_lid_date ON ratings (LID, date, RID);
+CREATE INDEX idx_ratings_lid_score ON ratings (LID, score, RID);
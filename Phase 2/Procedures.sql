@@ -55,8 +55,22 @@ BEGIN
         SIGNAL SQLSTATE '45000'
             SET MESSAGE_TEXT = 'Error: University not found for the given name and state.';
     ELSE
-        -- Delete the university (cascade will handle related records)
-        DELETE FROM university WHERE university_id = univ_id;
+        -- Delete the university (cascade will handle related records). Its users'
+        -- ratings go with them, so take those out of the rating summaries first.
+        BEGIN
+            DECLARE EXIT HANDLER FOR SQLEXCEPTION
+            BEGIN
+                ROLLBACK;
+                RESIGNAL;
+            END;
+
+            START TRANSACTION;
+
+            CALL RemoveRatingsFromSummary(NULL, univ_id);
+            DELETE FROM university WHERE university_id = univ_id;
+
+            COMMIT;
+        END;
 
         -- Confirm deletion
         SELECT CONCAT('University "', p_name, '" in ', p_state, ' has been removed.') AS message;
@@ -368,15 +382,157 @@ BEGIN
             SET MESSAGE_TEXT = 'Error: Location not found for the specified campus and university.';
     END IF;
 
-    -- 3) Delete the location (CASCADE removes building/nonbuilding/rooms automatically)
+    -- 3) Rooms of a deleted building lose their rooms row through the cascade, which
+    --    doesn't fire the location type triggers: clear their building here
+    UPDATE location
+    SET building_LID = NULL, building_name = NULL
+    WHERE building_LID = v_LID;
+
+    -- 4) Delete the location (CASCADE removes building/nonbuilding/rooms automatically)
     DELETE FROM location WHERE LID = v_LID;
 
-    -- 4) Return success
+    -- 5) Return success
     SELECT CONCAT('Location "', p_location_name, '" was successfully deleted.') AS message;
 
 END$$
 DELIMITER ;
 
+-- ===========================================
+-- LOCATION TYPE (denormalized on location)
+-- ===========================================
+-- location.location_type / building_LID / building_name hold what used to be
+-- computed per query from the subtype tables. The triggers below recompute them
+-- whenever a buildings, nonbuildings or rooms row changes.
+--
+-- Bulk loaders (web-scraping/loader.py, benchmarks/generate_dataset.py) write
+-- the columns with the location rows themselves and SET
+-- @skip_location_type_sync = 1 for their session, which turns the per-row
+-- triggers off; anything else loading with it set must call
+-- RebuildLocationTypes() once at the end.
+--
+-- A trigger on location can't update other location rows, so renaming a
+-- building through a plain UPDATE leaves the old name on its rooms: rename
+-- locations with RenameLocation(), which updates both. Drift can be found with
+-- `python location_types.py check` in Phase 3/backend and fixed with
+-- RebuildLocationTypes().
+
+DELIMITER $$
+CREATE PROCEDURE SyncLocationType(
+    IN p_LID INT
+)
+BEGIN
+    UPDATE location L
+    LEFT JOIN buildings B ON B.LID = L.LID
+    LEFT JOIN nonbuildings NB ON NB.LID = L.LID
+    LEFT JOIN rooms R ON R.LID = L.LID
+    LEFT JOIN location BL ON BL.LID = R.building_LID
+    SET L.location_type = CASE
+            WHEN B.LID IS NOT NULL THEN 'Building'
+            WHEN NB.LID IS NOT NULL THEN 'Non-building'
+            ELSE 'Room'
+        END,
+        L.building_LID = IF(B.LID IS NULL AND NB.LID IS NULL, R.building_LID, NULL),
+        L.building_name = IF(B.LID IS NULL AND NB.LID IS NULL, BL.name, NULL)
+    WHERE L.LID = p_LID;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE PROCEDURE RebuildLocationTypes()
+BEGIN
+    -- Same as SyncLocationType, for every location at once
+    UPDATE location L
+    LEFT JOIN buildings B ON B.LID = L.LID
+    LEFT JOIN nonbuildings NB ON NB.LID = L.LID
+    LEFT JOIN rooms R ON R.LID = L.LID
+    LEFT JOIN location BL ON BL.LID = R.building_LID
+    SET L.location_type = CASE
+            WHEN B.LID IS NOT NULL THEN 'Building'
+            WHEN NB.LID IS NOT NULL THEN 'Non-building'
+            ELSE 'Room'
+        END,
+        L.building_LID = IF(B.LID IS NULL AND NB.LID IS NULL, R.building_LID, NULL),
+        L.building_name = IF(B.LID IS NULL AND NB.LID IS NULL, BL.name, NULL);
+
+    SELECT ROW_COUNT() AS changed;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE PROCEDURE RenameLocation(
+    IN p_LID INT,
+    IN p_name VARCHAR(100)
+)
+BEGIN
+    UPDATE location SET name = p_name WHERE LID = p_LID;
+
+    -- The building name denormalized onto its rooms
+    UPDATE location SET building_name = p_name WHERE building_LID = p_LID;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER trg_buildings_after_insert AFTER INSERT ON buildings
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(NEW.LID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_buildings_after_delete AFTER DELETE ON buildings
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(OLD.LID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_nonbuildings_after_insert AFTER INSERT ON nonbuildings
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(NEW.LID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_nonbuildings_after_delete AFTER DELETE ON nonbuildings
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(OLD.LID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_rooms_after_insert AFTER INSERT ON rooms
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(NEW.LID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_rooms_after_update AFTER UPDATE ON rooms
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL
+       AND NOT (NEW.LID <=> OLD.LID AND NEW.building_LID <=> OLD.building_LID) THEN
+        CALL SyncLocationType(NEW.LID);
+        IF NEW.LID <> OLD.LID THEN
+            CALL SyncLocationType(OLD.LID);
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_rooms_after_delete AFTER DELETE ON rooms
+FOR EACH ROW
+BEGIN
+    IF @skip_location_type_sync IS NULL THEN
+        CALL SyncLocationType(OLD.LID);
+    END IF;
+END$$
+DELIMITER ;
+
 -- ===========================================
 -- END OF ADMIN PROCEDURES
 -- ===========================================
@@ -451,15 +607,247 @@ BEGIN
             SET MESSAGE_TEXT = 'Error: Invalid username or password.';
     END IF;
 
-    -- Step 3: Delete the user
-    DELETE FROM users
-    WHERE uid = v_uid;
+    -- Step 3: Delete the user; the cascade removes their ratings, so take them out
+    -- of the rating summaries in the same transaction
+    BEGIN
+        DECLARE EXIT HANDLER FOR SQLEXCEPTION
+        BEGIN
+            ROLLBACK;
+            RESIGNAL;
+        END;
+
+        START TRANSACTION;
+
+        CALL RemoveRatingsFromSummary(v_uid, NULL);
+        DELETE FROM users
+        WHERE uid = v_uid;
+
+        COMMIT;
+    END;
 
     -- Step 4: Return the deleted uid
     SELECT v_uid AS deleted_user_id;
 END$$
 DELIMITER ;
 
+DELIMITER $$
+CREATE PROCEDURE ApplyRatingToSummary(
+    IN p_RID INT,
+    IN p_sign INT   -- 1 after a rating (and its tags) was inserted, -1 before it is deleted
+)
+BEGIN
+    DECLARE v_LID INT;
+    DECLARE v_score INT;
+    DECLARE v_noise INT;
+    DECLARE v_cleanliness INT;
+    DECLARE v_equipment_quality INT;
+    DECLARE v_wifi_strength INT;
+    DECLARE v_hist JSON;
+    DECLARE v_min INT;
+    DECLARE v_max INT;
+    DECLARE v_i INT;
+    DECLARE v_tag VARCHAR(64);
+    DECLARE v_done INT DEFAULT 0;
+    DECLARE equipment_cur CURSOR FOR
+        SELECT equipment_tag FROM rating_equipment WHERE RID = p_RID;
+    DECLARE accessibility_cur CURSOR FOR
+        SELECT accessibility_tag FROM rating_accessibility WHERE RID = p_RID;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = 1;
+
+    -- Runs inside the caller's transaction so the summary commits (or rolls back) with the rating
+
+    -- Step 1: Read the rating
+    SELECT LID, score, noise, cleanliness, equipment_quality, wifi_strength
+    INTO v_LID, v_score, v_noise, v_cleanliness, v_equipment_quality, v_wifi_strength
+    FROM ratings
+    WHERE RID = p_RID;
+
+    IF v_LID IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Error: Rating not found.';
+    END IF;
+
+    -- Step 2: Make sure the location has a summary row
+    INSERT INTO location_rating_summary (LID) VALUES (v_LID)
+    ON DUPLICATE KEY UPDATE LID = LID;
+
+    -- Step 3: Counts, sums and histograms (each histogram is a JSON array indexed by value - 1)
+    UPDATE location_rating_summary
+    SET review_count = review_count + p_sign,
+        score_sum = score_sum + p_sign * v_score,
+        noise_sum = noise_sum + p_sign * COALESCE(v_noise, 0),
+        cleanliness_sum = cleanliness_sum + p_sign * COALESCE(v_cleanliness, 0),
+        equipment_quality_sum = equipment_quality_sum + p_sign * COALESCE(v_equipment_quality, 0),
+        wifi_strength_sum = wifi_strength_sum + p_sign * COALESCE(v_wifi_strength, 0),
+        score_hist = JSON_SET(score_hist, CONCAT('$[', v_score - 1, ']'),
+                              JSON_EXTRACT(score_hist, CONCAT('$[', v_score - 1, ']')) + p_sign),
+        noise_hist = IF(v_noise IS NULL, noise_hist,
+            JSON_SET(noise_hist, CONCAT('$[', v_noise - 1, ']'),
+                     JSON_EXTRACT(noise_hist, CONCAT('$[', v_noise - 1, ']')) + p_sign)),
+        cleanliness_hist = IF(v_cleanliness IS NULL, cleanliness_hist,
+            JSON_SET(cleanliness_hist, CONCAT('$[', v_cleanliness - 1, ']'),
+                     JSON_EXTRACT(cleanliness_hist, CONCAT('$[', v_cleanliness - 1, ']')) + p_sign)),
+        equipment_quality_hist = IF(v_equipment_quality IS NULL, equipment_quality_hist,
+            JSON_SET(equipment_quality_hist, CONCAT('$[', v_equipment_quality - 1, ']'),
+                     JSON_EXTRACT(equipment_quality_hist, CONCAT('$[', v_equipment_quality - 1, ']')) + p_sign)),
+        wifi_strength_hist = IF(v_wifi_strength IS NULL, wifi_strength_hist,
+            JSON_SET(wifi_strength_hist, CONCAT('$[', v_wifi_strength - 1, ']'),
+                     JSON_EXTRACT(wifi_strength_hist, CONCAT('$[', v_wifi_strength - 1, ']')) + p_sign)),
+        score_min = IF(p_sign > 0, LEAST(COALESCE(score_min, v_score), v_score), score_min),
+        score_max = IF(p_sign > 0, GREATEST(COALESCE(score_max, v_score), v_score), score_max)
+    WHERE LID = v_LID;
+
+    -- Step 4: After a delete, min/max come from the updated histogram (no rescan of ratings)
+    IF p_sign < 0 THEN
+        SELECT score_hist INTO v_hist FROM location_rating_summary WHERE LID = v_LID;
+        SET v_i = 1;
+        WHILE v_i <= 10 DO
+            IF JSON_EXTRACT(v_hist, CONCAT('$[', v_i - 1, ']')) > 0 THEN
+                SET v_min = COALESCE(v_min, v_i);
+                SET v_max = v_i;
+            END IF;
+            SET v_i = v_i + 1;
+        END WHILE;
+        UPDATE location_rating_summary
+        SET score_min = v_min, score_max = v_max
+        WHERE LID = v_LID;
+    END IF;
+
+    -- Step 5: Tag frequencies
+    SET v_done = 0;
+    OPEN equipment_cur;
+    equipment_loop: LOOP
+        FETCH equipment_cur INTO v_tag;
+        IF v_done = 1 THEN
+            LEAVE equipment_loop;
+        END IF;
+        UPDATE location_rating_summary
+        SET equipment_tag_counts = JSON_SET(equipment_tag_counts, CONCAT('$."', v_tag, '"'),
+                COALESCE(JSON_EXTRACT(equipment_tag_counts, CONCAT('$."', v_tag, '"')), 0) + p_sign)
+        WHERE LID = v_LID;
+    END LOOP;
+    CLOSE equipment_cur;
+
+    SET v_done = 0;
+    OPEN accessibility_cur;
+    accessibility_loop: LOOP
+        FETCH accessibility_cur INTO v_tag;
+        IF v_done = 1 THEN
+            LEAVE accessibility_loop;
+        END IF;
+        UPDATE location_rating_summary
+        SET accessibility_tag_counts = JSON_SET(accessibility_tag_counts, CONCAT('$."', v_tag, '"'),
+                COALESCE(JSON_EXTRACT(accessibility_tag_counts, CONCAT('$."', v_tag, '"')), 0) + p_sign)
+        WHERE LID = v_LID;
+    END LOOP;
+    CLOSE accessibility_cur;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE PROCEDURE RemoveRatingsFromSummary(
+    IN p_uid INT,            -- ratings written by this user
+    IN p_university_id INT   -- or by any user of this university
+)
+BEGIN
+    DECLARE v_RID INT;
+    DECLARE v_done INT DEFAULT 0;
+    -- A deleted university's own locations drop their summary rows through the
+    -- cascade, so only ratings elsewhere need subtracting
+    DECLARE rating_cur CURSOR FOR
+        SELECT R.RID
+        FROM ratings R
+        JOIN users U ON U.uid = R.UID
+        JOIN location L ON L.LID = R.LID
+        WHERE (p_uid IS NULL OR R.UID = p_uid)
+          AND (p_university_id IS NULL
+               OR (U.university_id = p_university_id AND L.university_id <> p_university_id));
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = 1;
+
+    -- Called before a DELETE whose cascade removes ratings (DeleteUser,
+    -- DeleteUniversity), inside the caller's transaction
+
+    OPEN rating_cur;
+    rating_loop: LOOP
+        FETCH rating_cur INTO v_RID;
+        IF v_done = 1 THEN
+            LEAVE rating_loop;
+        END IF;
+        CALL ApplyRatingToSummary(v_RID, -1);
+    END LOOP;
+    CLOSE rating_cur;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE PROCEDURE RebuildLocationRatingSummary()
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- Step 1: Recompute everything from the ratings table
+    DELETE FROM location_rating_summary;
+
+    INSERT INTO location_rating_summary (
+        LID, review_count, score_sum, score_min, score_max,
+        noise_sum, cleanliness_sum, equipment_quality_sum, wifi_strength_sum,
+        score_hist, noise_hist, cleanliness_hist, equipment_quality_hist, wifi_strength_hist
+    )
+    SELECT LID, COUNT(*), SUM(score), MIN(score), MAX(score),
+           COALESCE(SUM(noise), 0), COALESCE(SUM(cleanliness), 0),
+           COALESCE(SUM(equipment_quality), 0), COALESCE(SUM(wifi_strength), 0),
+           JSON_ARRAY(COUNT(IF(score = 1, 1, NULL)), COUNT(IF(score = 2, 1, NULL)), COUNT(IF(score = 3, 1, NULL)),
+                      COUNT(IF(score = 4, 1, NULL)), COUNT(IF(score = 5, 1, NULL)), COUNT(IF(score = 6, 1, NULL)),
+                      COUNT(IF(score = 7, 1, NULL)), COUNT(IF(score = 8, 1, NULL)), COUNT(IF(score = 9, 1, NULL)),
+                      COUNT(IF(score = 10, 1, NULL))),
+           JSON_ARRAY(COUNT(IF(noise = 1, 1, NULL)), COUNT(IF(noise = 2, 1, NULL)), COUNT(IF(noise = 3, 1, NULL)),
+                      COUNT(IF(noise = 4, 1, NULL)), COUNT(IF(noise = 5, 1, NULL))),
+           JSON_ARRAY(COUNT(IF(cleanliness = 1, 1, NULL)), COUNT(IF(cleanliness = 2, 1, NULL)), COUNT(IF(cleanliness = 3, 1, NULL)),
+                      COUNT(IF(cleanliness = 4, 1, NULL)), COUNT(IF(cleanliness = 5, 1, NULL))),
+           JSON_ARRAY(COUNT(IF(equipment_quality = 1, 1, NULL)), COUNT(IF(equipment_quality = 2, 1, NULL)), COUNT(IF(equipment_quality = 3, 1, NULL))),
+           JSON_ARRAY(COUNT(IF(wifi_strength = 1, 1, NULL)), COUNT(IF(wifi_strength = 2, 1, NULL)), COUNT(IF(wifi_strength = 3, 1, NULL)))
+    FROM ratings
+    GROUP BY LID;
+
+    -- Step 2: Tag frequencies
+    UPDATE location_rating_summary S
+    JOIN (
+        SELECT LID, JSON_OBJECTAGG(tag, n) AS counts
+        FROM (
+            SELECT R.LID, T.equipment_tag AS tag, COUNT(*) AS n
+            FROM rating_equipment T
+            JOIN ratings R ON R.RID = T.RID
+            GROUP BY R.LID, T.equipment_tag
+        ) AS per_tag
+        GROUP BY LID
+    ) AS C ON C.LID = S.LID
+    SET S.equipment_tag_counts = C.counts;
+
+    UPDATE location_rating_summary S
+    JOIN (
+        SELECT LID, JSON_OBJECTAGG(tag, n) AS counts
+        FROM (
+            SELECT R.LID, T.accessibility_tag AS tag, COUNT(*) AS n
+            FROM rating_accessibility T
+            JOIN ratings R ON R.RID = T.RID
+            GROUP BY R.LID, T.accessibility_tag
+        ) AS per_tag
+        GROUP BY LID
+    ) AS C ON C.LID = S.LID
+    SET S.accessibility_tag_counts = C.counts;
+
+    COMMIT;
+
+    -- Step 3: Return how many locations have a summary
+    SELECT COUNT(*) AS locations FROM location_rating_summary;
+END$$
+DELIMITER ;
+
 DELIMITER $$
 CREATE PROCEDURE AddRating(
     IN p_username VARCHAR(50),
@@ -478,7 +866,7 @@ BEGIN
     DECLARE v_uid INT;
     DECLARE v_univ_id INT;
     DECLARE v_LID INT;
-
+    DECLARE v_RID INT;
     -- Step 1: Get university ID
     SET v_univ_id = GetUniversityIDByNameAndState(p_university_name, p_state);
     IF v_univ_id IS NULL THEN
@@ -537,18 +925,35 @@ BEGIN
             SET MESSAGE_TEXT = 'Error: WiFi strength must be between 1 and 3.';
     END IF;
 
-    -- Step 5: Insert the rating
-    INSERT INTO ratings (
-        score, noise, cleanliness, equipment_quality, wifi_strength,
-        extra_comments, UID, LID
-    )
-    VALUES (
-        p_score, p_noise, p_cleanliness, p_equipment_quality, p_wifi_strength,
-        p_extra_comments, v_uid, v_LID
-    );
+    -- Step 5: Insert the rating and update the location's summary in one transaction
+    -- (the handler covers only this block, so the validation SIGNALs above
+    -- leave a transaction the caller has open alone)
+    BEGIN
+        DECLARE EXIT HANDLER FOR SQLEXCEPTION
+        BEGIN
+            ROLLBACK;
+            RESIGNAL;
+        END;
+
+        START TRANSACTION;
+
+        INSERT INTO ratings (
+            score, noise, cleanliness, equipment_quality, wifi_strength,
+            extra_comments, UID, LID
+        )
+        VALUES (
+            p_score, p_noise, p_cleanliness, p_equipment_quality, p_wifi_strength,
+            p_extra_comments, v_uid, v_LID
+        );
+
+        SET v_RID = LAST_INSERT_ID();
+        CALL ApplyRatingToSummary(v_RID, 1);
+
+        COMMIT;
+    END;
 
     -- Step 6: Return the new rating ID
-    SELECT LAST_INSERT_ID() AS rating_id;
+    SELECT v_RID AS rating_id;
 
 END$$
 DELIMITER ;
@@ -565,7 +970,7 @@ BEGIN
     DECLARE v_uid INT;
     DECLARE v_univ_id INT;
     DECLARE v_LID INT;
-
+    DECLARE v_RID INT;
     -- Step 1: Get university ID
     SET v_univ_id = GetUniversityIDByNameAndState(p_university_name, p_state);
     IF v_univ_id IS NULL THEN
@@ -599,19 +1004,35 @@ BEGIN
     END IF;
 
     -- Step 4: Check if rating exists
-    IF NOT EXISTS (
-        SELECT 1 FROM ratings
-        WHERE UID = v_uid
-          AND LID = v_LID
-    ) THEN
+    SELECT RID INTO v_RID
+    FROM ratings
+    WHERE UID = v_uid
+      AND LID = v_LID;
+
+    IF v_RID IS NULL THEN
         SIGNAL SQLSTATE '45000'
             SET MESSAGE_TEXT = 'Error: Rating does not exist.';
     END IF;
 
-    -- Step 5: Delete the rating
-    DELETE FROM ratings
-    WHERE UID = v_uid
-      AND LID = v_LID;
+    -- Step 5: Take the rating out of the location's summary and delete it in one transaction
+    -- (the handler covers only this block, so the validation SIGNALs above
+    -- leave a transaction the caller has open alone)
+    BEGIN
+        DECLARE EXIT HANDLER FOR SQLEXCEPTION
+        BEGIN
+            ROLLBACK;
+            RESIGNAL;
+        END;
+
+        START TRANSACTION;
+
+        CALL ApplyRatingToSummary(v_RID, -1);
+
+        DELETE FROM ratings
+        WHERE RID = v_RID;
+
+        COMMIT;
+    END;
 
     -- Step 6: Return success message
     SELECT CONCAT('Rating by user "', p_username, '" for location "', p_location_name, '" has been deleted.') AS message;
@@ -645,17 +1066,13 @@ BEGIN
     FROM campus
     WHERE university_id = v_univ_id;
 
-    -- Step 4: Show all locations and rooms with ratings
+    -- Step 4: Show all locations and rooms with ratings (rooms listed under their building)
     SELECT 
-        L.name AS location_name,
-        CASE 
-            WHEN B.LID IS NOT NULL THEN 'Building'
-            WHEN NB.LID IS NOT NULL THEN 'Non-building'
-            ELSE 'Unknown'
-        END AS location_type,
-        NULL AS room_number,
-        NULL AS room_type,
-        NULL AS room_size,
+        COALESCE(L.building_name, L.name) AS location_name,
+        L.location_type,
+        Rm.room_number,
+        Rm.room_type,
+        Rm.room_size,
         U.username AS rated_by,
         R.score,
         R.noise,
@@ -665,35 +1082,10 @@ BEGIN
         R.extra_comments,
         R.date
     FROM location L
-    LEFT JOIN buildings B ON L.LID = B.LID
-    LEFT JOIN nonbuildings NB ON L.LID = NB.LID
+    LEFT JOIN rooms Rm ON L.LID = Rm.LID
     LEFT JOIN ratings R ON L.LID = R.LID
     LEFT JOIN users U ON R.UID = U.uid
     WHERE L.university_id = v_univ_id
-
-    UNION ALL
-
-    SELECT 
-        Bld.name AS location_name,
-        'Room' AS location_type,
-        Rm.room_number,
-        Rm.room_type,
-        Rm.room_size,
-        U.username AS rated_by,
-        Rt.score,
-        Rt.noise,
-        Rt.cleanliness,
-        Rt.equipment_quality,
-        Rt.wifi_strength,
-        Rt.extra_comments,
-        Rt.date
-    FROM rooms Rm
-    JOIN buildings Bl ON Rm.building_LID = Bl.LID
-    JOIN location Bld ON Bl.LID = Bld.LID
-    LEFT JOIN ratings Rt ON Rm.LID = Rt.LID
-    LEFT JOIN users U ON Rt.UID = U.uid
-    WHERE Bld.university_id = v_univ_id
-
     ORDER BY location_name, location_type, room_number;
 
 END$$
@@ -24,6 +24,12 @@ CREATE TABLE location (
     image LONGBLOB,
     campus_name VARCHAR(100) NOT NULL,
     university_id INT NOT NULL,
+    -- Denormalized from buildings / nonbuildings / rooms by the SyncLocationType triggers
+    location_type ENUM('Building', 'Non-building', 'Room') NOT NULL DEFAULT 'Room',
+    building_LID INT NULL,            -- rooms only: rooms.building_LID
+    building_name VARCHAR(100) NULL,  -- rooms only: name of that building
+    -- Name lookups of the web app ("BEH - Room 1000" and "BEH 1000" both match), see location_lookup.py
+    name_key VARCHAR(100) AS (REPLACE(name, ' - Room ', ' ')) STORED,
     FOREIGN KEY (campus_name, university_id)
         REFERENCES campus(campus_name, university_id)
         ON DELETE CASCADE
@@ -271,3 +277,31 @@ CREATE TABLE room_requests (
     FOREIGN KEY (requested_by) REFERENCES users(uid) ON DELETE CASCADE
 );
 
+-- Precomputed per-location rating aggregates, kept in sync by ApplyRatingToSummary
+-- (called from AddRating / DeleteRating and the web app, and through
+-- RemoveRatingsFromSummary from DeleteUser / DeleteUniversity, whose cascades
+-- delete ratings) and rebuilt from scratch by RebuildLocationRatingSummary.
+-- Histograms are JSON arrays indexed by value - 1; tag counts are JSON objects of
+-- tag -> number of reviews.
+CREATE TABLE location_rating_summary (
+    LID INT PRIMARY KEY,
+    review_count INT NOT NULL DEFAULT 0,
+    score_sum INT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    score_avg DECIMAL(4,2) AS (IF(review_count > 0, score_sum / review_count, NULL)) STORED,
+    noise_sum INT NOT NULL DEFAULT 0,
+    cleanliness_sum INT NOT NULL DEFAULT 0,
+    equipment_quality_sum INT NOT NULL DEFAULT 0,
+    wifi_strength_sum INT NOT NULL DEFAULT 0,
+    score_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0, 0, 0, 0, 0, 0)),
+    noise_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0)),
+    cleanliness_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0)),
+    equipment_quality_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0)),
+    wifi_strength_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0)),
+    equipment_tag_counts JSON NOT NULL DEFAULT (JSON_OBJECT()),
+    accessibility_tag_counts JSON NOT NULL DEFAULT (JSON_OBJECT()),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (LID) REFERENCES location(LID) ON DELETE CASCADE,
+    INDEX idx_summary_score_avg (score_avg, LID)          -- list / sort locations by average score
+);
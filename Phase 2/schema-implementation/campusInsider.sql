@@ -22,6 +22,12 @@ CREATE TABLE location (
     image LONGBLOB,
     campus_name VARCHAR(100) NOT NULL,
     university_id INT NOT NULL,
+    -- Denormalized from buildings / nonbuildings / rooms by the SyncLocationType triggers
+    location_type ENUM('Building', 'Non-building', 'Room') NOT NULL DEFAULT 'Room',
+    building_LID INT NULL,            -- rooms only: rooms.building_LID
+    building_name VARCHAR(100) NULL,  -- rooms only: name of that building
+    -- Name lookups of the web app ("BEH - Room 1000" and "BEH 1000" both match), see location_lookup.py
+    name_key VARCHAR(100) AS (REPLACE(name, ' - Room ', ' ')) STORED,
     FOREIGN KEY (campus_name, university_id)
         REFERENCES campus(campus_name, university_id)
         ON DELETE CASCADE
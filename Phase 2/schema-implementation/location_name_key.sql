@@ -0,0 +1,10 @@
+-- Normalized location name for the web app's name lookups (Phase 3/backend/location_lookup.py).
+-- "BEH - Room 1000" and "BEH 1000" share the key "BEH 1000", so a lookup by either
+-- spelling is one probe of idx_location_uni_name_key instead of evaluating
+-- REPLACE() on every location row.
+--
+-- For an existing database: run this, then add idx_location_uni_name_key from Indices.sql.
+use campus_insider;
+
+ALTER TABLE location
+    ADD COLUMN name_key VARCHAR(100) AS (REPLACE(name, ' - Room ', ' ')) STORED;
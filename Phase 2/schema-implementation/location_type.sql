@@ -0,0 +1,15 @@
+-- Location type and building stored on location, so listings don't work them out
+-- per row with a CASE over LEFT JOINs of buildings / nonbuildings / rooms and a
+-- second join to location for the building name. Kept in sync by the triggers on
+-- the subtype tables (SyncLocationType in Procedures.sql).
+--
+-- For an existing database: run this, create SyncLocationType, RebuildLocationTypes,
+-- RenameLocation and the location type triggers from Procedures.sql, add the two location indexes
+-- from Indices.sql, then fill the columns with
+--   CALL RebuildLocationTypes();
+use campus_insider;
+
+ALTER TABLE location
+    ADD COLUMN location_type ENUM('Building', 'Non-building', 'Room') NOT NULL DEFAULT 'Room',
+    ADD COLUMN building_LID INT NULL,            -- rooms only: rooms.building_LID
+    ADD COLUMN building_name VARCHAR(100) NULL;  -- rooms only: name of that building
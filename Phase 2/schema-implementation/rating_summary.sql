@@ -0,0 +1,36 @@
+-- Precomputed per-location rating aggregates, kept in sync by ApplyRatingToSummary
+-- (called from AddRating / DeleteRating and the web app, and through
+-- RemoveRatingsFromSummary from DeleteUser / DeleteUniversity, whose cascades
+-- delete ratings) and rebuilt from scratch by RebuildLocationRatingSummary.
+-- Histograms are JSON arrays indexed by value - 1; tag counts are JSON objects of
+-- tag -> number of reviews.
+--
+-- For an existing database: run this, create ApplyRatingToSummary,
+-- RemoveRatingsFromSummary and RebuildLocationRatingSummary from Procedures.sql,
+-- then fill the table with
+--   CALL RebuildLocationRatingSummary();
+-- Any other delete that cascades into ratings (a plain DELETE FROM users or
+-- university) leaves the summaries behind until that is run again.
+use campus_insider;
+CREATE TABLE location_rating_summary (
+    LID INT PRIMARY KEY,
+    review_count INT NOT NULL DEFAULT 0,
+    score_sum INT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    score_avg DECIMAL(4,2) AS (IF(review_count > 0, score_sum / review_count, NULL)) STORED,
+    noise_sum INT NOT NULL DEFAULT 0,
+    cleanliness_sum INT NOT NULL DEFAULT 0,
+    equipment_quality_sum INT NOT NULL DEFAULT 0,
+    wifi_strength_sum INT NOT NULL DEFAULT 0,
+    score_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0, 0, 0, 0, 0, 0)),
+    noise_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0)),
+    cleanliness_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0, 0, 0)),
+    equipment_quality_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0)),
+    wifi_strength_hist JSON NOT NULL DEFAULT (JSON_ARRAY(0, 0, 0)),
+    equipment_tag_counts JSON NOT NULL DEFAULT (JSON_OBJECT()),
+    accessibility_tag_counts JSON NOT NULL DEFAULT (JSON_OBJECT()),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (LID) REFERENCES location(LID) ON DELETE CASCADE,
+    INDEX idx_summary_score_avg (score_avg, LID)          -- list / sort locations by average score
+);
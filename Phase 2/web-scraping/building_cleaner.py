@@ -3,6 +3,8 @@ import re
 import csv
 from collections import defaultdict
 
+from incremental import ScrapeState
+
 # ---------- CONFIG ----------
 INPUT_FILE = "usm_rooms.json"     # input
 OUTPUT_JSON = "rooms_clean.json"  # cleaned JSON
@@ -122,6 +124,8 @@ if __name__ == "__main__":
     cleaned = clean_data(raw_data)
 
     save_json(cleaned, OUTPUT_JSON)
+    # rooms_clean.delta.json lists only the rooms that changed since the last run (see loader.py --delta)
+    ScrapeState("rooms_clean", ["institution", "campus", "building", "room"]).commit(OUTPUT_JSON, cleaned)
     # save_csv(cleaned, OUTPUT_CSV)
 
     print(f"{len(cleaned)} total unique rooms cleaned and saved.")
@@ -1,15 +1,18 @@
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
-import time
+
+from fetcher import Fetcher
+from incremental import ScrapeState
 
 BASE = "https://tdx.maine.edu"
 INDEX_URL = f"{BASE}/TDClient/2624/Portal/KB/?CategoryID=22631"
 
+# Building pages are fetched concurrently, at most 2 requests/second to tdx.maine.edu
+fetcher = Fetcher(max_workers=4, per_host=2, rate=2.0)
+
 def get_building_links():
-    res = requests.get(INDEX_URL)
-    res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
+    soup = BeautifulSoup(fetcher.get(INDEX_URL).text, "html.parser")
 
     links = []
     for div in soup.select("div.gutter-bottom-lg h3 a"):
@@ -22,10 +25,8 @@ def get_building_links():
     return links
 
 
-def scrape_building_page(url):
-    res = requests.get(url)
-    res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
+def scrape_building_page(html):
+    soup = BeautifulSoup(html, "html.parser")
 
     building_name = soup.find("h1").get_text(strip=True)
     rooms = []
@@ -46,22 +47,36 @@ def scrape_building_page(url):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape USM buildings and rooms.")
+    parser.add_argument("--full", action="store_true", help="re-parse every page, even if unchanged")
+    args = parser.parse_args()
+    history = ScrapeState("usm_rooms", ["building"], full=args.full)
+
     buildings = get_building_links()
     print(f"Found {len(buildings)} building pages.")
     all_data = []
 
-    for i, b in enumerate(buildings, 1):
+    pages = fetcher.map([b["url"] for b in buildings])
+    for i, (b, page) in enumerate(zip(buildings, pages), 1):
         print(f"[{i}/{len(buildings)}] Scraping {b['title']}...")
+        if not page.ok:
+            print(f"Error scraping {b['url']}: {page.error}")
+            # keep last run's data so the building isn't reported as removed
+            previous = history.keep(b["url"])
+            if previous:
+                all_data.append(previous)
+            continue
         try:
-            data = scrape_building_page(b["url"])
-            all_data.append(data)
-            time.sleep(1)  # polite delay
+            # only pages whose content changed since the last run are parsed again
+            all_data.append(history.parse(b["url"], page.text, scrape_building_page))
         except Exception as e:
             print(f"Error scraping {b['url']}: {e}")
 
     with open("usm_rooms.json", "w") as f:
         json.dump(all_data, f, indent=2)
     print("Done. Data saved to usm_rooms.json")
+    history.commit("usm_rooms.json", all_data)
+    print(f"Fetch stats: {fetcher.stats()}")
 
 
 if __name__ == "__main__":
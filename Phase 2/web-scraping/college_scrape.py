@@ -1,17 +1,19 @@
-import requests
 from bs4 import BeautifulSoup
-import time
+import argparse
 import re
 import json
 
+from fetcher import Fetcher
+from incremental import ScrapeState
+
 BASE_URL = "https://en.wikipedia.org"
 START_URL = "https://en.wikipedia.org/wiki/Lists_of_American_universities_and_colleges"
-HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# State pages are fetched concurrently; the per-host rate limit keeps us polite to Wikipedia
+fetcher = Fetcher(max_workers=8, per_host=4, rate=4.0, burst=4)
 
 def fetch_soup(url):
-    r = requests.get(url, headers=HEADERS, timeout=15)
-    r.raise_for_status()
-    return BeautifulSoup(r.text, "html.parser")
+    return BeautifulSoup(fetcher.get(url).text, "html.parser")
 
 def extract_colleges_from_section(content, state_name):
     """Extract college links from tables, lists, and paragraphs."""
@@ -58,34 +60,50 @@ def valid_college(name, href):
         return False
     return True
 
-def scrape_state(state_name, state_url, visited):
-    #Scrape one state's page (including subpages if needed)
-    if state_url in visited:
-        return []
-    visited.add(state_url)
-
-    soup = fetch_soup(state_url)
-
-
+def parse_state_page(html, state_name):
+    #Parse one state's page into its colleges, or the subpages to follow if it lists none
+    soup = BeautifulSoup(html, "html.parser")
     content = soup.select_one(".mw-parser-output")
     if not content:
-        return []
+        return {"colleges": [], "sub_links": []}
 
     colleges = extract_colleges_from_section(content, state_name)
-
-    # If no colleges found, recurse into subpages
+    sub_links = []
     if not colleges:
         sub_links = [
             BASE_URL + a["href"]
             for a in content.select("a[href^='/wiki/List_of_']")
             if "Template:" not in a["href"]
         ]
-        for sub_url in sub_links:
-            colleges.extend(scrape_state(state_name, sub_url, visited))
-            time.sleep(0.3)
+    return {"colleges": colleges, "sub_links": sub_links}
+
+def scrape_state(state_name, page, visited, history):
+    #Scrape one state's page (including subpages if needed)
+    if not page.ok:
+        print(f"  ! {state_name}: {page.url} failed ({page.error})")
+        # keep last run's result so the state's colleges aren't reported as removed
+        parsed = history.keep(page.url)
+        if parsed is None:
+            return []
+    else:
+        # only pages whose content changed since the last run are parsed again
+        parsed = history.parse(page.url, page.text, lambda html: parse_state_page(html, state_name))
+
+    colleges = list(parsed["colleges"])
+
+    # If no colleges found, recurse into subpages (fetched concurrently)
+    sub_links = [url for url in parsed["sub_links"] if url not in visited]
+    visited.update(sub_links)
+    for sub_page in fetcher.map(sub_links):
+        colleges.extend(scrape_state(state_name, sub_page, visited, history))
     return colleges
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape American colleges from Wikipedia.")
+    parser.add_argument("--full", action="store_true", help="re-parse every page, even if unchanged")
+    args = parser.parse_args()
+    history = ScrapeState("us_colleges_by_state", ["state", "name"], full=args.full)
+
     print("Fetching main state list...")
     soup = fetch_soup(START_URL)
 
@@ -107,14 +125,14 @@ def main():
         state_links = state_links[:LIMIT]
 
     results = []
-    visited = set()
+    visited = {url for _, url in state_links}
 
-    for idx, (state, url) in enumerate(state_links, 1):
+    pages = fetcher.map([url for _, url in state_links])
+    for idx, ((state, url), page) in enumerate(zip(state_links, pages), 1):
         print(f"[{idx}/{len(state_links)}] Scraping {state}...")
-        data = scrape_state(state, url, visited)
+        data = scrape_state(state, page, visited, history)
         print(f"  ↳ Found {len(data)} institutions.")
         results.extend(data)
-        time.sleep(0.5)
 
     # Deduplicate
     unique = { (r["state"], r["name"]): r for r in results }
@@ -124,6 +142,8 @@ def main():
         json.dump(final, f, indent=2, ensure_ascii=False)
 
     print(f"Saved {len(final)} total institutions to file")
+    history.commit("us_colleges_by_state.json", final)
+    print(f"Fetch stats: {fetcher.stats()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Throughput / politeness benchmark for fetcher.py against a local fixture server.
+
+The fixture server serves N synthetic pages with a fixed latency, sends ETag and
+Last-Modified headers (answering conditional GETs with 304), fails the first
+request for every k-th page with a 503, and records how many requests were in
+flight at once and how many arrived in any one-second window. Nothing leaves
+the machine.
+
+Usage:
+    python fetch_bench.py [--pages 60] [--latency 0.1] [--rate 40] [--per-host 8]
+
+Runs three passes:
+  1. sequential   -- requests.get one page at a time (the old scraper loop, without its sleeps)
+  2. cold         -- Fetcher.map with an empty cache
+  3. warm         -- Fetcher.map again; every page should come back as a 304
+and checks that the fetcher stayed within its concurrency and rate limits.
+"""
+import argparse
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from fetcher import Fetcher
+
+LAST_MODIFIED = "Mon, 01 Dec 2025 00:00:00 GMT"
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.1, fail_every=7):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.arrivals = []
+            self.failed_once = set()
+            self.status_counts = {}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def max_per_second(self):
+        """Largest number of requests that arrived within any one-second window."""
+        window = deque()
+        peak = 0
+        for t in sorted(self.arrivals):
+            window.append(t)
+            while window[0] <= t - 1.0:
+                window.popleft()
+            peak = max(peak, len(window))
+        return peak
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            server.arrivals.append(time.monotonic())
+        try:
+            time.sleep(server.latency)
+            page = int(self.path.rsplit("/", 1)[-1] or 0)
+            body = f"<html><body><h1>Page {page}</h1>{'<p>lorem ipsum</p>' * 200}</body></html>".encode()
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+            with server.lock:
+                fail = server.fail_every and page % server.fail_every == 0 and page not in server.failed_once
+                if fail:
+                    server.failed_once.add(page)
+
+            if fail:
+                status, payload, headers = 503, b"try again", {}
+            elif self.headers.get("If-None-Match") == etag:
+                status, payload, headers = 304, b"", {"ETag": etag}
+            else:
+                status, payload, headers = 200, body, {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+
+            with server.lock:
+                server.status_counts[status] = server.status_counts.get(status, 0) + 1
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def report(label, server, elapsed, pages):
+    print(f"{label:<11} {elapsed:7.2f}s  {pages / elapsed:7.1f} pages/s  "
+          f"peak in-flight {server.peak_in_flight:2d}  max req/s {server.max_per_second():3d}  "
+          f"statuses {dict(sorted(server.status_counts.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraping fetch layer against a local server.")
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.1, help="server latency per request in seconds")
+    parser.add_argument("--rate", type=float, default=40.0, help="fetcher requests/second per host")
+    parser.add_argument("--burst", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--fail-every", type=int, default=7, help="every k-th page fails once with a 503")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, fail_every=args.fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"{server.base_url}/page/{i}" for i in range(1, args.pages + 1)]
+    cache_dir = tempfile.mkdtemp(prefix="fetch_bench_")
+
+    try:
+        # 1) Sequential baseline: what the scrapers did before (minus the fixed sleeps)
+        server.reset()
+        start = time.perf_counter()
+        with requests.Session() as session:
+            failures = 0
+            for url in urls:
+                if session.get(url, timeout=15).status_code != 200:
+                    failures += 1
+        report("sequential", server, time.perf_counter() - start, len(urls))
+        print(f"{'':<11} {failures} pages lost to transient errors (no retries)")
+
+        # 2) Cold cache and 3) warm cache through the fetcher
+        fetcher = Fetcher(max_workers=args.per_host * 2, per_host=args.per_host, rate=args.rate,
+                          burst=args.burst, backoff=0.05, cache_dir=cache_dir)
+        for label in ("cold", "warm"):
+            server.reset()
+            start = time.perf_counter()
+            results = list(fetcher.map(urls))
+            elapsed = time.perf_counter() - start
+            report(label, server, elapsed, len(urls))
+            lost = sum(1 for r in results if not r.ok)
+            cached = sum(1 for r in results if r.from_cache)
+            print(f"{'':<11} {lost} pages lost, {cached} served from the conditional-GET cache")
+
+            assert server.peak_in_flight <= args.per_host, "per-host concurrency limit exceeded"
+            assert server.max_per_second() <= args.rate + args.burst, "rate limit exceeded"
+        print(f"fetcher stats: {fetcher.stats()}")
+        fetcher.close()
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
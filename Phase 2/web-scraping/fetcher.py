@@ -0,0 +1,238 @@
+"""
+Shared fetch layer for the scrapers.
+
+  * one pooled requests.Session for every request (keep-alive, connection reuse)
+  * pages are fetched concurrently, with a cap on in-flight requests per host
+  * a token bucket per host limits the request rate, so concurrency never
+    turns into hammering a server
+  * connection errors, timeouts, 429 and 5xx responses are retried with
+    exponential backoff (honoring Retry-After)
+  * responses are cached on disk with their ETag / Last-Modified headers and
+    revalidated with a conditional GET, so unchanged pages cost a 304
+
+Usage:
+    fetcher = Fetcher()
+    page = fetcher.get(url)                   # FetchResult, raises FetchError
+    for page in fetcher.map(urls):            # concurrent, results in input order
+        if page.ok: ...
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {"User-Agent": "CampusInsiderScraper/1.0 (+https://github.com/nathanielSerrano/Campus-Insider)"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a URL still fails after every retry."""
+
+    def __init__(self, url, reason):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = str(reason)
+
+
+class FetchResult:
+    def __init__(self, url, status, text, from_cache=False, error=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.from_cache = from_cache  # True when the server answered 304 Not Modified
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        state = "cached" if self.from_cache else self.status
+        return f"<FetchResult {self.url} {state if self.ok else self.error}>"
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class DiskCache:
+    """One JSON file per URL holding the body and its validators."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, url, text, etag=None, last_modified=None):
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "text": text}, f)
+        os.replace(tmp, path)
+
+
+class Fetcher:
+    """
+    Concurrent, polite HTTP client.
+
+    max_workers  -- threads used by map()
+    per_host     -- max in-flight requests to a single host
+    rate / burst -- token bucket per host (requests per second)
+    retries      -- extra attempts after the first failure
+    backoff      -- base delay in seconds, doubled on every retry (plus jitter)
+    cache_dir    -- conditional-GET cache; None disables it
+    """
+
+    def __init__(self, max_workers=8, per_host=2, rate=2.0, burst=2, retries=4, backoff=0.5,
+                 timeout=15, cache_dir=".http_cache", headers=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = DiskCache(cache_dir) if cache_dir else None
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(max_workers, per_host))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._hosts = {}  # host -> (Semaphore, TokenBucket)
+        self._counters = {"requests": 0, "downloaded": 0, "not_modified": 0,
+                          "retries": 0, "failures": 0, "rate_wait": 0.0}
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+    def _host_limits(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            limits = self._hosts.get(host)
+            if limits is None:
+                limits = (threading.BoundedSemaphore(self.per_host), TokenBucket(self.rate, self.burst))
+                self._hosts[host] = limits
+            return limits
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def get(self, url):
+        """Fetch one URL (revalidating the cached copy if there is one)."""
+        semaphore, bucket = self._host_limits(url)
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+            response = None
+            with semaphore:
+                self._count("rate_wait", bucket.acquire())
+                self._count("requests")
+                try:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error = e
+
+            if response is not None:
+                if response.status_code == 304 and cached:
+                    self._count("not_modified")
+                    return FetchResult(url, 304, cached["text"], from_cache=True)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= 400:
+                        self._count("failures")
+                        raise FetchError(url, f"HTTP {response.status_code}")
+                    self._count("downloaded")
+                    text = response.text
+                    if self.cache:
+                        self.cache.set(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                    return FetchResult(url, response.status_code, text)
+                last_error = f"HTTP {response.status_code}"
+
+            if attempt < self.retries:
+                time.sleep(self._retry_delay(attempt, response))
+
+        self._count("failures")
+        raise FetchError(url, last_error)
+
+    def map(self, urls):
+        """
+        Fetch many URLs concurrently, yielding FetchResults in input order.
+
+        A URL that keeps failing yields a result with .error set instead of
+        aborting the whole run.
+        """
+        def fetch(url):
+            try:
+                return self.get(url)
+            except FetchError as e:
+                return FetchResult(url, None, None, error=e.reason)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            yield from pool.map(fetch, urls)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,132 @@
+"""
+Incremental re-scrape support: content hashes and change detection.
+
+Two kinds of hashes are kept in a small state file per data set
+(`.scrape_state/<name>.json`):
+
+  * a hash of every source page together with what was parsed from it, so a
+    page whose content did not change is not parsed again
+  * a hash of every output record (keyed on a few identifying fields), so each
+    run can write a delta file with only the added, changed and removed records
+
+Delta files look like
+    {"source": "usm_study_rooms.json", "key": ["library", "room_name"],
+     "generated_at": "...", "added": [...], "changed": [...], "removed": [...]}
+where "removed" only holds the key fields of each record. loader.py applies
+them with --delta.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+STATE_DIR = ".scrape_state"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def record_hash(record):
+    return content_hash(json.dumps(record, sort_keys=True, ensure_ascii=False))
+
+
+def record_key(record, key_fields):
+    return json.dumps([record.get(f) for f in key_fields], ensure_ascii=False)
+
+
+def delta_path(output_path):
+    """usm_rooms.json -> usm_rooms.delta.json"""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.delta{ext or '.json'}"
+
+
+class ScrapeState:
+    """
+    Page and record hashes of one data set from the previous run.
+
+    full=True ignores the stored page hashes (everything is parsed again) but
+    still diffs the records against the previous run.
+    """
+
+    def __init__(self, name, key_fields, state_dir=STATE_DIR, full=False):
+        self.path = os.path.join(state_dir, f"{name}.json")
+        self.key_fields = list(key_fields)
+        self.full = full
+        self._old_pages = {}
+        self._old_records = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("key") == self.key_fields:
+                self._old_pages = state.get("pages", {})
+                self._old_records = state.get("records", {})
+        self._pages = {}
+        self._records = {}
+        self.parsed = 0
+        self.skipped = 0
+
+    def parse(self, url, text, parser):
+        """Return parser(text), or the stored result if the page content is unchanged."""
+        digest = content_hash(text)
+        old = self._old_pages.get(url)
+        if old is not None and old["hash"] == digest and not self.full:
+            self.skipped += 1
+            result = old["parsed"]
+        else:
+            self.parsed += 1
+            result = parser(text)
+        self._pages[url] = {"hash": digest, "parsed": result}
+        return result
+
+    def keep(self, url):
+        """Reuse the previous result for a page that could not be fetched this time (None if unknown)."""
+        old = self._old_pages.get(url)
+        if old is None:
+            return None
+        self._pages[url] = old
+        return old["parsed"]
+
+    def diff(self, records):
+        """Split records into added / changed / removed compared with the previous run."""
+        new = {}
+        for record in records:
+            new[record_key(record, self.key_fields)] = (record, record_hash(record))
+
+        added, changed = [], []
+        for key, (record, digest) in new.items():
+            old = self._old_records.get(key)
+            if old is None:
+                added.append(record)
+            elif old != digest:
+                changed.append(record)
+        removed = [
+            dict(zip(self.key_fields, json.loads(key)))
+            for key in self._old_records if key not in new
+        ]
+        self._records = {key: digest for key, (_, digest) in new.items()}
+        return {"added": added, "changed": changed, "removed": removed}
+
+    def commit(self, output_path, records):
+        """Diff the records, write the delta file next to output_path and save the new state."""
+        delta = self.diff(records)
+        path = delta_path(output_path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": os.path.basename(output_path),
+                "key": self.key_fields,
+                "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                **delta
+            }, f, indent=2, ensure_ascii=False)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key_fields, "pages": self._pages, "records": self._records}, f)
+        os.replace(tmp, self.path)
+
+        if self.parsed or self.skipped:
+            print(f"Pages parsed: {self.parsed}, unchanged: {self.skipped}")
+        print(f"Delta → {path}: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+              f"{len(delta['removed'])} removed")
+        return delta
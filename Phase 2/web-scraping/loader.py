@@ -0,0 +1,522 @@
+"""
+Bulk, idempotent loader for the scraped data sets.
+
+Replaces the row-by-row SELECT-then-INSERT loops of insert_colleges.py,
+insert_rooms.py and insert_study_rooms.py:
+  * the JSON input is streamed record by record and processed in batches
+  * university / campus / building / room IDs are resolved with one set-based
+    query per university instead of one lookup per record
+  * rows are written with multi-row INSERTs, and universities, campuses and
+    room attributes are upserted with INSERT ... ON DUPLICATE KEY UPDATE
+  * locations that already exist are skipped, so re-running a load is cheap
+  * every batch is committed and checkpointed, so --resume continues a failed
+    run after the last committed batch
+  * location.location_type / building_LID / building_name are written with the
+    location rows, and the per-row SyncLocationType triggers on buildings and
+    rooms are skipped for the session (@skip_location_type_sync), so a bulk
+    load doesn't run a four-join UPDATE per inserted row
+
+Usage (from the Phase 3 directory, where .env lives):
+    python "../Phase 2/web-scraping/loader.py" colleges "../Phase 2/web-scraping/data/US_Colleges.json"
+    python "../Phase 2/web-scraping/loader.py" rooms "../Phase 2/web-scraping/data/rooms_clean.json"
+    python "../Phase 2/web-scraping/loader.py" study_rooms "../Phase 2/web-scraping/data/usm_study_rooms.json"
+
+After an incremental scrape, apply only what changed:
+    python "../Phase 2/web-scraping/loader.py" rooms "../Phase 2/web-scraping/data/rooms_clean.delta.json" --delta
+"""
+import argparse
+import json
+import os
+import time
+
+import dotenv
+import mysql.connector
+
+# --- Scraped institution keys -> (university name, state) in the university table ---
+INSTITUTIONS = {
+    "USM": ("University of Southern Maine", "Maine"),
+}
+
+# --- Library -> (building name, campus name); None = building unknown ---
+LIBRARY_TO_BUILDING = {
+    "Glickman Library": ("Glickman Library", "Portland"),
+    "Gorham Library": ("Bailey Hall", "Gorham"),
+    "LAC Library": (None, "Lewiston-Auburn"),
+}
+
+BATCH_SIZE = 1000
+CHECKPOINT_FILE = ".loader_checkpoint.json"
+
+# location columns written by insert_locations(); the first three are the natural key
+LOCATION_COLUMNS = ("name", "campus_name", "university_id", "location_type", "building_LID", "building_name")
+
+
+# ============================================================
+# Input
+# ============================================================
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        started = False
+        eof = False
+        while True:
+            if not eof and len(buf) < chunk_size:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf += chunk
+
+            buf = buf.lstrip()
+            if not started:
+                if not buf:
+                    if eof:
+                        return
+                    continue
+                if buf[0] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                buf = buf[1:]
+                started = True
+                continue
+
+            if buf.startswith(","):
+                buf = buf[1:].lstrip()
+            if buf.startswith("]"):
+                return
+            if not buf:
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of file")
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Object is split across chunks: read more and retry
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf += chunk
+                continue
+            yield obj
+            buf = buf[end:]
+
+
+def college_record(uni):
+    return {
+        "name": uni["name"].strip(),
+        "state": uni["state"].strip(),
+        "wiki_url": uni.get("wiki_url"),
+    }
+
+
+def room_record(item):
+    """A row from rooms_clean.json (building_cleaner.py output)."""
+    room_number = item.get("room_number")
+    if room_number is None:
+        # fallback: try to parse from "room" string, e.g. "Room 10" -> "10"
+        room_number = item["room"].split()[-1]
+    return {
+        "university": INSTITUTIONS[item["institution"]],
+        "campus": item["campus"],
+        "building": item["building"],
+        "room": item["room"],
+        "room_number": room_number,
+        "room_type": "classroom",
+        "room_size": "medium",
+    }
+
+
+def study_room_record(item):
+    """A row from usm_study_rooms.json (study_room_scraper.py output)."""
+    building, campus = LIBRARY_TO_BUILDING[item["library"]]
+    return {
+        "university": INSTITUTIONS["USM"],
+        "campus": campus,
+        "building": building or f"Unknown Building ({campus})",
+        "room": item["room_name"],
+        "room_number": None,  # study rooms have no numeric ID
+        "room_type": "study room",
+        "room_size": "small",
+    }
+
+
+RECORD_BUILDERS = {
+    "colleges": college_record,
+    "rooms": room_record,
+    "study_rooms": study_room_record,
+}
+
+
+def source_records(kind, path):
+    return map(RECORD_BUILDERS[kind], iter_json_array(path))
+
+
+def batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def values_clause(n_rows, n_cols):
+    row = "(" + ", ".join(["%s"] * n_cols) + ")"
+    return ", ".join([row] * n_rows)
+
+
+# ============================================================
+# Checkpoints
+# ============================================================
+class Checkpoint:
+    """Remembers how many records of a source have been committed."""
+
+    def __init__(self, path, source_key):
+        self.path = path
+        self.key = source_key
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def offset(self):
+        return self._read().get(self.key, 0)
+
+    def save(self, offset):
+        state = self._read()
+        state[self.key] = offset
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    def clear(self):
+        state = self._read()
+        if state.pop(self.key, None) is not None:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+
+
+# ============================================================
+# Loader
+# ============================================================
+class Loader:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.universities = {}  # (name, state) -> university_id
+        self.campuses = set()   # (campus_name, university_id)
+        self.buildings = {}     # (university_id, campus_name, building name) -> LID
+        self.rooms = {}         # (building_LID, room name) -> LID
+        self._preloaded = set()  # university_ids whose locations are cached
+        self.rows_written = 0
+
+    # --------------------------------------------------------
+    # Universities
+    # --------------------------------------------------------
+    def load_colleges(self, batch):
+        sql = (
+            "INSERT INTO university (name, state, wiki_url) VALUES "
+            + values_clause(len(batch), 3)
+            + " ON DUPLICATE KEY UPDATE wiki_url = VALUES(wiki_url)"
+        )
+        params = [v for r in batch for v in (r["name"], r["state"], r["wiki_url"])]
+        self.cursor.execute(sql, params)
+        self.rows_written += len(batch)
+
+    def resolve_universities(self, keys):
+        missing = [k for k in set(keys) if k not in self.universities]
+        if not missing:
+            return
+        conditions = " OR ".join(["(name = %s AND state = %s)"] * len(missing))
+        self.cursor.execute(
+            f"SELECT university_id, name, state FROM university WHERE {conditions}",
+            [v for k in missing for v in k]
+        )
+        for uni_id, name, state in self.cursor.fetchall():
+            self.universities[(name, state)] = uni_id
+        for key in missing:
+            if key not in self.universities:
+                raise LookupError(f"University {key[0]!r} ({key[1]}) not found; load colleges first")
+
+    # --------------------------------------------------------
+    # Locations
+    # --------------------------------------------------------
+    def preload_locations(self, uni_id):
+        """Cache every campus, building and room of a university with three queries."""
+        if uni_id in self._preloaded:
+            return
+        self.cursor.execute("SELECT campus_name FROM campus WHERE university_id = %s", (uni_id,))
+        self.campuses.update((name, uni_id) for (name,) in self.cursor.fetchall())
+
+        self.cursor.execute("""
+            SELECT L.LID, L.campus_name, L.name
+            FROM location L JOIN buildings B ON B.LID = L.LID
+            WHERE L.university_id = %s
+        """, (uni_id,))
+        for lid, campus, name in self.cursor.fetchall():
+            self.buildings.setdefault((uni_id, campus, name), lid)
+
+        self.cursor.execute("""
+            SELECT R.LID, R.building_LID, L.name
+            FROM rooms R JOIN location L ON L.LID = R.LID
+            WHERE L.university_id = %s
+        """, (uni_id,))
+        for lid, building_lid, name in self.cursor.fetchall():
+            self.rooms.setdefault((building_lid, name), lid)
+
+        self._preloaded.add(uni_id)
+
+    def insert_locations(self, rows):
+        """
+        Multi-row INSERT into location; returns the new LIDs in input order.
+
+        Each row holds the LOCATION_COLUMNS values: (name, campus_name,
+        university_id, location_type, building_LID, building_name).
+
+        With innodb_autoinc_lock_mode=2 (MySQL 8's default) a statement's
+        AUTO_INCREMENT values are increasing but not necessarily consecutive
+        when other sessions insert at the same time. So the LIDs are read back:
+        every row of this statement has LID >= LAST_INSERT_ID(), and rows with
+        the same (name, campus, university) come back in insertion order.
+        """
+        if not rows:
+            return []
+        rows = [tuple(r) for r in rows]
+        self.cursor.execute(
+            f"INSERT INTO location ({', '.join(LOCATION_COLUMNS)}) VALUES "
+            + values_clause(len(rows), len(LOCATION_COLUMNS)),
+            [v for r in rows for v in r]
+        )
+        first = self.cursor.lastrowid  # LAST_INSERT_ID(): the first LID of this statement
+
+        keys = list(dict.fromkeys(r[:3] for r in rows))
+        self.cursor.execute(
+            "SELECT LID, name, campus_name, university_id FROM location "
+            "WHERE LID >= %s AND (name, campus_name, university_id) IN (" + values_clause(len(keys), 3) + ") "
+            "ORDER BY LID",
+            [first] + [v for k in keys for v in k]
+        )
+        stored = {}
+        for lid, *key in self.cursor.fetchall():
+            stored.setdefault(tuple(key), []).append(lid)
+
+        lids = []
+        for row in rows:
+            candidates = stored.get(row[:3])
+            if not candidates:
+                raise RuntimeError(f"Inserted location {row!r} could not be read back")
+            lids.append(candidates.pop(0))
+        self.rows_written += len(rows)
+        return lids
+
+    def load_rooms(self, batch):
+        keys = [r["university"] for r in batch]
+        self.resolve_universities(keys)
+        for key in set(keys):
+            self.preload_locations(self.universities[key])
+
+        # 1) Campuses
+        new_campuses = []
+        for r in batch:
+            key = (r["campus"], self.universities[r["university"]])
+            if key not in self.campuses and key not in new_campuses:
+                new_campuses.append(key)
+        if new_campuses:
+            self.cursor.execute(
+                "INSERT INTO campus (campus_name, university_id) VALUES "
+                + values_clause(len(new_campuses), 2)
+                + " ON DUPLICATE KEY UPDATE campus_name = campus_name",
+                [v for k in new_campuses for v in k]
+            )
+            self.campuses.update(new_campuses)
+            self.rows_written += len(new_campuses)
+
+        # 2) Buildings
+        new_buildings = []
+        for r in batch:
+            uni_id = self.universities[r["university"]]
+            key = (uni_id, r["campus"], r["building"])
+            if key not in self.buildings and key not in new_buildings:
+                new_buildings.append(key)
+        if new_buildings:
+            lids = self.insert_locations([(name, campus, uni_id, "Building", None, None)
+                                          for uni_id, campus, name in new_buildings])
+            self.cursor.execute(
+                "INSERT INTO buildings (LID) VALUES " + values_clause(len(lids), 1),
+                lids
+            )
+            self.rows_written += len(lids)
+            self.buildings.update(zip(new_buildings, lids))
+
+        # 3) Room locations that don't exist yet
+        new_rooms = []
+        for r in batch:
+            uni_id = self.universities[r["university"]]
+            building_lid = self.buildings[(uni_id, r["campus"], r["building"])]
+            key = (building_lid, r["room"])
+            if key not in self.rooms and key not in [k for k, _ in new_rooms]:
+                new_rooms.append((key, (r["room"], r["campus"], uni_id, "Room", building_lid, r["building"])))
+        if new_rooms:
+            lids = self.insert_locations([row for _, row in new_rooms])
+            self.rooms.update(zip([k for k, _ in new_rooms], lids))
+
+        # 4) Room attributes: inserted for new rooms, refreshed for existing ones
+        room_rows = {}
+        for r in batch:
+            uni_id = self.universities[r["university"]]
+            building_lid = self.buildings[(uni_id, r["campus"], r["building"])]
+            lid = self.rooms[(building_lid, r["room"])]
+            room_rows[lid] = (lid, building_lid, r["room_number"], r["room_type"], r["room_size"])
+        self.cursor.execute(
+            "INSERT INTO rooms (LID, building_LID, room_number, room_type, room_size) VALUES "
+            + values_clause(len(room_rows), 5)
+            + " ON DUPLICATE KEY UPDATE room_number = VALUES(room_number),"
+              " room_type = VALUES(room_type), room_size = VALUES(room_size)",
+            [v for row in room_rows.values() for v in row]
+        )
+        self.rows_written += len(room_rows)
+
+    def delete_rooms(self, batch):
+        """Delete the room locations of the given records (ratings cascade with them)."""
+        keys = [r["university"] for r in batch]
+        self.resolve_universities(keys)
+        lids = []
+        for key in set(keys):
+            self.preload_locations(self.universities[key])
+        for r in batch:
+            uni_id = self.universities[r["university"]]
+            building_lid = self.buildings.get((uni_id, r["campus"], r["building"]))
+            lid = self.rooms.pop((building_lid, r["room"]), None)
+            if lid is not None:
+                lids.append(lid)
+        if lids:
+            self.cursor.execute(
+                f"DELETE FROM location WHERE LID IN ({', '.join(['%s'] * len(lids))})",
+                lids
+            )
+            self.rows_written += self.cursor.rowcount
+        return len(lids)
+
+
+def read_delta(path):
+    """Load a delta file written by incremental.py; returns (upserts, removed) as raw records."""
+    with open(path, "r", encoding="utf-8") as f:
+        delta = json.load(f)
+    return delta["added"] + delta["changed"], delta["removed"]
+
+
+def apply_removals(kind, removed, conn, batch_size=BATCH_SIZE, delete_removed=False):
+    if not removed:
+        return 0
+    if kind == "colleges" or not delete_removed:
+        # Universities are never deleted automatically: users, campuses and reviews hang off them
+        print(f"{len(removed)} records were removed at the source; not deleted"
+              + ("" if kind == "colleges" else " (pass --delete-removed to delete them)"))
+        return 0
+
+    loader = Loader(conn)
+    deleted = 0
+    for batch in batches(map(RECORD_BUILDERS[kind], removed), batch_size):
+        try:
+            deleted += loader.delete_rooms(batch)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    print(f"Deleted {deleted} rooms removed at the source")
+    return deleted
+
+
+def run(kind, path, conn, batch_size=BATCH_SIZE, resume=False, checkpoint_file=CHECKPOINT_FILE,
+        delta=False, delete_removed=False):
+    """
+    Load a full JSON file, or with delta=True only the changes listed in a
+    delta file (added and changed records are upserted, removed ones handled
+    by apply_removals).
+    """
+    loader = Loader(conn)
+    load_batch = loader.load_colleges if kind == "colleges" else loader.load_rooms
+    checkpoint = Checkpoint(checkpoint_file, f"{kind}:{os.path.abspath(path)}")
+
+    skip = checkpoint.offset() if resume else 0
+    if skip:
+        print(f"Resuming {kind} after record {skip}")
+
+    removed = []
+    if delta:
+        upserts, removed = read_delta(path)
+        records = map(RECORD_BUILDERS[kind], upserts)
+    else:
+        records = source_records(kind, path)
+
+    done = 0
+    start = time.perf_counter()
+    # The rows carry their location type columns already (see insert_locations)
+    loader.cursor.execute("SET @skip_location_type_sync = 1")
+    try:
+        for batch in batches(records, batch_size):
+            if done + len(batch) <= skip:
+                done += len(batch)
+                continue
+            if done < skip:
+                batch = batch[skip - done:]
+                done = skip
+
+            try:
+                load_batch(batch)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                print(f"Batch starting at record {done} failed; rerun with --resume to continue from there.")
+                raise
+            done += len(batch)
+            checkpoint.save(done)
+
+            elapsed = time.perf_counter() - start
+            print(f"  {done} records, {loader.rows_written} rows written ({loader.rows_written / elapsed:,.0f} rows/s)")
+    finally:
+        loader.cursor.execute("SET @skip_location_type_sync = NULL")
+
+    apply_removals(kind, removed, conn, batch_size, delete_removed)
+    checkpoint.clear()
+    elapsed = time.perf_counter() - start
+    rate = loader.rows_written / elapsed if elapsed else 0
+    print(f"Loaded {kind}: {done} records, {loader.rows_written} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return loader.rows_written
+
+
+def connect():
+    dotenv.load_dotenv(dotenv_path=".env")
+    return mysql.connector.connect(
+        host="localhost",
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database="campus_insider"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load scraped JSON into campus_insider.")
+    parser.add_argument("kind", choices=sorted(RECORD_BUILDERS))
+    parser.add_argument("path", help="JSON file to load")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--resume", action="store_true", help="skip records committed by a previous failed run")
+    parser.add_argument("--delta", action="store_true", help="path is a *.delta.json file from an incremental scrape")
+    parser.add_argument("--delete-removed", action="store_true",
+                        help="with --delta, delete rooms that disappeared from the source")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    try:
+        run(args.kind, args.path, conn, batch_size=args.batch_size, resume=args.resume,
+            delta=args.delta, delete_removed=args.delete_removed)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
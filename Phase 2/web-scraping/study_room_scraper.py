@@ -1,8 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
 import re
 
+from fetcher import Fetcher
+from incremental import ScrapeState
+
 urls = {
     "Glickman Library": "https://libguides.usm.maine.edu/guides/group-study-rooms/glickman-library",
     "Gorham Library": "https://libguides.usm.maine.edu/guides/group-study-rooms/gorham-library",
@@ -11,6 +14,12 @@ urls = {
 
 rooms = []
 
+fetcher = Fetcher(max_workers=3, per_host=2, rate=2.0)
+
+arg_parser = argparse.ArgumentParser(description="Scrape USM library study rooms.")
+arg_parser.add_argument("--full", action="store_true", help="re-parse every page, even if unchanged")
+history = ScrapeState("usm_study_rooms", ["library", "room_name"], full=arg_parser.parse_args().full)
+
 def parse_details(details_html):
     """Parse the details HTML element to extract floor, capacity, and amenities."""
     # Replace <br> tags with a newline before parsing
@@ -49,12 +58,11 @@ def parse_details(details_html):
     }
 
 
-for library, url in urls.items():
-    print(f"Scraping {library}...")
-    resp = requests.get(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-    
+def parse_library_page(html, library):
+    """Parse one library's study room table into room dicts."""
+    library_rooms = []
+    soup = BeautifulSoup(html, "html.parser")
+
     for row in soup.select("tbody tr"):
         tds = row.find_all("td", class_="ck_border")
         if len(tds) < 2:
@@ -74,15 +82,29 @@ for library, url in urls.items():
         # Details (pass raw HTML element now)
         parsed = parse_details(tds[1])
 
-        rooms.append({
+        library_rooms.append({
             "library": library,
             "room_name": name,
             "image_url": img_url,
             **parsed
         })
+    return library_rooms
+
+
+# All three library pages are fetched concurrently, then parsed in order
+for library, page in zip(urls, fetcher.map(list(urls.values()))):
+    print(f"Scraping {library}...")
+    if not page.ok:
+        print(f"Error scraping {page.url}: {page.error}")
+        # keep last run's rooms so they aren't reported as removed
+        rooms.extend(history.keep(page.url) or [])
+        continue
+    # only pages whose content changed since the last run are parsed again
+    rooms.extend(history.parse(page.url, page.text, lambda html: parse_library_page(html, library)))
 
 
 with open("usm_study_rooms.json", "w", encoding="utf-8") as f:
     json.dump(rooms, f, indent=2, ensure_ascii=False)
 
 print(f"Scraped {len(rooms)} rooms and saved to usm_study_rooms.json")
+history.commit("usm_study_rooms.json", rooms)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scraper modules are run as scripts from web-scraping/, so import them the same way
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
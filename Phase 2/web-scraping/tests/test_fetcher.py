@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from fetch_bench import FixtureServer
+from fetcher import Fetcher, FetchError, TokenBucket
+
+
+@pytest.fixture
+def server():
+    server = FixtureServer(latency=0.02, fail_every=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def urls(server, n):
+    return [f"{server.base_url}/page/{i}" for i in range(1, n + 1)]
+
+
+def make_fetcher(tmp_path, **kwargs):
+    options = dict(max_workers=12, per_host=3, rate=50.0, burst=4, backoff=0.01, cache_dir=str(tmp_path))
+    options.update(kwargs)
+    return Fetcher(**options)
+
+
+def test_per_host_concurrency_limit(server, tmp_path):
+    fetcher = make_fetcher(tmp_path, per_host=3, rate=1000.0, burst=1000)
+    results = list(fetcher.map(urls(server, 30)))
+    fetcher.close()
+
+    assert all(r.ok for r in results)
+    # Twelve workers, but never more than per_host requests at the server at once
+    assert server.peak_in_flight == 3
+
+
+def test_per_host_rate_limit(server, tmp_path):
+    fetcher = make_fetcher(tmp_path, per_host=8, rate=20.0, burst=4, max_workers=16)
+    results = list(fetcher.map(urls(server, 40)))
+    fetcher.close()
+
+    assert all(r.ok for r in results)
+    assert server.max_per_second() <= 20 + 4
+    assert fetcher.stats()["rate_wait"] > 0
+
+
+def test_limits_are_per_host(tmp_path):
+    servers = [FixtureServer(latency=0.05, fail_every=0) for _ in range(2)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = make_fetcher(tmp_path, per_host=2, rate=1000.0, burst=1000)
+        mixed = [url for pair in zip(urls(servers[0], 10), urls(servers[1], 10)) for url in pair]
+        assert all(r.ok for r in fetcher.map(mixed))
+        fetcher.close()
+        assert [s.peak_in_flight for s in servers] == [2, 2]
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def test_results_keep_input_order(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    pages = urls(server, 15)
+    assert [r.url for r in fetcher.map(pages)] == pages
+    fetcher.close()
+
+
+def test_transient_errors_are_retried(tmp_path):
+    server = FixtureServer(latency=0, fail_every=3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = make_fetcher(tmp_path)
+        results = list(fetcher.map(urls(server, 9)))
+        fetcher.close()
+        assert all(r.ok for r in results)
+        assert server.status_counts[503] == 3
+        assert fetcher.stats()["retries"] == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_second_pass_is_revalidated(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    pages = urls(server, 10)
+    first = list(fetcher.map(pages))
+    server.reset()
+    second = list(fetcher.map(pages))
+    fetcher.close()
+
+    assert not any(r.from_cache for r in first)
+    assert all(r.from_cache for r in second)
+    assert [r.text for r in second] == [r.text for r in first]
+    assert server.status_counts == {304: 10}
+
+
+def test_unreachable_host_fails_after_retries(tmp_path):
+    fetcher = make_fetcher(tmp_path, retries=2)
+    with pytest.raises(FetchError):
+        fetcher.get("http://127.0.0.1:9/nothing-listens-here")
+    fetcher.close()
+    assert fetcher.stats()["retries"] == 2
+    assert fetcher.stats()["failures"] == 1
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=100.0, burst=3)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert all(w > 0 for w in waits[3:])
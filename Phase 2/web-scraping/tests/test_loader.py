@@ -0,0 +1,133 @@
+import re
+
+import pytest
+
+from loader import LOCATION_COLUMNS, Loader, run
+
+
+class LocationTable:
+    """Just enough of `location` for insert_locations(): AUTO_INCREMENT with gaps and interleaved writers."""
+
+    def __init__(self, gap=2, foreign_every=0):
+        self.rows = {}            # LID -> LOCATION_COLUMNS values
+        self.next_id = 100
+        self.gap = gap
+        self.foreign_every = foreign_every
+        self.lastrowid = None
+        self._result = []
+
+    def _allocate(self):
+        lid = self.next_id
+        self.next_id += self.gap
+        return lid
+
+    def execute(self, sql, params=()):
+        params = list(params)
+        if sql.startswith("INSERT INTO location"):
+            width = len(LOCATION_COLUMNS)
+            assert sql.startswith(f"INSERT INTO location ({', '.join(LOCATION_COLUMNS)}) VALUES")
+            rows = [tuple(params[i:i + width]) for i in range(0, len(params), width)]
+            first = None
+            for n, row in enumerate(rows):
+                if self.foreign_every and n and n % self.foreign_every == 0:
+                    # Another session's insert lands between ours
+                    self.rows[self._allocate()] = ("Someone else's room", *row[1:])
+                lid = self._allocate()
+                first = lid if first is None else first
+                self.rows[lid] = row
+            self.lastrowid = first
+        elif sql.startswith("SELECT LID, name, campus_name, university_id FROM location"):
+            assert re.search(r"WHERE LID >= %s AND \(name, campus_name, university_id\) IN", sql)
+            first, keys = params[0], {tuple(params[i:i + 3]) for i in range(1, len(params), 3)}
+            self._result = [(lid, *row[:3]) for lid, row in sorted(self.rows.items())
+                            if lid >= first and row[:3] in keys]
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def fetchall(self):
+        result, self._result = self._result, []
+        return result
+
+
+class FakeConn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+@pytest.mark.parametrize("gap, foreign_every", [(1, 0), (2, 0), (1, 2), (3, 3)])
+def test_insert_locations_maps_lids_without_consecutive_auto_increment(gap, foreign_every):
+    table = LocationTable(gap=gap, foreign_every=foreign_every)
+    loader = Loader(FakeConn(table))
+    # The same room name in two buildings of one campus gives two identical natural keys
+    rows = [("Room 10", "Portland", 1, "Room", 5, "Luther Bonney"), ("Room 11", "Portland", 1, "Room", 5, "Luther Bonney"),
+            ("Room 10", "Portland", 1, "Room", 6, "Masterton"), ("Lab", "Gorham", 1, "Building", None, None)]
+
+    lids = loader.insert_locations(rows)
+
+    assert len(set(lids)) == len(rows)
+    assert [table.rows[lid] for lid in lids] == rows
+    assert lids == sorted(lids)  # insertion order is kept for duplicate keys
+    assert loader.rows_written == len(rows)
+
+
+def test_insert_locations_without_rows_runs_nothing():
+    table = LocationTable()
+    assert Loader(FakeConn(table)).insert_locations([]) == []
+    assert table.rows == {}
+
+
+class LoadTable(LocationTable):
+    """LocationTable plus the other statements load_rooms() and run() issue against an empty university."""
+
+    def __init__(self):
+        super().__init__(gap=1)
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+        if sql.startswith(("INSERT INTO location", "SELECT LID, name, campus_name, university_id")):
+            return super().execute(sql, params)
+        if sql.startswith("SELECT university_id"):
+            self._result = [(1, "University of Southern Maine", "Maine")]
+        elif "SELECT" in sql:
+            self._result = []  # nothing preloaded
+
+
+class LoadConn(FakeConn):
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def room(building, name, number):
+    return {"university": ("University of Southern Maine", "Maine"), "campus": "Portland",
+            "building": building, "room": name, "room_number": number, "room_type": "classroom",
+            "room_size": "medium"}
+
+
+def test_load_rooms_writes_location_type_columns():
+    table = LoadTable()
+    Loader(LoadConn(table)).load_rooms([room("Luther Bonney", "LB 101", "101"), room("Masterton", "MH 2", "2")])
+
+    by_name = {row[0]: row for row in table.rows.values()}
+    buildings = {name: lid for lid, (name, *_) in table.rows.items() if name in ("Luther Bonney", "Masterton")}
+    assert by_name["Luther Bonney"][3:] == ("Building", None, None)
+    assert by_name["LB 101"][3:] == ("Room", buildings["Luther Bonney"], "Luther Bonney")
+    assert by_name["MH 2"][3:] == ("Room", buildings["Masterton"], "Masterton")
+
+
+def test_run_skips_location_type_triggers_and_restores_them(tmp_path):
+    data = tmp_path / "rooms.json"
+    data.write_text('[{"institution": "USM", "campus": "Portland", "building": "Luther Bonney",'
+                    ' "room": "LB 101", "room_number": "101"}]')
+    table = LoadTable()
+    run("rooms", str(data), LoadConn(table), checkpoint_file=str(tmp_path / "checkpoint.json"))
+
+    assert table.statements[0] == "SET @skip_location_type_sync = 1"
+    assert table.statements[-1] == "SET @skip_location_type_sync = NULL"
+    assert any(s.startswith("INSERT INTO rooms") for s in table.statements)
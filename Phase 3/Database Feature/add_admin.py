@@ -1,15 +1,25 @@
 import mysql.connector
 import dotenv
 import os
-from flask_bcrypt import Bcrypt
+import sys
 
-bcrypt = Bcrypt()
+# Same hashing pool (and cost factor settings) as the API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from password_hasher import PasswordHasher  # noqa: E402
 
 
 # Load environment variables from .env file
 dotenv.load_dotenv(dotenv_path=".env")
 
 def call_create_user_procedure(username, password, role, university, location):
+    hasher = PasswordHasher.from_env()
+    # Hash before connecting so the connection isn't held while bcrypt runs
+    try:
+        password_hash = hasher.hash(password)
+    finally:
+        hasher.close()
+
+    connection = None
     try:
         # Connect to the database
         connection = mysql.connector.connect(
@@ -21,8 +31,6 @@ def call_create_user_procedure(username, password, role, university, location):
 
         cursor = connection.cursor()
 
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
-
 
         # Call the stored procedure
         cursor.callproc('CreateUser', [username, password_hash, role, university, location])
@@ -35,9 +43,10 @@ def call_create_user_procedure(username, password, role, university, location):
     except mysql.connector.Error as err:
         print(f"Error: {err}")
     finally:
-        if connection.is_connected():
+        if connection is not None and connection.is_connected():
             cursor.close()
             connection.close()
 
-# Call the function
-call_create_user_procedure('admin', os.getenv('DB_ADMIN_PASSWORD'), 'student', 'University of Southern Maine', 'Maine')
\ No newline at end of file
+# Call the function (guarded: the hashing pool's worker processes import this module)
+if __name__ == "__main__":
+    call_create_user_procedure('admin', os.getenv('DB_ADMIN_PASSWORD'), 'student', 'University of Southern Maine', 'Maine')
\ No newline at end of file
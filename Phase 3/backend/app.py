@@ -1,11 +1,29 @@
-from flask import Flask, jsonify, request, g
-from flask_bcrypt import Bcrypt
+from flask import Flask, Response, jsonify, request, g
 from flask_cors import CORS
 import mysql.connector
 import os
 from dotenv import load_dotenv
 from datetime import datetime
 import pymysql
+from db_pool import ConnectionPool, PoolTimeout
+from tag_loader import attach_tags
+from pagination import InvalidCursor, clamp_limit, decode_cursor, encode_cursor
+from text_search import SearchIndexes
+from suggest import UniversitySuggester
+from response_cache import ResponseCache, location_tag, university_tag
+from coalesce import Coalescer
+from schema_registry import SchemaRegistry
+from location_query import build_location_search, parse_filters, plan_cache_info
+from location_lookup import AmbiguousLocation, LocationResolver
+import review_pages
+import review_writes
+from rating_summary import SUMMARY_COLUMNS, brief_summary, load_summaries, remove_ratings
+from auth_tokens import COOKIE_NAME, AuthTokens
+from instrumentation import PerformanceMonitor
+from serialization import provider_from_env
+from compression import Compressor
+from password_hasher import HasherBusy, PasswordHasher
+from streaming import iter_chunks, iter_list, iter_query, ndjson_response, wants_stream
 
 load_dotenv()  # ⬅ loads .env file
 
@@ -13,7 +31,7 @@ app = Flask(__name__)
 CORS(app)
 
 # Connect to DB
-def get_db_connection():
+def _connect_webapp():
     return pymysql.connect(
         host=os.getenv("DB_HOST"),
         user=os.getenv("DB_USER_WEBAPP"),
@@ -23,33 +41,191 @@ def get_db_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
+webapp_pool = ConnectionPool.from_env(_connect_webapp, prefix="DB_POOL_WEBAPP", name="webapp")
+
+def get_db_connection():
+    """Borrow a pymysql connection for the app_rw user; close() returns it to the pool."""
+    return perf_monitor.wrap(webapp_pool.acquire(), webapp_pool)
+
+
+# bcrypt runs on a bounded process pool (see password_hasher.py)
+password_hasher = PasswordHasher.from_env()
 
-bcrypt = Bcrypt()
+# Signed session tokens issued at login (see auth_tokens.py)
+auth_tokens = AuthTokens.from_env()
 
 app = Flask(__name__)
 
 CORS(app, resources={r"/api/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
 
+# SQL count / DB time / serialization time per request, Server-Timing header,
+# /metrics and the slow-query log (SLOW_QUERY_MS, SLOW_QUERY_EXPLAIN)
+perf_monitor = PerformanceMonitor.from_env()
+perf_monitor.init_app(app)
+
+# orjson serializer when installed (JSON_SERIALIZER) and gzip / brotli
+# responses above COMPRESS_MIN_BYTES; see serialization.py and compression.py
+app.json = provider_from_env(app)
+compressor = Compressor.from_env()
+compressor.init_app(app)
+
 load_dotenv()
 
 db_user = os.environ.get("DB_USER")
 db_password = os.environ.get("DB_PASSWORD")
 
+def _connect_main():
+    return mysql.connector.connect(
+        host="localhost",
+        user=db_user,
+        password=db_password,
+        database="campus_insider"
+    )
+
+# Pool settings come from DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_RECYCLE,
+# DB_POOL_TIMEOUT and DB_POOL_PRE_PING in .env
+db_pool = ConnectionPool.from_env(_connect_main, prefix="DB_POOL", name="main")
+
 def get_db():
     if 'db' not in g:
-        g.db = mysql.connector.connect(
-            host="localhost",
-            user=db_user,
-            password=db_password,
-            database="campus_insider"
-        )
+        g.db = perf_monitor.wrap(db_pool.acquire(), db_pool)
     return g.db
 
 @app.teardown_appcontext
 def close_db(exception=None):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        db.close()  # returns the connection to the pool
+
+def stream_response(chunks):
+    """
+    ndjson_response() with the request's connection handed back first.
+
+    stream_with_context keeps the request context, and so the teardown that
+    would return g.db, alive until the body has been sent; the chunks read
+    from a connection of their own (streaming.iter_query), so without this a
+    stream would hold two.
+    """
+    close_db()
+    return ndjson_response(chunks)
+
+@app.errorhandler(PoolTimeout)
+def pool_exhausted(err):
+    return jsonify({"error": "Database busy, please retry"}), 503
+
+@app.errorhandler(HasherBusy)
+def hasher_busy(err):
+    response = jsonify({"error": "Too many login attempts in progress, please retry"})
+    response.headers["Retry-After"] = "1"
+    return response, 429
+
+@app.route("/api/health/hasher")
+def hasher_stats():
+    """Queue, cost factor and rejection counters of the password hashing pool."""
+    return jsonify(password_hasher.stats())
+
+@app.route("/api/health/auth")
+def auth_stats():
+    """Token verification counters and size of the role-change cache."""
+    return jsonify(auth_tokens.stats())
+
+@app.route("/metrics")
+def metrics():
+    """Per-endpoint request, SQL and serialization metrics plus pool gauges, in the Prometheus text format."""
+    pools = [db_pool.stats(), webapp_pool.stats()]
+    gauges = [
+        (f"db_pool_{field}", f"Connections {field.replace('_', ' ')} in the pool.",
+         {(("pool", p["name"]),): p[field] for p in pools})
+        for field in ("in_use", "idle", "open")
+    ]
+    return Response(perf_monitor.render(gauges), mimetype="text/plain; version=0.0.4")
+
+@app.route("/api/health/slow-queries")
+def slow_queries():
+    """Most recent statements over SLOW_QUERY_MS (normalized SQL, parameter types only)."""
+    return jsonify(perf_monitor.slow_queries())
+
+@app.route("/api/health/db")
+def db_pool_stats():
+    """Pool saturation and wait-time counters, used to size DB_POOL_SIZE."""
+    return jsonify({"pools": [db_pool.stats(), webapp_pool.stats()]})
+
+# ============================================================
+# Response cache for read-heavy endpoints
+# ============================================================
+# Tags: "university:<name>" for everything under a university,
+# "location:<LID>" for a location's ratings and "users" for anything that
+# shows usernames/roles.
+response_cache = ResponseCache.from_env(compressor=compressor)
+
+def _university_tags(args):
+    return [university_tag(args.get("name"))]
+
+def _review_tags(args):
+    return [university_tag(args.get("university")), "users"]
+
+def _location_rating_tags(args):
+    return [university_tag(args.get("university")), "users"]
+
+def _location_tags(location):
+    """Tags of a page built from one location's row; added by the view once it has loaded it."""
+    return [university_tag(location["university_name"]), location_tag(location["LID"])]
+
+# Name -> LID lookups of the name-addressed endpoints (location_lookup.py)
+location_resolver = LocationResolver.from_env()
+
+# First pages of review listings, per location (review_pages.py)
+review_first_pages = review_pages.FirstPageCache.from_env()
+
+# Identical concurrent reads share one computation (coalesce.py); routes opt in
+# with @request_coalescer.coalesced() below the response cache decorator
+request_coalescer = Coalescer.from_env()
+
+@app.route("/api/health/cache")
+def response_cache_stats():
+    """Hit/miss counters and size of the response cache, the locationSearch plan cache, the name -> LID cache and the review first-page cache."""
+    return jsonify({
+        **response_cache.stats(),
+        "location_search_plans": plan_cache_info(),
+        "location_lookup": location_resolver.stats(),
+        "review_first_pages": review_first_pages.stats(),
+    })
+
+@app.route("/api/health/coalesce")
+def coalesce_stats():
+    """Leader / coalesced / timeout counters of request coalescing, per route."""
+    return jsonify(request_coalescer.stats())
+
+# ============================================================
+# Name search index (replaces LIKE '%q%' scans)
+# ============================================================
+def _load_search_rows(sql, since):
+    # Its own connection rather than get_db(): the index refreshes off the request thread
+    conn = db_pool.acquire()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, (since,))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+def _load_search_universities(since=0):
+    return _load_search_rows(
+        "SELECT university_id, name, state FROM university WHERE university_id > %s", since)
+
+def _load_search_locations(since=0):
+    return _load_search_rows("SELECT LID, name, university_id FROM location WHERE LID > %s", since)
+
+search_index = SearchIndexes(
+    _load_search_universities,
+    _load_search_locations,
+    ttl=int(os.environ.get("SEARCH_INDEX_TTL", 300)),
+    poll=int(os.environ.get("SEARCH_INDEX_POLL", 15))
+)
+
+university_suggester = UniversitySuggester(_load_search_universities)
 
 @app.route('/')
 def index():
@@ -67,11 +243,42 @@ def login():
     cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
     user = cursor.fetchone()
     cursor.close()
-    if user and bcrypt.check_password_hash(user['password'], password):
-        return jsonify(message="Login successful", user={"username": user["username"], "role": user["role"], "university_id": user["university_id"]})
+    close_db()  # don't hold the connection while the password is checked
+
+    ok, new_hash = password_hasher.verify(user['password'], password) if user else (False, None)
+    if ok and new_hash:
+        # Stored hash was made with an older, lower cost: upgrade it
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE users SET password = %s WHERE uid = %s AND password = %s",
+            (new_hash, user['uid'], user['password'])
+        )
+        conn.commit()
+        cursor.close()
+    if ok:
+        token = auth_tokens.issue(user)
+        response = jsonify(
+            message="Login successful",
+            user={"username": user["username"], "role": user["role"], "university_id": user["university_id"]},
+            token=token,
+            expires_in=auth_tokens.max_age
+        )
+        response.set_cookie(COOKIE_NAME, token, max_age=auth_tokens.max_age, httponly=True, samesite="Lax")
+        return response
     else:
         return jsonify(message="Invalid username or password"), 401
 
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    """Revoke every token issued to the current user so far."""
+    auth = auth_tokens.current()
+    if auth:
+        auth_tokens.revoke(auth["uid"])
+    response = jsonify(message="Logged out")
+    response.delete_cookie(COOKIE_NAME)
+    return response
+
 @app.route('/api/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -81,7 +288,7 @@ def register():
     uni = data.get('university')
     state = data.get('state')
 
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    password_hash = password_hasher.hash(password)  # before borrowing a connection
 
     conn = get_db()
     cursor = conn.cursor()
@@ -101,6 +308,14 @@ def search():
     q = request.args.get("q", "")
     state = request.args.get("state", "")
 
+    if q.strip():
+        # Ranked, typo-tolerant match from the in-memory trigram index
+        search_index.refresh_if_stale()
+        matches = search_index.search_universities(q, state=state, limit=20)
+        results = [{"university": m["name"], "state": m["state"]} for m in matches]
+        return jsonify({"results": results})
+
+    # No query text: just list universities (optionally by state)
     sql = """
     SELECT DISTINCT u.name AS university, u.state
     FROM university u
@@ -124,14 +339,213 @@ def search():
 
     return jsonify({"results": results})
 
+@app.route("/api/universities/suggest")
+def suggest_universities():
+    """Autocomplete for university names, served from memory without touching MySQL."""
+    q = request.args.get("q", "")
+    state = request.args.get("state", "")
+    k = max(1, min(request.args.get("k", 10, type=int), 50))
+
+    return jsonify({"results": university_suggester.suggest(q, state=state, k=k)})
+
+def format_locations(raw_locations, seen=None):
+    """
+    Build the frontend labels for location rows and drop duplicate (label, type) pairs.
+
+    seen -- set of (label, type) pairs already sent; pass the same set for every
+            chunk of a streamed response so duplicates are dropped across chunks
+    """
+    final_locations = []
+    seen = set() if seen is None else seen
+    for row in raw_locations:
+        loc_type = row["location_type"]
+
+        raw_name = row["location_name"]
+
+        if loc_type == "Room" and row["room_number"] is not None:
+            # Room: use the building_name from the join
+            building_name = row["building_name"]
+            room_num = row["room_number"]
+
+            formatted_name = f"{building_name} - Room {room_num}"
+
+        else:
+            # Building or non-building
+            formatted_name = raw_name
+
+        key = (formatted_name, loc_type)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        final_locations.append({
+                    "LID": row["LID"],                   # for /api/locations/<lid>/ratings
+                    "location_name": formatted_name,     # the frontend label
+                    "unformatted_name": raw_name,        # the exact DB name (for filtering/search)
+                    "location_type": loc_type,
+                    "campus_name": row["campus_name"],
+                    "building_name": row.get("building_name"),  
+                    "room_number": row.get("room_number"),
+                    "rating_summary": brief_summary(row)
+                        })
+    return final_locations
+
+
+# Queries of /api/university, shared with the async entry point (asgi.py)
+UNIVERSITY_INFO_SQL = """
+    SELECT university_id, name, state, wiki_url
+    FROM university
+    WHERE name = %s AND state = %s
+"""
+
+CAMPUSES_SQL = """
+    SELECT campus_name
+    FROM campus
+    WHERE university_id = %s
+    ORDER BY campus_name;
+"""
+
+LOCATION_COUNT_SQL = "SELECT COUNT(*) AS total FROM location WHERE university_id = %s"
+
+
+def university_locations_query(uni_id, sort, after=None, page_size=None):
+    """
+    Locations query of /api/university; returns (sql, params, sort_key).
+
+    page_size -- None for the unpaginated shape, otherwise one extra row is
+                 requested to tell whether there is a next page
+    """
+    sql_locations = f"""
+SELECT 
+    L.LID,
+    L.name AS location_name,
+    L.campus_name,
+    L.location_type,       -- denormalized (location_types.py)
+
+    R.room_number,
+    R.room_type,
+    R.room_size,
+
+    L.building_name,
+    {SUMMARY_COLUMNS}
+FROM location L
+LEFT JOIN rooms R ON L.LID = R.LID
+LEFT JOIN location_rating_summary S ON L.LID = S.LID
+WHERE L.university_id = %s
+        """
+    params = [uni_id]
+
+    # Sort key: the name (range scan on idx_location_uni_name) or the stored average score
+    sort_key = "COALESCE(S.score_avg, 0)" if sort.lstrip("-") == "rating" else "L.name"
+    direction = "DESC" if sort.startswith("-") else "ASC"
+
+    if page_size is not None:
+        # Keyset pagination on (sort key, LID)
+        if after is not None:
+            op = "<" if direction == "DESC" else ">"
+            sql_locations += f" AND ({sort_key}, L.LID) {op} (%s, %s)"
+            params.extend(after)
+        sql_locations += f" ORDER BY {sort_key} {direction}, L.LID {direction} LIMIT %s"
+        params.append(page_size + 1)  # one extra row tells us if there is a next page
+    else:
+        sql_locations += f" ORDER BY {sort_key} {direction}, L.LID"
+
+    return sql_locations, params, sort_key
+
+
+def _location_cursor(last, sort_key):
+    """next_cursor pointing after the given location row."""
+    if sort_key == "L.name":
+        return encode_cursor([last["location_name"], last["LID"]])
+    return encode_cursor([str(last["score_avg"] or 0), last["LID"]])
+
+
+def _stream_university_locations(head, sql, params, uni_id, sort_key, page_size, include_total):
+    """
+    NDJSON body of /api/university: the head line (university_info, campuses),
+    one line per location and, when paginating, a last line with next_cursor
+    (and total).
+    """
+    yield [head]
+
+    seen = set()
+    sent = 0
+    last = None
+    has_more = False
+    conn = db_pool.acquire()  # the stream's own connection; stream_response() returned g.db
+    try:
+        chunks = iter_chunks(conn, sql, params)
+        try:
+            for rows in chunks:
+                if page_size is not None and sent + len(rows) > page_size:
+                    # The query asked for one extra row to detect a next page
+                    rows = rows[:page_size - sent]
+                    has_more = True
+                if rows:
+                    sent += len(rows)
+                    last = rows[-1]
+                    yield format_locations(rows, seen)
+                if has_more:
+                    break
+        finally:
+            chunks.close()
+
+        if page_size is not None:
+            tail = {"next_cursor": _location_cursor(last, sort_key) if has_more else None}
+            if include_total:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(LOCATION_COUNT_SQL, (uni_id,))
+                tail["total"] = cursor.fetchone()["total"]
+                cursor.close()
+            yield [tail]
+    finally:
+        conn.close()
+
+
 @app.route("/api/university", methods=["GET"])
+@response_cache.cached(tags=_university_tags)
+@request_coalescer.coalesced()
 def show_university():
+    """
+    University info, campuses and locations.
+
+    Without `limit` every location is returned in one response (the original
+    shape). With `limit` the locations are keyset-paginated on (L.name, L.LID):
+      limit         -- page size (capped at pagination.MAX_PAGE_SIZE)
+      cursor        -- `next_cursor` from the previous page
+      sort          -- "name" (default) or "-name" for descending, "rating" /
+                       "-rating" to order by average score (unrated count as 0)
+      includeTotal  -- "1" to also return the total location count
+
+    Each location carries a `rating_summary` (count, average, min, max) read
+    from location_rating_summary, or null if it has no reviews.
+
+    With `Accept: application/x-ndjson` or `stream=1` the response is streamed
+    as NDJSON: a first line with university_info and campuses, one line per
+    location, and (when paginating) a last line with next_cursor / total.
+    """
     university = request.args.get("name")
     state = request.args.get("state")
 
     if not university or not state:
         return jsonify({"error": "Missing name or state"}), 400
 
+    limit = request.args.get("limit", type=int)
+    page_cursor = request.args.get("cursor")
+    sort = request.args.get("sort", "name")
+    include_total = request.args.get("includeTotal", "") in ("1", "true")
+
+    if sort not in ("name", "-name", "rating", "-rating"):
+        return jsonify({"error": "Invalid sort, expected 'name', '-name', 'rating' or '-rating'"}), 400
+
+    paginate = limit is not None or page_cursor is not None
+    after = None
+    if page_cursor:
+        try:
+            after = decode_cursor(page_cursor, 2)
+        except InvalidCursor as err:
+            return jsonify({"error": str(err)}), 400
+
     conn = get_db()
     cursor = conn.cursor(dictionary=True)
 
@@ -139,13 +553,7 @@ def show_university():
         # ============================================================
         # 1. University Info
         # ============================================================
-        sql_uni = """
-            SELECT university_id, name, state, wiki_url
-            FROM university
-            WHERE name = %s AND state = %s
-        """
-
-        cursor.execute(sql_uni, (university, state))
+        cursor.execute(UNIVERSITY_INFO_SQL, (university, state))
         uni_info = cursor.fetchall()
 
         if not uni_info:
@@ -156,92 +564,51 @@ def show_university():
         # ============================================================
         # 2. Campuses
         # ============================================================
-        sql_campuses = """
-            SELECT campus_name
-            FROM campus
-            WHERE university_id = %s
-            ORDER BY campus_name;
-        """
-
-        cursor.execute(sql_campuses, (uni_id,))
+        cursor.execute(CAMPUSES_SQL, (uni_id,))
         campuses = cursor.fetchall()
 
         # ============================================================
         # 3. Locations
         # ============================================================
-        sql_locations = """
-SELECT 
-    L.LID,
-    L.name AS location_name,
-    L.campus_name,
-
-    CASE
-        WHEN B.LID IS NOT NULL THEN 'Building'
-        WHEN NB.LID IS NOT NULL THEN 'Non-building'
-        ELSE 'Room'
-    END AS location_type,
-
-    R.room_number,
-    R.room_type,
-    R.room_size,
+        page_size = clamp_limit(limit) if paginate else None
+        sql_locations, params, sort_key = university_locations_query(uni_id, sort, after, page_size)
 
-    BL.name AS building_name  -- NEW: get the building name
-FROM location L
-LEFT JOIN buildings B ON L.LID = B.LID
-LEFT JOIN nonbuildings NB ON L.LID = NB.LID
-LEFT JOIN rooms R ON L.LID = R.LID
-LEFT JOIN location BL ON R.building_LID = BL.LID   -- NEW JOIN
-WHERE L.university_id = %s
-ORDER BY L.name;
+        if wants_stream():
+            head = {"university_info": uni_info, "campuses": campuses}
+            cursor.close()  # before its connection goes back to the pool
+            return stream_response(_stream_university_locations(
+                head, sql_locations, params, uni_id, sort_key, page_size, include_total
+            ))
 
-        """
-
-        cursor.execute(sql_locations, (uni_id,))
+        cursor.execute(sql_locations, params)
         raw_locations = cursor.fetchall()
 
+        next_cursor = None
+        if paginate and len(raw_locations) > page_size:
+            raw_locations = raw_locations[:page_size]
+            next_cursor = _location_cursor(raw_locations[-1], sort_key)
+
         # ============================================================
         # 4. Optional cleanup / formatting
         # ============================================================
-        final_locations = []
-        seen = set()
-        for row in raw_locations:
-            loc_type = row["location_type"]
-
-            raw_name = row["location_name"]
-
-            if loc_type == "Room" and row["room_number"] is not None:
-                # Room: use the building_name from the join
-                building_name = row["building_name"]
-                room_num = row["room_number"]
-
-                formatted_name = f"{building_name} - Room {room_num}"
-
-            else:
-                # Building or non-building
-                formatted_name = raw_name
-
-            key = (formatted_name, loc_type)
-            if key in seen:
-                continue
-            seen.add(key)
-
-            final_locations.append({
-                        "location_name": formatted_name,     # the frontend label
-                        "unformatted_name": raw_name,        # the exact DB name (for filtering/search)
-                        "location_type": loc_type,
-                        "campus_name": row["campus_name"],
-                        "building_name": row.get("building_name"),  
-                        "room_number": row.get("room_number")     
-                            })
+        final_locations = format_locations(raw_locations)
 
         # ============================================================
         # Final Response
         # ============================================================
-        return jsonify({
+        response = {
             "university_info": uni_info,
             "campuses": campuses,
             "locations": final_locations
-        })
+        }
+
+        if paginate:
+            response["next_cursor"] = next_cursor
+            if include_total:
+                cursor.execute(LOCATION_COUNT_SQL, (uni_id,))
+                response["total"] = cursor.fetchone()["total"]
+
+        return jsonify(response)
     
 
     except mysql.connector.Error as err:
@@ -253,187 +620,118 @@ ORDER BY L.name;
         
     
 @app.route("/api/locationSearch", methods=["GET"])
+@request_coalescer.coalesced()
 def search_locations():
+    """
+    Locations of a university, filtered by name (q), type, room size/type/number,
+    campus, building and (with searchByRating) rating ranges and tags.
+
+    The SQL comes from location_query.py, which only adds the joins / EXISTS
+    subqueries the active filters need and caches the plan per filter shape.
+
+    With `Accept: application/x-ndjson` or `stream=1` the results are streamed
+    as NDJSON, one location per line.
+    """
     university_name = request.args.get("university", "")
     state = request.args.get("state", "")
     query = request.args.get("q", "")
 
-    # Optional filters
-    types = request.args.get("types", "")          # room, building, nonbuilding
-    room_sizes = request.args.get("roomSizes", "") # small,medium,large
-    room_types = request.args.get("roomTypes", "") # study room, computer room...
-    room_number = request.args.get("roomNumber", "")
-    search_by_rating = request.args.get("searchByRating", "")
-    campus = request.args.get("campus", "")
-    building = request.args.get("building", "")
+    # Name matching goes through the trigram index; SQL only sees the matching LIDs
+    name_scores = None
+    if query.strip():
+        search_index.refresh_if_stale()
+        uni_ids = search_index.lookup_university_ids(university_name, state)
+        name_scores = search_index.search_locations(uni_ids, query)
+        if not name_scores:
+            return jsonify({"results": []})
 
-    conn = get_db()
-    cursor = conn.cursor(dictionary=True)
-
-    # Base SQL
-    sql = """
-    SELECT DISTINCT
-        L.LID,
-        L.name AS location_name,
-        CASE 
-            WHEN B.LID IS NOT NULL THEN 'Building'
-            WHEN NB.LID IS NOT NULL THEN 'Non-building'
-            ELSE 'Room'
-        END AS location_type,
-        R.room_number,
-        R.room_type,
-        R.room_size,
-        BL.name AS building_name,
-        L.campus_name
-    FROM location L
-    LEFT JOIN buildings B ON L.LID = B.LID
-    LEFT JOIN nonbuildings NB ON L.LID = NB.LID
-    LEFT JOIN rooms R ON L.LID = R.LID
-    LEFT JOIN buildings BR ON R.building_LID = BR.LID
-    LEFT JOIN location BL ON BR.LID = BL.LID
-    JOIN university U ON L.university_id = U.university_id
-    """
+    filters = parse_filters(request.args, lids=name_scores)
+    sql, params = build_location_search(filters)
 
-    params = [university_name]
-    conditions = ["U.name = %s"]
+    if wants_stream() and name_scores is None:
+        return stream_response(iter_query(db_pool, sql, params))
 
-    # Base filters
-    if state:
-        conditions.append("U.state = %s")
-        params.append(state)
-    if query:
-        conditions.append("L.name LIKE %s")
-        params.append(f"%{query}%")
-    if types:
-        type_list = [t.strip().lower() for t in types.split(",")]
-        type_conditions = []
-        if "room" in type_list: type_conditions.append("R.LID IS NOT NULL")
-        if "building" in type_list: type_conditions.append("B.LID IS NOT NULL")
-        if "nonbuilding" in type_list: type_conditions.append("NB.LID IS NOT NULL")
-        if type_conditions:
-            conditions.append("(" + " OR ".join(type_conditions) + ")")
-    if room_sizes:
-        sizes = room_sizes.split(",")
-        placeholders = ", ".join(["%s"] * len(sizes))
-        conditions.append(f"R.room_size IN ({placeholders})")
-        params.extend(sizes)
-    if room_types:
-        rtypes = room_types.split(",")
-        placeholders = ", ".join(["%s"] * len(rtypes))
-        conditions.append(f"R.room_type IN ({placeholders})")
-        params.extend(rtypes)
-    if room_number:
-        conditions.append("R.room_number = %s")
-        params.append(room_number)
-    if campus:
-        conditions.append("L.campus_name LIKE %s")
-        params.append(f"%{campus}%")
-    if building:
-        conditions.append("BL.name LIKE %s")
-        params.append(f"%{building}%")
-
-    # Rating filters
-    if search_by_rating:
-        rating_fields = ["score", "noise", "cleanliness", "equipment_quality", "wifi_strength"]
-        rating_conditions = []
-        rating_params = []
-
-        for field in rating_fields:
-            min_val = request.args.get(f"{field}Min", type=int)
-            max_val = request.args.get(f"{field}Max", type=int)
-            if min_val is not None and max_val is not None:
-                rating_conditions.append(f"R2.{field} BETWEEN %s AND %s")
-                rating_params.extend([min_val, max_val])
-
-        equipment_tags = request.args.getlist("equipmentTags")
-        accessibility_tags = request.args.getlist("accessibilityTags")
-
-        # if equipment_tags:
-        #     placeholders = ", ".join(["%s"] * len(equipment_tags))
-        #     sql += f" LEFT JOIN rating_equipment RE ON RE.RID = R2.RID AND RE.equipment_tag IN ({placeholders})"
-        #     params.extend(equipment_tags)
-
-        # if accessibility_tags:
-        #     placeholders = ", ".join(["%s"] * len(accessibility_tags))
-        #     sql += f" LEFT JOIN rating_accessibility RA ON RA.RID = R2.RID AND RA.accessibility_tag IN ({placeholders})"
-        #     params.extend(accessibility_tags)
-
-        # Only join ratings table if at least one filter is set
-        if rating_conditions or equipment_tags or accessibility_tags:
-            # Join ratings first
-            sql += " LEFT JOIN ratings R2 ON R2.LID = L.LID"
-
-            # Join equipment and accessibility if needed
-            if equipment_tags:
-                placeholders = ", ".join(["%s"] * len(equipment_tags))
-                sql += f" LEFT JOIN rating_equipment RE ON RE.RID = R2.RID AND RE.equipment_tag IN ({placeholders})"
-                params.extend(equipment_tags)
-
-            if accessibility_tags:
-                placeholders = ", ".join(["%s"] * len(accessibility_tags))
-                sql += f" LEFT JOIN rating_accessibility RA ON RA.RID = R2.RID AND RA.accessibility_tag IN ({placeholders})"
-                params.extend(accessibility_tags)
-
-            # Add all rating_conditions to WHERE, not ON
-            if rating_conditions:
-                conditions.append("(" + " AND ".join(rating_conditions) + ")")
-                params.extend(rating_params)
-
-
-
-
-    # Combine base conditions
-    if conditions:
-        sql += " WHERE " + " AND ".join(conditions)
+    conn = get_db()
+    if wants_stream():
+        # Name matches are capped by the index, so ranking them in memory is fine
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        results = cursor.fetchall()
+        cursor.close()
+        results.sort(key=lambda r: name_scores.get(r["LID"], 0), reverse=True)
+        return stream_response(iter_list(results))
 
+    cursor = conn.cursor(dictionary=True)
     cursor.execute(sql, params)
     results = cursor.fetchall()
     cursor.close()
-    return jsonify({"results": results})
 
+    if name_scores is not None:
+        # Best name matches first
+        results.sort(key=lambda r: name_scores.get(r["LID"], 0), reverse=True)
+    return jsonify({"results": results})
 
 
-@app.route("/api/equipmentTags")
-def get_equipment_tags():
-    conn = get_db()
-    cursor = conn.cursor()
-    sql = """
-        SELECT SUBSTRING(COLUMN_TYPE, 6, CHAR_LENGTH(COLUMN_TYPE) - 6) AS enum_values
+# ============================================================
+# ENUM vocabularies (tags, room types/sizes, roles)
+# ============================================================
+def _load_enum_columns():
+    cursor = get_db().cursor(dictionary=True)
+    cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
         FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = %s
-          AND TABLE_NAME = %s
-          AND COLUMN_NAME = %s
-    """
-    cursor.execute(sql, ("campus_insider", "rating_equipment", "equipment_tag"))
-    row = cursor.fetchone()
+        WHERE TABLE_SCHEMA = %s AND DATA_TYPE = 'enum'
+    """, ("campus_insider",))
+    rows = cursor.fetchall()
     cursor.close()
+    return rows
 
-    if row:
-        # Convert 'val1','val2','val3',... to a Python list
-        enum_list = [v.strip("'") for v in row[0].split(",")]
-        return jsonify({"tags": enum_list})
-    return jsonify({"tags": []})
+def _load_check_constraints():
+    cursor = get_db().cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT tc.TABLE_NAME, cc.CHECK_CLAUSE
+            FROM INFORMATION_SCHEMA.CHECK_CONSTRAINTS cc
+            JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+              ON tc.CONSTRAINT_SCHEMA = cc.CONSTRAINT_SCHEMA
+             AND tc.CONSTRAINT_NAME = cc.CONSTRAINT_NAME
+            WHERE cc.CONSTRAINT_SCHEMA = %s
+        """, ("campus_insider",))
+        return cursor.fetchall()
+    except mysql.connector.Error:
+        # CHECK_CONSTRAINTS only exists from MySQL 8.0.16; fall back to known values
+        return []
+    finally:
+        cursor.close()
+
+schema_registry = SchemaRegistry(
+    _load_enum_columns,
+    _load_check_constraints,
+    check_interval=int(os.environ.get("SCHEMA_CHECK_INTERVAL", 300))
+)
+
+def vocabulary_response(name, payload):
+    """JSON response with a strong ETag; answers If-None-Match with 304."""
+    response = jsonify(payload)
+    response.set_etag(schema_registry.etag(name))
+    response.headers["Cache-Control"] = "public, no-cache"
+    return response.make_conditional(request)
+
+@app.route("/api/equipmentTags")
+def get_equipment_tags():
+    return vocabulary_response("equipment_tags", {"tags": schema_registry.get("equipment_tags")})
 
 @app.route("/api/accessibilityTags")
 def get_accessibility_tags():
-    conn = get_db()
-    cursor = conn.cursor()
-    sql = """
-        SELECT SUBSTRING(COLUMN_TYPE, 6, CHAR_LENGTH(COLUMN_TYPE) - 6) AS enum_values
-        FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = %s
-          AND TABLE_NAME = %s
-          AND COLUMN_NAME = %s
-    """
-    cursor.execute(sql, ("campus_insider", "rating_accessibility", "accessibility_tag"))
-    row = cursor.fetchone()
-    cursor.close()
+    return vocabulary_response("accessibility_tags", {"tags": schema_registry.get("accessibility_tags")})
 
-    if row:
-        # Convert 'val1','val2','val3',... to a Python list
-        enum_list = [v.strip("'") for v in row[0].split(",")]
-        return jsonify({"tags": enum_list})
-    return jsonify({"tags": []})
+@app.route("/api/enums")
+def get_enums():
+    """Every vocabulary at once: tags, room_type, room_size, request_status and role."""
+    response = jsonify({"version": schema_registry.version, "enums": schema_registry.all()})
+    response.set_etag(schema_registry.version)
+    response.headers["Cache-Control"] = "public, no-cache"
+    return response.make_conditional(request)
 
 @app.route("/api/request-room", methods=["POST"])
 def api_request_room():
@@ -457,6 +755,7 @@ def api_request_room():
             message = result.fetchone()["message"]
 
         conn.commit()
+        response_cache.invalidate(university_tag(data["university_name"]))
         return jsonify({"message": message})
 
     except mysql.connector.Error as err:
@@ -466,70 +765,124 @@ def api_request_room():
         cur.close()
         conn.close()
 
+def _review_page_args():
+    """(sort, after, page_size) of the current request, see review_pages.page_args()."""
+    return review_pages.page_args(request.args)
+
+
+def _review_page(cursor, lids, sort, after=None, page_size=None):
+    """
+    (reviews with their tags, next_cursor) of the given LIDs. First pages of a
+    single location come from review_first_pages when they are there.
+    """
+    hot = page_size is not None and after is None and len(lids) == 1
+    if hot:
+        page = review_first_pages.get(lids[0], sort, page_size)
+        if page is not None:
+            return page
+
+    sql, params = review_pages.reviews_query(lids, sort, after, page_size)
+    cursor.execute(sql, params)
+    reviews, next_cursor = review_pages.split_page(cursor.fetchall(), sort, page_size)
+
+    # --- Attach tags (one batched query per tag table) ---
+    attach_tags(cursor, reviews)
+
+    if hot:
+        review_first_pages.put(lids[0], sort, page_size, (reviews, next_cursor))
+    return reviews, next_cursor
+
+
 @app.route("/api/reviews", methods=["GET"])
+@response_cache.cached(tags=_review_tags)
+@request_coalescer.coalesced()
 def get_reviews():
-    """Fetch all ratings for a given location and university, including tags."""
+    """
+    Fetch the ratings for a given location and university, including tags.
+
+    Without `limit` every review is returned, newest first. With `limit` the
+    reviews are keyset-paginated (review_pages.py):
+      limit   -- page size (capped at review_pages.MAX_PAGE_SIZE)
+      cursor  -- `next_cursor` from the previous page
+      sort    -- "-date" (default), "date", "-score" or "score"
+
+    A name that matches several locations (and none exactly) gets a 409 with
+    their LIDs (location_lookup.py).
+    """
     location_name = request.args.get("location")
     university_name = request.args.get("university")
 
     if not location_name or not university_name:
         return jsonify({"error": "Missing location or university"}), 400
 
+    try:
+        sort, after, page_size = _review_page_args()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
     conn = get_db()
     cursor = conn.cursor(dictionary=True)
 
+    # The location with that name, else its only name_key match (one index probe, or none if cached)
+    try:
+        lid = location_resolver.resolve(cursor, university_name, location_name)
+    except AmbiguousLocation as err:
+        cursor.close()
+        return jsonify({"error": str(err), "LIDs": err.lids}), 409
+    if lid is None:
+        cursor.close()
+        conn.close()
+        return jsonify({"reviews": [], "next_cursor": None} if page_size is not None else {"reviews": []})
+
     # --- Fetch reviews ---
-    sql = """
-    SELECT 
-        r.RID,
-        u.username,
-        u.role AS role,
-        r.score,
-        r.noise,
-        r.cleanliness,
-        r.equipment_quality,
-        r.wifi_strength,
-        r.extra_comments AS comment,
-        r.date
-    FROM ratings r
-    JOIN users u ON r.UID = u.uid
-    JOIN location l ON r.LID = l.LID
-    JOIN university uni ON l.university_id = uni.university_id
-    WHERE l.name = %s AND uni.name = %s
-    ORDER BY r.date DESC
-    """
+    reviews, next_cursor = _review_page(cursor, [lid], sort, after, page_size)
 
-    cursor.execute(sql, (location_name, university_name))
-    reviews = cursor.fetchall()
+    cursor.close()
+    conn.close()
 
-    # --- Attach tags for each review ---
-    for review in reviews:
-        rid = review["RID"]
+    if page_size is None:
+        return jsonify({"reviews": reviews})
+    return jsonify({"reviews": reviews, "next_cursor": next_cursor})
 
-        # Equipment tags
-        cursor.execute(
-            "SELECT equipment_tag FROM rating_equipment WHERE RID = %s",
-            (rid,)
-        )
-        review["equipment_tags"] = [row["equipment_tag"] for row in cursor.fetchall()]
 
-        # Accessibility tags
-        cursor.execute(
-            "SELECT accessibility_tag FROM rating_accessibility WHERE RID = %s",
-            (rid,)
-        )
-        review["accessibility_tags"] = [row["accessibility_tag"] for row in cursor.fetchall()]
-
-    cursor.close()
-    conn.close()
+@app.route("/api/locations/<int:lid>/reviews", methods=["GET"])
+@request_coalescer.coalesced()
+def lid_reviews(lid):
+    """
+    One page of a location's reviews, addressed by LID: same `limit`, `cursor`
+    and `sort` as /api/reviews, but always paginated (review_pages.DEFAULT_PAGE_SIZE
+    reviews when no limit is given). 404 if there is no such location.
+    """
+    try:
+        sort, after, page_size = _review_page_args()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    if page_size is None:
+        page_size = review_pages.DEFAULT_PAGE_SIZE
 
-    return jsonify({"reviews": reviews})
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        reviews, next_cursor = _review_page(cursor, [lid], sort, after, page_size)
+        if not reviews and after is None:
+            cursor.execute("SELECT LID FROM location WHERE LID = %s", (lid,))
+            if not cursor.fetchall():
+                return jsonify({"error": "Location not found"}), 404
+        return jsonify({"reviews": reviews, "next_cursor": next_cursor})
+    finally:
+        cursor.close()
 
 
 
 @app.route("/api/addReview", methods=["POST"])
 def add_review():
-    """Add a new rating for a location."""
+    """
+    Add a new rating for a location, given as "location" + "university" or by
+    "LID". The user and location are looked up in one statement; the rating,
+    its tags and the summary update go in one transaction (review_writes.py).
+    A name that matches several locations (and none exactly) gets a 409 with
+    their LIDs.
+    """
     try:
         data = request.get_json()
         if not data:
@@ -537,79 +890,58 @@ def add_review():
 
         required_fields = [
             "username", "score", "noise", "cleanliness",
-            "equipment_quality", "wifi_strength", "location", "university"
+            "equipment_quality", "wifi_strength"
         ]
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing fields"}), 400
-        
+        if "LID" not in data and not ("location" in data and "university" in data):
+            return jsonify({"error": "Missing fields"}), 400
+
         # Optional tag lists
         equipment_tags = data.get("equipment_tags", [])
         accessibility_tags = data.get("accessibility_tags", [])
 
+        # Reject unknown tags before anything is written
+        bad_tags = (schema_registry.invalid_values("equipment_tags", equipment_tags)
+                    + schema_registry.invalid_values("accessibility_tags", accessibility_tags))
+        if bad_tags:
+            return jsonify({"error": "Invalid tags", "invalid_tags": bad_tags}), 400
+
         conn = get_db()
         cursor = conn.cursor(dictionary=True, buffered=True)
 
-        # Find user
-        cursor.execute("SELECT uid, role FROM users WHERE username = %s", (data["username"],))
-        user = cursor.fetchone()
-        if not user:
+        # Find user and location (one statement)
+        try:
+            target = review_writes.lookup(cursor, data["username"], data.get("LID"),
+                                          data.get("university"), data.get("location"))
+        except AmbiguousLocation as err:
+            return jsonify({"error": str(err), "LIDs": err.lids}), 409
+        if not target:
             return jsonify({"error": "User not found"}), 404
-        uid = user["uid"]
-        role = user["role"]
-
-        # Find location
-        cursor.execute("""
-            SELECT l.LID 
-            FROM location l
-            JOIN university u ON l.university_id = u.university_id
-            WHERE l.name = %s AND u.name = %s
-        """, (data["location"], data["university"]))
-        loc = cursor.fetchone()
-        if not loc:
+        if target["LID"] is None:
             return jsonify({"error": "Location not found"}), 404
-        lid = loc["LID"]
+        lid = target["LID"]
 
-        # Insert review
-        cursor.execute("""
-            INSERT INTO ratings 
-            (UID, LID, score, noise, cleanliness, equipment_quality, wifi_strength, extra_comments, date)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            uid, lid,
-            data["score"], data["noise"], data["cleanliness"],
-            data["equipment_quality"], data["wifi_strength"],
-            data.get("comment", ""),
-            datetime.now()
-        ))
+        # Insert review, its tags (one INSERT per tag table) and the summary update; one commit
+        rid = review_writes.insert_review(cursor, target["uid"], lid, data, equipment_tags, accessibility_tags)
         conn.commit()
 
-        # Retrieve the RID for tag inserts
-        rid = cursor.lastrowid
-
-        # --- Insert Equipment Tags ---
-        for tag in equipment_tags:
-            cursor.execute(
-                "INSERT INTO rating_equipment (RID, equipment_tag) VALUES (%s, %s)",
-                (rid, tag)
-            )
-
-        # --- Insert Accessibility Tags ---
-        for tag in accessibility_tags:
-            cursor.execute(
-                "INSERT INTO rating_accessibility (RID, accessibility_tag) VALUES (%s, %s)",
-                (rid, tag)
-            )
-
-        conn.commit()
+        response_cache.invalidate(location_tag(lid), university_tag(target["university_name"]))
+        review_first_pages.forget(lid)
 
         return jsonify({
             "message": "Review added successfully",
-            "role": role,
+            "role": target["role"],
             "username": data["username"],
             "RID": rid
         })
 
     except Exception as e:
+        # Nothing is committed unless the rating, its tags and the summary all went in
+        try:
+            conn.rollback()
+        except:
+            pass
         # Catch all other errors and return JSON instead of HTML
         return jsonify({"error": str(e)}), 500
 
@@ -620,75 +952,22 @@ def add_review():
         except:
             pass
 
-@app.route("/api/locationRatings")
-def location_ratings():
-    location_name = request.args.get("location", "")
-    university_name = request.args.get("university", "")
-    room_param = request.args.get("room", "")  # extra param used by university page
-
-    conn = get_db()
-    cursor = conn.cursor(dictionary=True)
-
-    # -----------------------------------------
-    # Get location info
-    # -----------------------------------------
-    cursor.execute(
-        """
+# Queries of /api/locationRatings and /api/locations/<lid>/ratings, shared with the async entry point (asgi.py)
+LOCATION_INFO_SQL = """
 SELECT
   L.LID,
   L.name AS location_name,
-  CASE
-    WHEN B.LID IS NOT NULL THEN 'Building'
-    WHEN NB.LID IS NOT NULL THEN 'Non-building'
-    ELSE 'Room'
-  END AS location_type,
-  -- building_name: for ROOM rows, look up the building's location row name (BL.name)
-  CASE
-    WHEN B.LID IS NULL AND NB.LID IS NULL THEN BL.name
-    ELSE NULL
-  END AS building_name,
+  L.location_type,
+  -- building_name: set for rooms only (denormalized, see location_types.py)
+  L.building_name,
   U.name AS university_name,
   L.campus_name AS campus_name
 FROM location L
-LEFT JOIN buildings B ON L.LID = B.LID
-LEFT JOIN nonbuildings NB ON L.LID = NB.LID
--- If L is a room (i.e., no B and no NB), find the room row, its building, then that building's location row
-LEFT JOIN rooms R ON L.LID = R.LID
-LEFT JOIN buildings BR ON R.building_LID = BR.LID
-LEFT JOIN location BL ON BR.LID = BL.LID
 JOIN university U ON L.university_id = U.university_id
-WHERE (
-      L.name = %s
-   OR L.name = %s
-   OR REPLACE(L.name, ' - Room ', ' ') = %s
-)
-AND U.name = %s
-
-        """,
-        (
-            location_name,      # matches raw "BEH 1000" or "BEH - Room 1000"
-            room_param,         # matches exact room long-format name
-            location_name,      # matches translated short version
-            university_name,
-        )
-    )
-
-    # location_info = cursor.fetchone()
-    rows = cursor.fetchall()  # fetch all to clear result set
-    location_info = rows[0] if rows else None
-    
-
-    if not location_info:
-        cursor.close()
-        return {"location": None, "ratings": []}
-
-    lid = location_info["LID"]
-
-    # -----------------------------------------
-    # Get ratings for this location
-    # -----------------------------------------
-    cursor.execute(
+WHERE L.LID = %s
         """
+
+LOCATION_REVIEWS_SQL = """
         SELECT R.RID,
                U.username AS user_type,
                U.role AS role,
@@ -700,91 +979,170 @@ AND U.name = %s
                R.equipment_quality,
                R.wifi_strength,
                R.extra_comments AS comment,
-               GROUP_CONCAT(DISTINCT RE.equipment_tag) AS tags_equipment,
-               GROUP_CONCAT(DISTINCT RE2.accessibility_tag) AS tags_accessibility
+               R.date
         FROM ratings R
         JOIN users U ON R.UID = U.uid
         LEFT JOIN university ON U.university_id = university.university_id
-        LEFT JOIN rating_equipment RE ON R.RID = RE.RID
-        LEFT JOIN rating_accessibility RE2 ON R.RID = RE2.RID
         WHERE R.LID = %s
-        GROUP BY R.RID
-        """,
-        (lid,)
-    )
-    
-    ratings = cursor.fetchall()
+        """
+
+
+def location_reviews_query(lid, sort=review_pages.DEFAULT_SORT, after=None, page_size=None):
+    """(sql, params) of a location's reviews for /api/locationRatings, all of them or one page."""
+    clause, params = review_pages.page_clause(sort, after, page_size, alias="R")
+    return LOCATION_REVIEWS_SQL + clause, [lid] + params
+
+
+def _location_ratings_payload(cursor, lid, summary_only=False, page=(review_pages.DEFAULT_SORT, None, None)):
+    """
+    Location info, summary and (unless summary_only) reviews of one LID; None
+    if it doesn't exist. page -- (sort, after, page_size) from _review_page_args();
+    with a page size only that many reviews are sent, plus a next_cursor.
+    """
+    cursor.execute(LOCATION_INFO_SQL, (lid,))
+    rows = cursor.fetchall()  # fetch all to clear result set
+    if not rows:
+        return None
+    location_info = rows[0]
+    response_cache.tag(*_location_tags(location_info))
+
+    # -----------------------------------------
+    # Aggregates: one primary-key lookup in location_rating_summary
+    # -----------------------------------------
+    summary = load_summaries(cursor, [lid]).get(lid)
+
+    if summary_only:
+        return {"location": location_info, "summary": summary}
+
+    # -----------------------------------------
+    # Get ratings for this location
+    # -----------------------------------------
+    sort, after, page_size = page
+    cursor.execute(*location_reviews_query(lid, sort, after, page_size))
+    ratings, next_cursor = review_pages.split_page(cursor.fetchall(), sort, page_size)
+
+    # Tags as arrays, loaded in one batched query per tag table
+    attach_tags(cursor, ratings)
+
+    payload = {"location": location_info, "summary": summary, "ratings": ratings}
+    if page_size is not None:
+        payload["next_cursor"] = next_cursor
+    return payload
+
+
+@app.route("/api/locationRatings")
+@response_cache.cached(tags=_location_rating_tags)
+@request_coalescer.coalesced()
+def location_ratings():
+    """
+    Location info, rating summary and reviews (newest first) of a location
+    addressed by name. Every review is sent unless `limit` or `cursor` is
+    given; then one page is, with a `next_cursor` (same arguments as /api/reviews).
+    Ambiguous names get a 409, as on /api/reviews.
+    """
+    location_name = request.args.get("location", "")
+    university_name = request.args.get("university", "")
+    room_param = request.args.get("room", "")  # extra param used by university page
+    summary_only = request.args.get("summaryOnly", "") in ("1", "true")
+    try:
+        page = _review_page_args()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+
+    # -----------------------------------------
+    # Find the location: raw "BEH 1000", long "BEH - Room 1000" or the exact room name
+    # -----------------------------------------
+    try:
+        lid = location_resolver.resolve(cursor, university_name, location_name, room_param)
+        payload = _location_ratings_payload(cursor, lid, summary_only, page) if lid is not None else None
+        if payload is None and lid is not None:
+            # The cached LID was deleted since; look the name up again
+            lid = location_resolver.resolve(cursor, university_name, location_name, room_param, refresh=True)
+            payload = _location_ratings_payload(cursor, lid, summary_only, page) if lid is not None else None
+    except AmbiguousLocation as err:
+        return jsonify({"error": str(err), "LIDs": err.lids}), 409
+    finally:
+        cursor.close()
 
-    # Convert comma-separated tags → arrays
-    for r in ratings:
-        r["equipment_tags"] = r["tags_equipment"].split(",") if r["tags_equipment"] else []
-        r["accessibility_tags"] = r["tags_accessibility"].split(",") if r["tags_accessibility"] else []
+    if payload is None:
+        return {"location": None, "summary": None, "ratings": []}
+    return payload
 
-        # optional: remove the old keys
-        r.pop("tags_equipment", None)
-        r.pop("tags_accessibility", None)
 
+@app.route("/api/locations/<int:lid>/ratings")
+@response_cache.cached(tags=["users"])
+@request_coalescer.coalesced()
+def lid_location_ratings(lid):
+    """Same response as /api/locationRatings, addressed by LID (404 if there is no such location)."""
+    try:
+        page = _review_page_args()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    payload = _location_ratings_payload(cursor, lid, request.args.get("summaryOnly", "") in ("1", "true"), page)
     cursor.close()
-    return {"location": location_info, "ratings": ratings}
+    if payload is None:
+        return jsonify({"error": "Location not found"}), 404
+    return payload
 
 ############# ADMIN ENDPOINTS #############
 
-def is_admin(username):
-    """Helper: return True if user is admin."""
+# Admin endpoints are guarded by @auth_tokens.admin_required: the role comes
+# from the signed session token (no users query per call).
+
+def _set_role(target, role):
+    """Change a user's role and make their existing tokens carry it."""
     conn = get_db()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT role FROM users WHERE username = %s", (username,))
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET role = %s WHERE username = %s", (role, target))
+    cursor.execute("SELECT uid FROM users WHERE username = %s", (target,))
     row = cursor.fetchone()
+    conn.commit()
     cursor.close()
-    return row and row["role"] == "admin"
+    if row:
+        auth_tokens.role_changed(row[0], role)
+    response_cache.invalidate("users")
+    review_first_pages.forget()
 
 
 @app.route("/api/admin/promote", methods=["POST"])
+@auth_tokens.admin_required
 def promote_user():
     data = request.get_json()
-    requester = data.get("admin_username")
     target = data.get("target_username")
 
-    if not is_admin(requester):
-        return jsonify({"error": "Unauthorized"}), 403
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET role = 'admin' WHERE username = %s", (target,))
-    conn.commit()
-    cursor.close()
+    _set_role(target, "admin")
 
     return jsonify({"message": f"{target} promoted to admin"})
 
 
 @app.route("/api/admin/demote", methods=["POST"])
+@auth_tokens.admin_required
 def demote_user():
     data = request.get_json()
-    requester = data.get("admin_username")
     target = data.get("target_username")
 
-    if not is_admin(requester):
-        return jsonify({"error": "Unauthorized"}), 403
-
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET role = 'user' WHERE username = %s", (target,))
-    conn.commit()
-    cursor.close()
+    _set_role(target, "user")
 
     return jsonify({"message": f"{target} demoted to user"})
 
 
 @app.route("/api/admin/users", methods=["GET"])
+@auth_tokens.admin_required
 def admin_list_users():
-    admin = request.args.get("admin")
-
-    if not is_admin(admin):
-        return jsonify({"error": "Unauthorized"}), 403
+    sql = "SELECT uid, username, role, university_id FROM users"
+    if wants_stream():
+        # One user per line
+        return stream_response(iter_query(db_pool, sql))
 
     conn = get_db()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT uid, username, role, university_id FROM users")
+    cursor.execute(sql)
     users = cursor.fetchall()
     cursor.close()
 
@@ -792,11 +1150,8 @@ def admin_list_users():
 
 
 @app.route("/api/admin/universities", methods=["GET"])
+@auth_tokens.admin_required
 def admin_list_universities():
-    admin = request.args.get("admin")
-    if not is_admin(admin):
-        return jsonify({"error": "Unauthorized"}), 403
-
     conn = get_db()
     cursor = conn.cursor(dictionary=True)
     cursor.execute("SELECT * FROM university ORDER BY name")
@@ -807,12 +1162,9 @@ def admin_list_universities():
 
 
 @app.route("/api/admin/addUniversity", methods=["POST"])
+@auth_tokens.admin_required
 def admin_add_university():
     data = request.get_json()
-    admin = data.get("admin_username")
-
-    if not is_admin(admin):
-        return jsonify({"error": "Unauthorized"}), 403
 
     name = data.get("name")
     state = data.get("state")
@@ -825,18 +1177,18 @@ def admin_add_university():
         (name, state, wiki)
     )
     conn.commit()
+    search_index.add_university(cursor.lastrowid, name, state)
+    university_suggester.add(cursor.lastrowid, name, state)
+    response_cache.invalidate(university_tag(name))
     cursor.close()
 
     return jsonify({"message": "University added"})
 
 
 @app.route("/api/admin/deleteUniversity", methods=["POST"])
+@auth_tokens.admin_required
 def admin_delete_university():
     data = request.get_json()
-    admin = data.get("admin_username")
-
-    if not is_admin(admin):
-        return jsonify({"error": "Unauthorized"}), 403
 
     name = data.get("name")
     state = data.get("state")
@@ -859,20 +1211,23 @@ def admin_delete_university():
     if cursor.fetchone()[0] > 0:
         return jsonify({"error": "Cannot delete: campuses still exist"}), 400
 
+    # Its users' ratings go with them in the cascade
+    remove_ratings(cursor, university_id=uid)
     cursor.execute("DELETE FROM university WHERE university_id = %s", (uid,))
     conn.commit()
+    search_index.remove_university(uid)
+    university_suggester.remove(uid)
+    location_resolver.forget(name)
+    response_cache.invalidate(university_tag(name))
     cursor.close()
 
     return jsonify({"message": "University deleted"})
 
 
 @app.route("/api/admin/addCampus", methods=["POST"])
+@auth_tokens.admin_required
 def admin_add_campus():
     data = request.get_json()
-    admin = data.get("admin_username")
-
-    if not is_admin(admin):
-        return jsonify({"error": "Unauthorized"}), 403
 
     university = data.get("university")
     state = data.get("state")
@@ -893,6 +1248,7 @@ def admin_add_campus():
     # Insert campus
     cursor.execute("INSERT INTO campus (university_id, campus_name) VALUES (%s, %s)", (uid, campus_name))
     conn.commit()
+    response_cache.invalidate(university_tag(university))
     cursor.close()
 
     return jsonify({"message": "Campus added"})
@@ -951,10 +1307,8 @@ def login_user():   # <-- changed function name
 #     })
 
 @app.route("/api/admin/requested-rooms")
+@auth_tokens.admin_required
 def admin_requested_rooms():
-    user = get_current_user()
-    if not user or user["username"] != "admin":
-        return jsonify({"error": "Unauthorized"}), 403
 
     conn = get_db()
     cursor = conn.cursor(dictionary=True)
@@ -981,19 +1335,18 @@ def admin_requested_rooms():
     return jsonify({"requests": rows})
 
 def get_current_user():
-    # token = request.cookies.get("auth_token")
-    # if not token:
-    #     return None
-
-    conn = get_db()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT uid, username, role FROM users WHERE username = 'admin'")
-    user = cursor.fetchone()
-    cursor.close()
-
-    return user
+    """uid / username / role / university_id of the logged-in user, from the session token (or None)."""
+    return auth_tokens.current()
 
 
 
 if __name__ == '__main__':
+    # Load the autocomplete list and ENUM vocabularies up front so the first
+    # requests don't pay for them
+    with app.app_context():
+        try:
+            university_suggester.warm()
+            schema_registry.refresh(force=True)
+        except (mysql.connector.Error, PoolTimeout) as err:
+            print(f"Startup preload skipped ({err}); data will load on first use.")
     app.run(debug=True)
\ No newline at end of file
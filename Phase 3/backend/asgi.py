@@ -0,0 +1,448 @@
+"""
+ASGI entry point: the same API served on an event loop.
+
+    uvicorn asgi:application --port 5000
+
+The endpoints that fan out into several independent queries are served
+natively with an aiomysql pool and run those queries concurrently:
+
+  /api/university       -- campuses, locations and the total count at once
+  /api/locationRatings  -- summary, reviews and both tag tables at once
+
+Every other route (and NDJSON streaming requests) is handed to the Flask app
+from app.py, which runs on a thread pool next to the event loop. Both paths
+share app.py's SQL, formatting and response cache, so a write through Flask
+invalidates what the async handlers cached. `python app.py` keeps working as
+before.
+
+Pool settings: ASYNC_DB_POOL_SIZE, ASYNC_DB_POOL_TIMEOUT and
+ASYNC_DB_POOL_RECYCLE in .env; ASGI_WSGI_THREADS sizes the Flask thread pool.
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+import aiomysql
+from werkzeug.datastructures import MultiDict
+
+from app import (
+    CAMPUSES_SQL, LOCATION_COUNT_SQL, LOCATION_INFO_SQL, UNIVERSITY_INFO_SQL,
+    _location_cursor, _location_rating_tags, _location_tags, _university_tags, app, format_locations,
+    compressor, location_resolver, location_reviews_query, request_coalescer, response_cache,
+    university_locations_query,
+)
+from db_pool import PoolTimeout
+from location_lookup import AmbiguousLocation, choose
+from pagination import InvalidCursor, clamp_limit, decode_cursor
+from rating_summary import full_summary
+from review_pages import page_args, split_page
+from response_cache import make_key
+from streaming import NDJSON_MIMETYPE
+from tag_loader import TAG_TABLES
+
+CORS_ORIGINS = {"http://localhost:5173"}  # same as the flask_cors setup in app.py
+
+
+# ============================================================
+# Async connection pool
+# ============================================================
+class AsyncDatabase:
+    """aiomysql pool; every query borrows a connection, so gathered queries run in parallel."""
+
+    def __init__(self, size=15, timeout=10.0, recycle=3600):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self._pool = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            size=int(os.environ.get("ASYNC_DB_POOL_SIZE", 15)),
+            timeout=float(os.environ.get("ASYNC_DB_POOL_TIMEOUT", 10)),
+            recycle=int(os.environ.get("ASYNC_DB_POOL_RECYCLE", 3600)),
+        )
+
+    async def start(self):
+        self._pool = await aiomysql.create_pool(
+            host="localhost",
+            user=os.environ.get("DB_USER"),
+            password=os.environ.get("DB_PASSWORD"),
+            db="campus_insider",
+            minsize=1,
+            maxsize=self.size,
+            pool_recycle=self.recycle,
+            autocommit=True,  # read-only handlers; never keep a stale snapshot around
+            cursorclass=aiomysql.DictCursor,
+        )
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+
+    async def fetchall(self, sql, params=()):
+        try:
+            conn = await asyncio.wait_for(self._pool.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"no async connection free after {self.timeout:.1f}s")
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+        finally:
+            self._pool.release(conn)
+
+
+db = AsyncDatabase.from_env()
+
+
+# ============================================================
+# Native async handlers
+# ============================================================
+async def show_university(args):
+    """Async /api/university (see show_university in app.py for the parameters)."""
+    university = args.get("name")
+    state = args.get("state")
+
+    if not university or not state:
+        return 400, {"error": "Missing name or state"}
+
+    limit = args.get("limit", type=int)
+    page_cursor = args.get("cursor")
+    sort = args.get("sort", "name")
+    include_total = args.get("includeTotal", "") in ("1", "true")
+
+    if sort not in ("name", "-name", "rating", "-rating"):
+        return 400, {"error": "Invalid sort, expected 'name', '-name', 'rating' or '-rating'"}
+
+    paginate = limit is not None or page_cursor is not None
+    after = None
+    if page_cursor:
+        try:
+            after = decode_cursor(page_cursor, 2)
+        except InvalidCursor as err:
+            return 400, {"error": str(err)}
+
+    try:
+        uni_info = await db.fetchall(UNIVERSITY_INFO_SQL, (university, state))
+        if not uni_info:
+            return 404, {"error": "University not found"}
+        uni_id = uni_info[0]["university_id"]
+
+        page_size = clamp_limit(limit) if paginate else None
+        sql_locations, params, sort_key = university_locations_query(uni_id, sort, after, page_size)
+
+        # Everything below only depends on uni_id
+        queries = [db.fetchall(CAMPUSES_SQL, (uni_id,)), db.fetchall(sql_locations, params)]
+        if paginate and include_total:
+            queries.append(db.fetchall(LOCATION_COUNT_SQL, (uni_id,)))
+        campuses, raw_locations, *total = await asyncio.gather(*queries)
+    except aiomysql.MySQLError as err:
+        return 500, {"error": str(err)}
+
+    next_cursor = None
+    if paginate and len(raw_locations) > page_size:
+        raw_locations = raw_locations[:page_size]
+        next_cursor = _location_cursor(raw_locations[-1], sort_key)
+
+    response = {
+        "university_info": uni_info,
+        "campuses": campuses,
+        "locations": format_locations(raw_locations)
+    }
+    if paginate:
+        response["next_cursor"] = next_cursor
+        if include_total:
+            response["total"] = total[0][0]["total"]
+    return 200, response
+
+
+async def location_ratings(args):
+    """Async /api/locationRatings (with `limit` / `cursor`, one page of reviews)."""
+    location_name = args.get("location", "")
+    university_name = args.get("university", "")
+    room_param = args.get("room", "")
+    try:
+        sort, after, page_size = page_args(args)
+    except ValueError as err:
+        return 400, {"error": str(err)}
+
+    # Name -> LID through the shared cache, or one probe of idx_location_uni_name_key
+    names = (location_name, room_param)
+    name = location_name or room_param
+    try:
+        matches = location_resolver.get(university_name, names)
+        lid = choose(name, matches) if matches is not None else None
+        rows = await db.fetchall(LOCATION_INFO_SQL, (lid,)) if lid is not None else []
+        if not rows:
+            query = location_resolver.query(university_name, names)
+            matches = location_resolver.matches(await db.fetchall(*query)) if query else []
+            location_resolver.put(university_name, names, matches)
+            lid = choose(name, matches)
+            rows = await db.fetchall(LOCATION_INFO_SQL, (lid,)) if lid is not None else []
+    except AmbiguousLocation as err:
+        return 409, {"error": str(err), "LIDs": err.lids}
+    location_info = rows[0] if rows else None
+    if not location_info:
+        return 200, {"location": None, "summary": None, "ratings": []}
+
+    lid = location_info["LID"]
+    summary_query = db.fetchall("SELECT * FROM location_rating_summary WHERE LID = %s", (lid,))
+
+    if args.get("summaryOnly", "") in ("1", "true"):
+        summary_rows = await summary_query
+        return 200, {"location": location_info, "summary": full_summary(summary_rows[0] if summary_rows else None)}
+
+    reviews_query = db.fetchall(*location_reviews_query(lid, sort, after, page_size))
+    if page_size is None:
+        # Tags are looked up by LID (through ratings) so they don't have to wait for the RIDs
+        tag_queries = [
+            db.fetchall(
+                f"SELECT T.RID, T.{column} FROM {table} T JOIN ratings R ON R.RID = T.RID"
+                f" WHERE R.LID = %s ORDER BY T.RID, T.{column}",
+                (lid,)
+            )
+            for table, column in TAG_TABLES.values()
+        ]
+        summary_rows, ratings, *tag_rows = await asyncio.gather(summary_query, reviews_query, *tag_queries)
+        next_cursor = None
+    else:
+        # One page: only the tags of its reviews, once their RIDs are known
+        summary_rows, ratings = await asyncio.gather(summary_query, reviews_query)
+        ratings, next_cursor = split_page(ratings, sort, page_size)
+        rids = [r["RID"] for r in ratings]
+        placeholders = ", ".join(["%s"] * len(rids))
+        tag_rows = await asyncio.gather(*[
+            db.fetchall(f"SELECT RID, {column} FROM {table} WHERE RID IN ({placeholders}) ORDER BY RID, {column}",
+                        rids)
+            for table, column in TAG_TABLES.values()
+        ]) if rids else [[] for _ in TAG_TABLES]
+
+    tags = {r["RID"]: {key: [] for key in TAG_TABLES} for r in ratings}
+    for (key, (_, column)), found in zip(TAG_TABLES.items(), tag_rows):
+        for row in found:
+            if row["RID"] in tags:
+                tags[row["RID"]][key].append(row[column])
+    for review in ratings:
+        review.update(tags[review["RID"]])
+
+    summary = full_summary(summary_rows[0] if summary_rows else None)
+    payload = {"location": location_info, "summary": summary, "ratings": ratings}
+    if page_size is not None:
+        payload["next_cursor"] = next_cursor
+    return 200, payload
+
+
+def _show_university_tags(args, payload):
+    return _university_tags(args)
+
+
+def _location_ratings_tags(args, payload):
+    location = payload.get("location")
+    return _location_rating_tags(args) + (_location_tags(location) if location else [])
+
+
+# path -> (handler, function (args, payload) -> cache tags)
+ROUTES = {
+    "/api/university": (show_university, _show_university_tags),
+    "/api/locationRatings": (location_ratings, _location_ratings_tags),
+}
+
+
+# ============================================================
+# Flask fallback (WSGI on a thread pool)
+# ============================================================
+class WSGIBridge:
+    """
+    Runs a WSGI app for ASGI requests on a thread pool.
+
+    Body chunks are sent as the app yields them, so Flask's streaming
+    responses still stream.
+    """
+
+    def __init__(self, wsgi_app, threads=32):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="flask")
+
+    async def __call__(self, scope, receive, send):
+        body = io.BytesIO()
+        while True:
+            message = await receive()
+            body.write(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body.seek(0)
+
+        loop = asyncio.get_running_loop()
+        environ = self._environ(scope, body)
+        await loop.run_in_executor(self.executor, self._run, environ, send, loop)
+
+    def _run(self, environ, send, loop):
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["message"] = {
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers],
+            }
+
+        def send_start():
+            if "message" in started:
+                send_sync(started.pop("message"))
+
+        result = self.wsgi_app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    send_start()
+                    send_sync({"type": "http.response.body", "body": chunk, "more_body": True})
+            send_start()
+            send_sync({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+    @staticmethod
+    def _environ(scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        if scope.get("client"):
+            environ["REMOTE_ADDR"] = scope["client"][0]
+        for name, value in scope.get("headers", []):
+            name, value = name.decode("latin1"), value.decode("latin1")
+            if name == "content-type":
+                environ["CONTENT_TYPE"] = value
+            elif name == "content-length":
+                environ["CONTENT_LENGTH"] = value
+            else:
+                key = "HTTP_" + name.upper().replace("-", "_")
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+
+# ============================================================
+# ASGI application
+# ============================================================
+def _wants_stream(args, headers):
+    if args.get("stream", "") in ("1", "true"):
+        return True
+    return NDJSON_MIMETYPE.encode() in headers.get(b"accept", b"")
+
+
+class CampusInsiderASGI:
+    def __init__(self, flask_app, routes, database):
+        self.flask = WSGIBridge(flask_app, threads=int(os.environ.get("ASGI_WSGI_THREADS", 32)))
+        self.routes = routes
+        self.db = database
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        route = self.routes.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "GET" else None
+        if route is not None:
+            args = MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin1"), keep_blank_values=True))
+            headers = dict(scope.get("headers", []))
+            if not _wants_stream(args, headers):
+                await self._serve(route, scope["path"], args, headers, send)
+                return
+        await self.flask(scope, receive, send)
+
+    async def _serve(self, route, path, args, headers, send):
+        handler, tags = route
+        extra = []
+        origin = headers.get(b"origin")
+        if origin and origin.decode("latin1") in CORS_ORIGINS:
+            extra = [(b"access-control-allow-origin", origin), (b"access-control-allow-credentials", b"true"),
+                     (b"vary", b"Origin")]
+
+        key = make_key(path, args)
+        entry = response_cache.lookup(key) if response_cache.enabled else None
+        coalesced = False
+        if entry is not None:
+            status, body, cache_state = 200, entry["body"], b"HIT"
+            variants = entry.get("encodings") or {}
+        else:
+            async def compute():
+                try:
+                    status, payload = await handler(args)
+                except PoolTimeout:
+                    status, payload = 503, {"error": "Database busy, please retry"}
+                except aiomysql.MySQLError as err:
+                    # What the Flask views answer for a database error
+                    status, payload = 500, {"error": str(err)}
+                body = app.json.response(payload).get_data()  # byte-for-byte what jsonify() sends
+                variants = {}
+                if response_cache.enabled and status == 200:
+                    stored = response_cache.store(key, body, "application/json", tags=tags(args, payload))
+                    variants = stored.get("encodings") or {}
+                return status, body, variants
+
+            # Identical requests in flight on the loop share one handler run
+            (status, body, variants), coalesced = await request_coalescer.run_async(path, key, compute)
+            cache_state = b"MISS"
+
+        # gzip / brotli as in the Flask app, from the precompressed cache entry when there is one
+        if compressor.compressible("application/json", len(body)):
+            extra.append((b"vary", b"Accept-Encoding"))
+            encoding = compressor.negotiate(headers.get(b"accept-encoding", b"").decode("latin1"))
+            if encoding is not None:
+                body = variants.get(encoding) or compressor.encode(body, encoding)
+                extra.append((b"content-encoding", encoding.encode("ascii")))
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"x-cache", cache_state)] + ([(b"x-coalesced", b"HIT")] if coalesced else []) + extra,
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.db.start()
+                except Exception as err:
+                    await send({"type": "lifespan.startup.failed", "message": str(err)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.db.close()
+                self.flask.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = CampusInsiderASGI(app, ROUTES, db)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("asgi:application", host="127.0.0.1", port=int(os.environ.get("ASGI_PORT", 8000)))
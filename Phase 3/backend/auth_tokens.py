@@ -0,0 +1,147 @@
+"""
+Signed, expiring session tokens.
+
+/api/login issues a token carrying the user's uid, username, role and
+university_id, signed with AUTH_SECRET_KEY (itsdangerous). Every request is
+authenticated by checking the signature and age in memory, so admin checks no
+longer cost a users query.
+
+Because a token outlives a role change, a small in-process cache records, per
+uid, when the role last changed (and to what) or when the user logged out:
+
+  * role_changed(uid, role) -- tokens issued before this keep working but
+    carry the new role (promote / demote take effect immediately)
+  * revoke(uid)             -- tokens issued before this are rejected (logout)
+
+Entries are dropped once every token they could affect has expired anyway.
+The cache lives in the process, so with several worker processes each one
+only sees the changes made through it until the tokens expire (AUTH_TOKEN_TTL).
+
+The token is read from an `Authorization: Bearer <token>` header or the
+`auth_token` cookie set at login.
+"""
+import functools
+import logging
+import os
+import secrets
+import threading
+import time
+
+from flask import g, jsonify, request
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+COOKIE_NAME = "auth_token"
+
+log = logging.getLogger(__name__)
+
+
+class AuthTokens:
+    def __init__(self, secret, max_age=8 * 3600, salt="campus-insider-auth"):
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret, salt=salt)
+        self._lock = threading.Lock()
+        self._changes = {}  # uid -> (timestamp, new role or None if revoked)
+        self._counters = {"issued": 0, "verified": 0, "expired": 0, "invalid": 0, "revoked": 0, "role_overrides": 0}
+
+    @classmethod
+    def from_env(cls):
+        secret = os.environ.get("AUTH_SECRET_KEY")
+        if not secret:
+            # Tokens then stop working on restart; set AUTH_SECRET_KEY in .env
+            log.warning("AUTH_SECRET_KEY is not set; using a random key for this process.")
+            secret = secrets.token_hex(32)
+        return cls(secret, max_age=int(os.environ.get("AUTH_TOKEN_TTL", 8 * 3600)))
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _prune(self, now):  # now in nanoseconds
+        cutoff = now - self.max_age * 10 ** 9
+        for uid in [uid for uid, (ts, _) in self._changes.items() if ts < cutoff]:
+            del self._changes[uid]
+
+    # ------------------------------------------------------------
+    # Issue / verify
+    # ------------------------------------------------------------
+    def issue(self, user):
+        """Token for a users row (uid, username, role, university_id)."""
+        self._count("issued")
+        return self._serializer.dumps({
+            "uid": user["uid"],
+            "username": user["username"],
+            "role": user["role"],
+            "university_id": user["university_id"],
+            # itsdangerous stamps whole seconds; this orders the token against role changes exactly
+            "iat": time.time_ns(),
+        })
+
+    def verify(self, token):
+        """The token's claims (with any newer role applied), or None if invalid, expired or revoked."""
+        try:
+            claims, issued = self._serializer.loads(token, max_age=self.max_age, return_timestamp=True)
+        except SignatureExpired:
+            self._count("expired")
+            return None
+        except BadSignature:
+            self._count("invalid")
+            return None
+
+        # Tokens from before "iat" existed only know their second: count them as
+        # issued at its start, so a change in that same second still applies
+        issued = claims.pop("iat", None) or int(issued.timestamp()) * 10 ** 9
+        with self._lock:
+            change = self._changes.get(claims["uid"])
+            if change is not None and issued <= change[0]:
+                if change[1] is None:
+                    self._counters["revoked"] += 1
+                    return None
+                claims["role"] = change[1]
+                self._counters["role_overrides"] += 1
+            self._counters["verified"] += 1
+        return claims
+
+    # ------------------------------------------------------------
+    # Revocation / role-change cache
+    # ------------------------------------------------------------
+    # Changes and tokens are both stamped in nanoseconds, so a token issued in
+    # the same second as a demotion or logout is still caught, while logging
+    # back in right after logging out gives a token that works.
+    def role_changed(self, uid, role):
+        now = time.time_ns()
+        with self._lock:
+            self._prune(now)
+            self._changes[uid] = (now, role)
+
+    def revoke(self, uid):
+        now = time.time_ns()
+        with self._lock:
+            self._prune(now)
+            self._changes[uid] = (now, None)
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "tracked_changes": len(self._changes), "max_age": self.max_age}
+
+    # ------------------------------------------------------------
+    # Flask helpers
+    # ------------------------------------------------------------
+    def current(self):
+        """Claims of the current request's token (None if there is no valid one); verified once per request."""
+        if "auth" not in g:
+            header = request.headers.get("Authorization", "")
+            token = header[7:] if header.startswith("Bearer ") else request.cookies.get(COOKIE_NAME)
+            g.auth = self.verify(token) if token else None
+        return g.auth
+
+    def admin_required(self, view):
+        """401 without a valid token, 403 unless its role is admin."""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            auth = self.current()
+            if auth is None:
+                return jsonify({"error": "Not logged in"}), 401
+            if auth["role"] != "admin":
+                return jsonify({"error": "Unauthorized"}), 403
+            return view(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,158 @@
+"""
+Single-flight request coalescing for read endpoints.
+
+When the same page is requested many times at once (a university page that
+just got linked somewhere), every request used to run the same queries and the
+same formatting. With coalescing, the first request for a key (route plus
+query args as the view reads them, the response cache's make_key())
+computes the response as the leader; identical requests that arrive while it
+is in flight wait for it and get a copy of its response (X-Coalesced: HIT)
+instead of querying MySQL themselves.
+
+Routes opt in with @request_coalescer.coalesced(); only views whose response
+depends on nothing but the path and the query args (no session, no cookies)
+may. A follower waits at most COALESCE_TIMEOUT seconds (default 5) and then
+computes the response itself, as it does when the leader fails.
+COALESCE_ENABLED=0 turns it off.
+
+The ASGI entry point coalesces its native handlers the same way with
+run_async(), so the counters (per route: leaders, coalesced, timeouts,
+leader_errors) cover both servers.
+"""
+import asyncio
+import functools
+import os
+import threading
+
+from flask import current_app, request
+
+from response_cache import make_key
+from streaming import wants_stream
+
+# Headers of the leader's response that followers get as well
+SHARED_HEADERS = ("ETag", "Cache-Control", "Last-Modified")
+
+
+class _Flight:
+    """A computation in progress; `result` is set before `done` unless it failed."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class Coalescer:
+    def __init__(self, timeout=5.0, enabled=True):
+        self.timeout = timeout
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights = {}        # key -> _Flight
+        self._async_flights = {}  # key -> asyncio.Task (event loop thread only)
+        self._routes = {}         # route -> counters
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            timeout=float(os.environ.get("COALESCE_TIMEOUT", 5)),
+            enabled=os.environ.get("COALESCE_ENABLED", "1").lower() not in ("0", "false", "no"),
+        )
+
+    def _count(self, route, name):
+        with self._lock:
+            counters = self._routes.setdefault(
+                route, {"leaders": 0, "coalesced": 0, "timeouts": 0, "leader_errors": 0}
+            )
+            counters[name] += 1
+
+    def coalesced(self):
+        """Share the response of identical concurrent GETs of the wrapped view."""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                # Streamed (NDJSON) responses are produced per request
+                if not self.enabled or request.method != "GET" or wants_stream():
+                    return view(*args, **kwargs)
+
+                route = request.url_rule.rule if request.url_rule else request.path
+                key = make_key(request.path, request.args)
+                with self._lock:
+                    flight = self._flights.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._flights[key] = _Flight()
+
+                if leader:
+                    return self._lead(route, key, flight, view, args, kwargs)
+
+                if not flight.done.wait(self.timeout):
+                    self._count(route, "timeouts")
+                    return view(*args, **kwargs)
+                if flight.result is None:
+                    # The leader raised; don't share its failure, try on our own
+                    return view(*args, **kwargs)
+                self._count(route, "coalesced")
+                body, status, mimetype, headers = flight.result
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.headers.update(headers)
+                response.headers["X-Coalesced"] = "HIT"
+                return response
+            return wrapper
+        return decorator
+
+    def _lead(self, route, key, flight, view, args, kwargs):
+        self._count(route, "leaders")
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+            if not response.direct_passthrough and not response.is_streamed:
+                headers = {name: response.headers[name] for name in SHARED_HEADERS if name in response.headers}
+                flight.result = (response.get_data(), response.status_code, response.mimetype, headers)
+            return response
+        except Exception:
+            self._count(route, "leader_errors")
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def run_async(self, route, key, compute):
+        """
+        Await compute() -- a coroutine function -- once per key among the
+        concurrent callers on the event loop; returns (result, coalesced).
+        """
+        if not self.enabled:
+            return await compute(), False
+
+        task = self._async_flights.get(key)
+        if task is None:
+            self._count(route, "leaders")
+            task = self._async_flights[key] = asyncio.ensure_future(compute())
+            task.add_done_callback(lambda _: self._async_flights.pop(key, None))
+            try:
+                return await task, False
+            except Exception:
+                self._count(route, "leader_errors")
+                raise
+
+        try:
+            # shield: a follower giving up must not cancel the leader
+            result = await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            self._count(route, "timeouts")
+            return await compute(), False
+        except Exception:
+            return await compute(), False
+        self._count(route, "coalesced")
+        return result, True
+
+    def stats(self):
+        with self._lock:
+            routes = {route: dict(counters) for route, counters in self._routes.items()}
+            in_flight = len(self._flights)
+        return {
+            "enabled": self.enabled,
+            "timeout": self.timeout,
+            "in_flight": in_flight + len(self._async_flights),
+            "coalesced": sum(c["coalesced"] for c in routes.values()),
+            "routes": routes,
+        }
@@ -0,0 +1,108 @@
+"""
+gzip / brotli response compression, negotiated from Accept-Encoding.
+
+Location listings are large and very repetitive (the same campus, building
+and type strings on every row), so they shrink by an order of magnitude.
+Responses of a compressible type (JSON, text) at or above COMPRESS_MIN_BYTES
+(default 1024) are compressed with the best encoding the client accepts:
+brotli ("br", with the `brotli` package from requirements.txt) or gzip, at
+COMPRESS_LEVEL (default 6 for gzip; brotli uses the same number as its
+quality). COMPRESS_ENABLED=0 turns it off.
+
+Cacheable responses are compressed once, when the response cache stores them
+(variants()), and served from those precompressed bodies afterwards; the
+after_request hook only compresses what didn't come with an encoding already.
+Streamed (NDJSON) bodies are left alone.
+"""
+import gzip
+import os
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli  # in requirements.txt; without it only gzip is offered
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/csv")
+
+
+class Compressor:
+    def __init__(self, min_size=1024, level=6, enabled=True):
+        self.min_size = min_size
+        self.level = level
+        self.enabled = enabled
+        # Preferred first when the client accepts several equally
+        self.encodings = (("br",) if brotli is not None else ()) + ("gzip",)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            min_size=int(os.environ.get("COMPRESS_MIN_BYTES", 1024)),
+            level=int(os.environ.get("COMPRESS_LEVEL", 6)),
+            enabled=os.environ.get("COMPRESS_ENABLED", "1").lower() not in ("0", "false", "no"),
+        )
+
+    def init_app(self, app):
+        # Registered after the PerformanceMonitor, so it runs before it and
+        # the recorded response sizes are bytes on the wire
+        app.after_request(self._after)
+
+    # ------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------
+    def negotiate(self, accept_encoding):
+        """Encoding to use for an Accept-Encoding header value, or None for identity."""
+        if not self.enabled or not accept_encoding:
+            return None
+        return parse_accept_header(accept_encoding).best_match(self.encodings)
+
+    def compressible(self, mimetype, size):
+        return self.enabled and size >= self.min_size and mimetype in COMPRESSIBLE_TYPES
+
+    def encode(self, body, encoding):
+        if encoding == "br":
+            return brotli.compress(body, quality=min(self.level, 11))
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def variants(self, body, mimetype):
+        """{encoding: compressed body} for every supported encoding; {} if not worth compressing."""
+        if not self.compressible(mimetype, len(body)):
+            return {}
+        return {encoding: self.encode(body, encoding) for encoding in self.encodings}
+
+    # ------------------------------------------------------------
+    # Flask responses
+    # ------------------------------------------------------------
+    def apply(self, response, encoding, data):
+        """Turn response into its `encoding` form with the given compressed body."""
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        if response.get_etag()[0]:
+            # A different representation: keep If-None-Match working, but weakly
+            response.set_etag(response.get_etag()[0], weak=True)
+
+    def use_variants(self, response, variants):
+        """Serve a cached response from its precompressed bodies, if the client takes one of them."""
+        if not variants:
+            return
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding in variants:
+            self.apply(response, encoding, variants[encoding])
+
+    def _after(self, response):
+        if (response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or request.method == "HEAD"):
+            return response
+        size = response.calculate_content_length()
+        if size is None or not self.compressible(response.mimetype, size):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding is not None:
+            self.apply(response, encoding, self.encode(response.get_data(), encoding))
+        return response
@@ -0,0 +1,226 @@
+"""
+Thread-safe database connection pool used by the Flask API.
+
+Connections are borrowed with acquire() and handed back either with release()
+or by calling close() on the returned PooledConnection, so existing code that
+does `conn.close()` keeps working and simply returns the connection.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the checkout timeout."""
+
+
+class PooledConnection:
+    """Proxy around a driver connection that returns itself to the pool on close()."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name):
+        # Everything except close() goes straight to the real connection
+        if self._returned:
+            raise AttributeError(f"'{name}' used after the connection was returned to the pool")
+        return getattr(self._raw, name)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if not self._returned:
+            self._returned = True
+            self._pool._return(self._raw, self._created_at)
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool with bounded overflow.
+
+    size          -- connections kept open while idle
+    max_overflow  -- extra connections allowed under load, closed when returned
+    recycle       -- seconds after which a connection is replaced on checkout (0 = never)
+    timeout       -- seconds acquire() waits for a free slot before PoolTimeout
+    pre_ping      -- ping every connection on checkout and replace dead ones
+    """
+
+    def __init__(self, connect, size=5, max_overflow=10, recycle=3600,
+                 timeout=10.0, pre_ping=True, name="default"):
+        self._connect = connect
+        self.name = name
+        self.size = size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw, created_at), most recently returned on the right
+        self._open = 0        # idle + checked out
+        self._in_use = 0
+
+        self._counters = {
+            "checkouts": 0,
+            "connects": 0,
+            "recycled": 0,
+            "invalidated": 0,
+            "saturated": 0,      # checkouts that found every slot busy
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "peak_in_use": 0,
+        }
+
+    @classmethod
+    def from_env(cls, connect, prefix="DB_POOL", name="default"):
+        """Build a pool using <prefix>_SIZE, _MAX_OVERFLOW, _RECYCLE, _TIMEOUT and _PRE_PING."""
+        return cls(
+            connect,
+            size=int(os.environ.get(f"{prefix}_SIZE", 5)),
+            max_overflow=int(os.environ.get(f"{prefix}_MAX_OVERFLOW", 10)),
+            recycle=int(os.environ.get(f"{prefix}_RECYCLE", 3600)),
+            timeout=float(os.environ.get(f"{prefix}_TIMEOUT", 10)),
+            pre_ping=os.environ.get(f"{prefix}_PRE_PING", "1").lower() not in ("0", "false", "no"),
+            name=name,
+        )
+
+    # ------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------
+    def acquire(self):
+        start = time.monotonic()
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._open < self.size + self.max_overflow:
+                    # Reserve a slot; the connection is opened outside the lock
+                    self._open += 1
+                    raw, created_at = None, None
+                    break
+
+                if not waited:
+                    waited = True
+                    self._counters["saturated"] += 1
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"Pool '{self.name}' exhausted: no connection available after {self.timeout}s"
+                    )
+                self._cond.wait(remaining)
+
+            if waited:
+                wait_time = time.monotonic() - start
+                self._counters["waits"] += 1
+                self._counters["wait_time_total"] += wait_time
+                self._counters["wait_time_max"] = max(self._counters["wait_time_max"], wait_time)
+            self._counters["checkouts"] += 1
+            self._in_use += 1
+            self._counters["peak_in_use"] = max(self._counters["peak_in_use"], self._in_use)
+
+        if raw is not None and not self._is_usable(raw, created_at):
+            raw = None
+
+        if raw is None:
+            try:
+                raw = self._connect()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            created_at = time.monotonic()
+            with self._cond:
+                self._counters["connects"] += 1
+
+        return PooledConnection(self, raw, created_at)
+
+    def release(self, conn):
+        conn.close()
+
+    def _return(self, raw, created_at):
+        keep = True
+        # Never hand the next request an open transaction (or a stale snapshot)
+        if getattr(raw, "in_transaction", True):
+            try:
+                raw.rollback()
+            except Exception:
+                keep = False
+
+        with self._cond:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.size:
+                self._idle.append((raw, created_at))
+            else:
+                self._open -= 1
+                keep = False
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(raw)
+
+    def _is_usable(self, raw, created_at):
+        """Check a connection taken from the idle list; close it if it is too old or dead."""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._cond:
+                self._counters["recycled"] += 1
+            self._close_quietly(raw)
+            return False
+
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._counters["invalidated"] += 1
+                self._close_quietly(raw)
+                return False
+
+        return True
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------
+    # Housekeeping / metrics
+    # ------------------------------------------------------------
+    def dispose(self):
+        """Close every idle connection (checked-out ones close when returned)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._counters)
+            stats.update({
+                "name": self.name,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "saturation": self._in_use / (self.size + self.max_overflow),
+                "wait_time_avg": (stats["wait_time_total"] / stats["waits"]) if stats["waits"] else 0.0,
+            })
+        return stats
@@ -0,0 +1,408 @@
+"""
+Per-request performance instrumentation.
+
+Connections handed out by get_db() / get_db_connection() are wrapped so that
+every cursor records, for the current request:
+
+  * number of SQL statements and cumulative DB time (execute + fetch)
+  * rows fetched
+
+The JSON provider records how long serialization took, and the request hooks
+add total latency and response size. Every response carries a Server-Timing
+header (visible in the browser dev tools):
+
+    Server-Timing: db;dur=12.4;desc="7 queries, 31 rows", serialize;dur=0.8, total;dur=15.1
+
+and the same numbers are aggregated per endpoint on /metrics in the
+Prometheus text format.
+
+Statements slower than SLOW_QUERY_MS are logged (logger
+"campus_insider.slow_query") with normalized SQL and redacted parameters and
+kept in a small ring buffer. With SLOW_QUERY_EXPLAIN=1 an
+`EXPLAIN FORMAT=JSON` of slow SELECTs is captured on a background thread,
+on a separate connection from the same pool.
+"""
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+log = logging.getLogger("campus_insider.slow_query")
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Statements-per-request buckets (an N+1 shows up in the high buckets)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+# ============================================================
+# SQL normalization
+# ============================================================
+_COMMENT = re.compile(r"--[^\n]*")
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql):
+    """One-line SQL with literals and placeholders replaced by ? and IN lists collapsed."""
+    sql = _COMMENT.sub(" ", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return " ".join(sql.split())
+
+
+def redact_params(params):
+    """Parameter types only, never values (they can be passwords or usernames)."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {k: type(v).__name__ for k, v in params.items()}
+    return [type(v).__name__ for v in params]
+
+
+# ============================================================
+# Per-request recording
+# ============================================================
+def _stats():
+    """This request's counters, or None outside a request (scripts, streamed bodies)."""
+    if not has_request_context():
+        return None
+    if "perf" not in g:
+        g.perf = {"statements": 0, "db_time": 0.0, "rows": 0, "serialize_time": 0.0}
+    return g.perf
+
+
+class InstrumentedCursor:
+    """Proxy around a driver cursor that times statements and counts fetched rows."""
+
+    def __init__(self, cursor, monitor, pool):
+        self._cursor = cursor
+        self._monitor = monitor
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            stats = _stats()
+            if stats is not None:
+                stats["db_time"] += time.perf_counter() - start
+
+    def _statement(self, fn, sql, params):
+        start = time.perf_counter()
+        try:
+            return fn(sql, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = _stats()
+            if stats is not None:
+                stats["statements"] += 1
+                stats["db_time"] += elapsed
+            self._monitor.statement_done(sql, params, elapsed, self._pool)
+
+    def execute(self, sql, params=None):
+        return self._statement(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_params):
+        return self._statement(self._cursor.executemany, sql, seq_params)
+
+    def callproc(self, name, args=()):
+        return self._statement(self._cursor.callproc, name, args)
+
+    def _count_rows(self, rows, single=False):
+        stats = _stats()
+        if stats is not None and rows:
+            stats["rows"] += 1 if single else len(rows)
+        return rows
+
+    def fetchone(self):
+        return self._count_rows(self._timed(self._cursor.fetchone), single=True)
+
+    def fetchmany(self, size=1):
+        return self._count_rows(self._timed(self._cursor.fetchmany, size))
+
+    def fetchall(self):
+        return self._count_rows(self._timed(self._cursor.fetchall))
+
+
+class InstrumentedConnection:
+    """Proxy around a (pooled) connection whose cursors are instrumented."""
+
+    def __init__(self, conn, monitor, pool):
+        self._conn = conn
+        self._monitor = monitor
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._monitor, self._pool)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return self._conn.commit()
+        finally:
+            stats = _stats()
+            if stats is not None:
+                stats["db_time"] += time.perf_counter() - start
+
+    def close(self):
+        self._conn.close()
+
+
+def record_serialize_time(seconds):
+    """Add JSON serialization time to the current request (no-op outside a request)."""
+    stats = _stats()
+    if stats is not None:
+        stats["serialize_time"] += seconds
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, recording the time spent in dumps() for the current request."""
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            record_serialize_time(time.perf_counter() - start)
+
+
+# ============================================================
+# Aggregated metrics
+# ============================================================
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.n += 1
+
+    def lines(self, name, labels):
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.n}')
+        out.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.n}")
+        return out
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+class PerformanceMonitor:
+    """
+    slow_ms  -- statements at or above this many milliseconds are logged
+    explain  -- capture EXPLAIN FORMAT=JSON for slow SELECTs
+    keep     -- slow statements kept for /api/health/slow-queries
+    """
+
+    def __init__(self, slow_ms=200, explain=False, keep=50):
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._endpoints = {}  # endpoint -> aggregates
+        self._statuses = {}   # (endpoint, method, status) -> count
+        self._slow = deque(maxlen=keep)
+        self._slow_total = 0
+        self._explain_queue = queue.Queue(maxsize=100)
+        self._explain_thread = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            slow_ms=float(os.environ.get("SLOW_QUERY_MS", 200)),
+            explain=os.environ.get("SLOW_QUERY_EXPLAIN", "0").lower() in ("1", "true", "yes"),
+        )
+
+    # ------------------------------------------------------------
+    # Wiring
+    # ------------------------------------------------------------
+    def wrap(self, conn, pool):
+        """Instrument a connection borrowed from pool (pool is used for EXPLAIN captures)."""
+        return InstrumentedConnection(conn, self, pool)
+
+    def init_app(self, app):
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._before)
+        app.after_request(self._after)
+
+    def _before(self):
+        g.perf_start = time.perf_counter()
+
+    def _after(self, response):
+        stats = _stats()
+        total = time.perf_counter() - g.pop("perf_start", time.perf_counter())
+        size = response.calculate_content_length()  # None for streamed bodies
+
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats["db_time"] * 1000:.1f};desc="{stats["statements"]} queries, {stats["rows"]} rows", '
+            f'serialize;dur={stats["serialize_time"] * 1000:.1f}, total;dur={total * 1000:.1f}'
+        )
+
+        endpoint = request.endpoint or "unmatched"
+        with self._lock:
+            agg = self._endpoints.get(endpoint)
+            if agg is None:
+                agg = self._endpoints[endpoint] = {
+                    "latency": Histogram(LATENCY_BUCKETS),
+                    "statements_per_request": Histogram(STATEMENT_BUCKETS),
+                    "statements": 0, "db_time": 0.0, "rows": 0, "serialize_time": 0.0, "bytes": 0,
+                }
+            agg["latency"].observe(total)
+            agg["statements_per_request"].observe(stats["statements"])
+            agg["statements"] += stats["statements"]
+            agg["db_time"] += stats["db_time"]
+            agg["rows"] += stats["rows"]
+            agg["serialize_time"] += stats["serialize_time"]
+            agg["bytes"] += size or 0
+            key = (endpoint, request.method, response.status_code)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+        return response
+
+    # ------------------------------------------------------------
+    # Slow statements
+    # ------------------------------------------------------------
+    def statement_done(self, sql, params, elapsed, pool):
+        if elapsed * 1000 < self.slow_ms:
+            return
+        entry = {
+            "sql": normalize_sql(sql),
+            "params": redact_params(params),
+            "ms": round(elapsed * 1000, 1),
+            "endpoint": request.endpoint if has_request_context() else None,
+            "at": time.time(),
+        }
+        with self._lock:
+            self._slow.append(entry)
+            self._slow_total += 1
+        log.warning("slow query (%.1f ms) %s params=%s", entry["ms"], entry["sql"], entry["params"])
+
+        if self.explain and pool is not None and sql.lstrip().upper().startswith("SELECT"):
+            self._queue_explain(entry, sql, params, pool)
+
+    def _queue_explain(self, entry, sql, params, pool):
+        with self._lock:
+            if self._explain_thread is None:
+                self._explain_thread = threading.Thread(target=self._explain_worker, name="explain", daemon=True)
+                self._explain_thread.start()
+        try:
+            self._explain_queue.put_nowait((entry, sql, params, pool))
+        except queue.Full:
+            pass  # never let EXPLAIN captures pile up behind a slow database
+
+    def _explain_worker(self):
+        while True:
+            entry, sql, params, pool = self._explain_queue.get()
+            try:
+                conn = pool.acquire()
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+                    row = cursor.fetchone()
+                    cursor.close()
+                finally:
+                    conn.close()
+                plan = row[0] if not isinstance(row, dict) else next(iter(row.values()))
+                entry["explain"] = json.loads(plan)
+                log.warning("EXPLAIN for %s: %s", entry["sql"], plan)
+            except Exception as err:
+                entry["explain_error"] = str(err)
+
+    def slow_queries(self):
+        with self._lock:
+            return {"threshold_ms": self.slow_ms, "total": self._slow_total, "recent": list(self._slow)}
+
+    # ------------------------------------------------------------
+    # Prometheus exposition
+    # ------------------------------------------------------------
+    def render(self, gauges=()):
+        """
+        Metrics in the Prometheus text format.
+
+        gauges -- extra (name, help, {label_dict_tuple: value}) families, e.g. pool stats
+        """
+        lines = []
+        with self._lock:
+            endpoints = {name: dict(agg) for name, agg in self._endpoints.items()}
+            statuses = dict(self._statuses)
+            slow_total = self._slow_total
+
+        lines += ["# HELP http_requests_total Requests by endpoint, method and status.",
+                  "# TYPE http_requests_total counter"]
+        for (endpoint, method, status), count in sorted(statuses.items()):
+            lines.append(f'http_requests_total{{endpoint="{_label(endpoint)}",method="{method}",status="{status}"}} {count}')
+
+        lines += ["# HELP http_request_duration_seconds Request latency.",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for endpoint, agg in sorted(endpoints.items()):
+            lines += agg["latency"].lines("http_request_duration_seconds", f'endpoint="{_label(endpoint)}"')
+
+        lines += ["# HELP sql_statements_per_request SQL statements executed per request.",
+                  "# TYPE sql_statements_per_request histogram"]
+        for endpoint, agg in sorted(endpoints.items()):
+            lines += agg["statements_per_request"].lines("sql_statements_per_request", f'endpoint="{_label(endpoint)}"')
+
+        counters = (
+            ("sql_statements_total", "SQL statements executed.", "statements", "{}"),
+            ("db_time_seconds_total", "Time spent executing statements and fetching rows.", "db_time", "{:.6f}"),
+            ("db_rows_fetched_total", "Rows fetched from the database.", "rows", "{}"),
+            ("json_serialize_seconds_total", "Time spent serializing JSON responses.", "serialize_time", "{:.6f}"),
+            ("http_response_bytes_total", "Response body bytes (streamed bodies not included).", "bytes", "{}"),
+        )
+        for name, help_text, field, fmt in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for endpoint, agg in sorted(endpoints.items()):
+                lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {fmt.format(agg[field])}')
+
+        lines += ["# HELP sql_slow_statements_total Statements slower than the slow-query threshold.",
+                  "# TYPE sql_slow_statements_total counter",
+                  f"sql_slow_statements_total {slow_total}"]
+
+        for name, help_text, samples in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in samples.items():
+                label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        return "\n".join(lines) + "\n"
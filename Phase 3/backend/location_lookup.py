@@ -0,0 +1,173 @@
+"""
+Location lookup by display name, through an indexed key and an in-process cache.
+
+The name-addressed endpoints (/api/locationRatings, /api/reviews,
+/api/addReview) get a location as "<name> at <university name>". A room can
+arrive under its stored name ("Room 10", "BEH - Room 1000") or the short form
+the frontend builds ("BEH 1000"), which used to be matched with
+REPLACE(L.name, ' - Room ', ' ') and scanned every location.
+
+location.name_key is a stored generated column holding exactly that
+REPLACE(), indexed together with university_id, so every spelling is found
+with one probe of idx_location_uni_name_key. name_key() below is the same
+normalization in Python.
+
+A name addresses the location called exactly that; only when there is no
+exact match does the name_key match count, and only if it is the sole one.
+Anything else is ambiguous (AmbiguousLocation, answered with 409 and the
+candidate LIDs): two rooms "Hall - Room 1" and "Hall 1 " are never merged.
+
+Lookups are kept in an LRU (LOCATION_CACHE_MAX_ENTRIES entries, expiring
+after LOCATION_CACHE_TTL seconds), so repeated lookups of the same location
+skip the query altogether. Misses are not cached, so new locations show up
+immediately. deleteUniversity drops the university's entries with forget();
+locations deleted or renamed outside the app (the DeleteLocation /
+RenameLocation procedures, the loader scripts) are looked up again once their
+entries expire, and /api/locationRatings re-resolves at once when a cached
+LID no longer exists. New code should address locations by LID
+(/api/locations/<lid>/ratings).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def name_key(name):
+    """Same as the location.name_key column: REPLACE(name, ' - Room ', ' ')."""
+    return (name or "").replace(" - Room ", " ")
+
+
+class AmbiguousLocation(Exception):
+    """A location name that matches several locations and none of them exactly."""
+
+    def __init__(self, name, lids):
+        super().__init__(f"Location name '{name}' matches several locations; send its LID")
+        self.lids = lids
+
+
+def choose(name, candidates):
+    """
+    The LID addressed by `name` among its name_key matches, given as (LID,
+    exact name match) pairs: the single exact match, else the single match;
+    None if there are none. Raises AmbiguousLocation otherwise.
+    """
+    exact = [lid for lid, is_exact in candidates if is_exact]
+    lids = exact or [lid for lid, _ in candidates]
+    if len(lids) > 1:
+        raise AmbiguousLocation(name, lids)
+    return lids[0] if lids else None
+
+
+def lookup_sql(n_names, n_keys):
+    """
+    (LID, exact_name) of the locations of a university (by name) whose
+    name_key is one of n_keys keys; exact_name is 1 where the name is one of
+    the n_names names. Params: *names, university, *keys.
+    """
+    return f"""
+SELECT L.LID, L.name IN ({', '.join(['%s'] * n_names)}) AS exact_name
+FROM university U
+JOIN location L ON L.university_id = U.university_id
+WHERE U.name = %s AND L.name_key IN ({', '.join(['%s'] * n_keys)})
+ORDER BY L.LID
+"""
+
+
+class LocationResolver:
+    """(university name, location names) -> LID, with an LRU in front of the query."""
+
+    def __init__(self, ttl=300, max_entries=4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (LIDs, expires_at)
+        self._counters = {"hits": 0, "misses": 0, "queries": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttl=float(os.environ.get("LOCATION_CACHE_TTL", 300)),
+            max_entries=int(os.environ.get("LOCATION_CACHE_MAX_ENTRIES", 4096)),
+        )
+
+    @staticmethod
+    def _key(university, names):
+        # The columns compare case-insensitively, so the cache does too. The
+        # names themselves (not just their keys) decide which match is exact
+        keys = sorted({n.casefold() for n in names if n})
+        return (university or "").casefold(), tuple(keys)
+
+    def query(self, university, names):
+        """(sql, params) matching these names, or None if there is nothing to look up."""
+        names = list(dict.fromkeys(n for n in names if n))
+        keys = list(dict.fromkeys(name_key(n) for n in names))
+        if not university or not keys:
+            return None
+        return lookup_sql(len(names), len(keys)), [*names, university, *keys]
+
+    def get(self, university, names):
+        """Cached (LID, exact) matches, or None on a miss."""
+        key = self._key(university, names)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return item[0]
+            if item is not None:
+                del self._entries[key]
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, university, names, matches):
+        if not matches:
+            return
+        key = self._key(university, names)
+        with self._lock:
+            self._entries[key] = (list(matches), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    @staticmethod
+    def matches(rows):
+        """(LID, exact) pairs of lookup_sql() rows."""
+        return [(row["LID"], bool(row["exact_name"])) for row in rows]
+
+    def resolve(self, cursor, university, *names, refresh=False):
+        """
+        LID of the university's location the names address (see choose()), or
+        None if there is none; raises AmbiguousLocation. cursor must be a
+        dictionary cursor. refresh=True skips the cache (e.g. when a cached
+        LID turned out to be deleted).
+        """
+        name = next((n for n in names if n), "")
+        if not refresh:
+            matches = self.get(university, names)
+            if matches is not None:
+                return choose(name, matches)
+        query = self.query(university, names)
+        if query is None:
+            return None
+        cursor.execute(*query)
+        matches = self.matches(cursor.fetchall())
+        with self._lock:
+            self._counters["queries"] += 1
+        self.put(university, names, matches)
+        return choose(name, matches)
+
+    def forget(self, university=None):
+        """Drop the cached lookups of one university (all of them if None)."""
+        with self._lock:
+            if university is None:
+                self._entries.clear()
+                return
+            prefix = university.casefold()
+            for key in [k for k in self._entries if k[0] == prefix]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
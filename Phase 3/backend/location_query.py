@@ -0,0 +1,216 @@
+"""
+Query builder for /api/locationSearch.
+
+The old query always joined every location table plus the university, and
+joined ratings / rating_equipment / rating_accessibility row-multiplicatively
+when rating filters were set, so it needed SELECT DISTINCT to undo the fan-out
+(and the tag LEFT JOINs never actually filtered anything).
+
+Here the SQL only contains what the active filters and the result columns need:
+  * the location type and building name are columns of location (kept in
+    sync with the subtype tables, see location_types.py), so rooms is the only
+    join, 1:1 on its primary key, for the room columns: an inner join when a
+    room filter is set, none at all when the type filter excludes rooms
+  * the university is a semi-join on its unique (name, state) key
+  * rating and tag filters are EXISTS subqueries, so every location appears at
+    most once and DISTINCT is gone
+  * "has any rating" (all ranges left at their full span) is a primary-key
+    lookup in location_rating_summary instead of a scan of ratings
+
+The SQL text only depends on the *shape* of the filters (which ones are set and
+how many values each list has), uses named placeholders, and is cached per shape.
+"""
+from functools import lru_cache
+
+# rating column -> full range; a filter spanning the whole range doesn't narrow anything
+RATING_RANGES = {
+    "score": (1, 10),
+    "noise": (1, 5),
+    "cleanliness": (1, 5),
+    "equipment_quality": (1, 3),
+    "wifi_strength": (1, 3),
+}
+
+LOCATION_TYPES = ("room", "building", "nonbuilding")
+
+# `types` filter value -> location.location_type
+TYPE_VALUES = {"room": "Room", "building": "Building", "nonbuilding": "Non-building"}
+
+
+def _bucket(n):
+    """Round IN-list lengths up to a power of two (min 8) so plans are shared."""
+    size = 8
+    while size < n:
+        size *= 2
+    return size
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def parse_filters(args, lids=None):
+    """
+    Normalize the request args of /api/locationSearch into a filters dict.
+
+    lids -- LIDs pre-selected by the name index (None when there is no name query)
+    """
+    filters = {
+        "university": args.get("university", ""),
+        "state": args.get("state", ""),
+        "lids": list(lids) if lids is not None else None,
+        "types": sorted({t.lower() for t in _split(args.get("types", ""))} & set(LOCATION_TYPES)),
+        "room_sizes": _split(args.get("roomSizes", "")),
+        "room_types": _split(args.get("roomTypes", "")),
+        "room_number": args.get("roomNumber", ""),
+        "campus": args.get("campus", ""),
+        "building": args.get("building", ""),
+        "rating_ranges": {},
+        "rated_only": False,
+        "equipment_tags": [],
+        "accessibility_tags": [],
+    }
+
+    if args.get("searchByRating", ""):
+        any_range = False
+        for field, (low, high) in RATING_RANGES.items():
+            min_val = args.get(f"{field}Min", type=int)
+            max_val = args.get(f"{field}Max", type=int)
+            if min_val is None or max_val is None:
+                continue
+            any_range = True
+            if min_val > low or max_val < high:
+                filters["rating_ranges"][field] = (min_val, max_val)
+        filters["equipment_tags"] = args.getlist("equipmentTags")
+        filters["accessibility_tags"] = args.getlist("accessibilityTags")
+        # Full-span ranges still mean "has at least one rating"
+        filters["rated_only"] = any_range
+
+    return filters
+
+
+def plan_shape(filters):
+    """Everything the SQL text depends on (and nothing it doesn't)."""
+    lids = filters["lids"]
+    return (
+        bool(filters["state"]),
+        _bucket(len(lids)) if lids is not None else None,
+        tuple(filters["types"]),
+        len(filters["room_sizes"]),
+        len(filters["room_types"]),
+        bool(filters["room_number"]),
+        bool(filters["campus"]),
+        bool(filters["building"]),
+        tuple(sorted(filters["rating_ranges"])),
+        filters["rated_only"],
+        len(filters["equipment_tags"]),
+        len(filters["accessibility_tags"]),
+    )
+
+
+def _in_list(prefix, n):
+    return ", ".join(f"%({prefix}_{i})s" for i in range(n))
+
+
+@lru_cache(maxsize=256)
+def plan_sql(shape):
+    """Build the SQL for one filter shape (cached)."""
+    (has_state, lid_count, types, n_sizes, n_room_types, has_room_number,
+     has_campus, has_building, range_fields, rated_only, n_equipment, n_accessibility) = shape
+
+    if n_sizes or n_room_types or has_room_number:
+        # Only rooms can match, so the inner join can't lose any rows
+        room_join = "\nJOIN rooms R ON R.LID = L.LID"
+    elif types and "room" not in types:
+        room_join = ""
+    else:
+        room_join = "\nLEFT JOIN rooms R ON R.LID = L.LID"
+
+    columns = ["L.LID", "L.name AS location_name", "L.location_type"]
+    columns += [f"R.{c}" if room_join else f"NULL AS {c}" for c in ("room_number", "room_type", "room_size")]
+    columns += ["L.building_name", "L.campus_name"]
+    sql = "SELECT\n    " + ",\n    ".join(columns) + "\nFROM location L" + room_join
+
+    university = "SELECT U.university_id FROM university U WHERE U.name = %(university)s"
+    if has_state:
+        university += " AND U.state = %(state)s"
+    conditions = [f"L.university_id IN ({university})"]
+
+    if lid_count is not None:
+        conditions.append(f"L.LID IN ({_in_list('lid', lid_count)})")
+    if types:
+        # Range scan on idx_location_uni_type_name
+        conditions.append("L.location_type IN (" + ", ".join(f"'{TYPE_VALUES[t]}'" for t in types) + ")")
+    if n_sizes:
+        conditions.append(f"R.room_size IN ({_in_list('size', n_sizes)})")
+    if n_room_types:
+        conditions.append(f"R.room_type IN ({_in_list('room_type', n_room_types)})")
+    if has_room_number:
+        conditions.append("R.room_number = %(room_number)s")
+    if has_campus:
+        conditions.append("L.campus_name LIKE %(campus)s")
+    if has_building:
+        conditions.append("L.building_name LIKE %(building)s")
+
+    # One rating has to satisfy every range and carry one of the selected tags of each kind
+    rating_conditions = [f"R2.{field} BETWEEN %({field}_min)s AND %({field}_max)s" for field in range_fields]
+    if n_equipment:
+        rating_conditions.append(
+            "EXISTS (SELECT 1 FROM rating_equipment RE WHERE RE.RID = R2.RID"
+            f" AND RE.equipment_tag IN ({_in_list('equipment', n_equipment)}))"
+        )
+    if n_accessibility:
+        rating_conditions.append(
+            "EXISTS (SELECT 1 FROM rating_accessibility RA WHERE RA.RID = R2.RID"
+            f" AND RA.accessibility_tag IN ({_in_list('accessibility', n_accessibility)}))"
+        )
+    if rating_conditions:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM ratings R2 WHERE R2.LID = L.LID AND "
+            + " AND ".join(rating_conditions) + ")"
+        )
+    elif rated_only:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM location_rating_summary S WHERE S.LID = L.LID AND S.review_count > 0)"
+        )
+
+    return sql + "\nWHERE " + "\n  AND ".join(conditions)
+
+
+def plan_params(filters):
+    """Named parameters for the plan of these filters."""
+    params = {"university": filters["university"]}
+    if filters["state"]:
+        params["state"] = filters["state"]
+
+    lids = filters["lids"]
+    if lids is not None:
+        # Pad up to the bucket size by repeating the last LID (harmless inside IN)
+        padded = lids + [lids[-1]] * (_bucket(len(lids)) - len(lids)) if lids else [None] * _bucket(0)
+        params.update({f"lid_{i}": lid for i, lid in enumerate(padded)})
+
+    for prefix, values in (("size", filters["room_sizes"]), ("room_type", filters["room_types"]),
+                           ("equipment", filters["equipment_tags"]),
+                           ("accessibility", filters["accessibility_tags"])):
+        params.update({f"{prefix}_{i}": v for i, v in enumerate(values)})
+
+    if filters["room_number"]:
+        params["room_number"] = filters["room_number"]
+    if filters["campus"]:
+        params["campus"] = f"%{filters['campus']}%"
+    if filters["building"]:
+        params["building"] = f"%{filters['building']}%"
+    for field, (min_val, max_val) in filters["rating_ranges"].items():
+        params[f"{field}_min"] = min_val
+        params[f"{field}_max"] = max_val
+    return params
+
+
+def build_location_search(filters):
+    """Return (sql, params) for the given filters."""
+    return plan_sql(plan_shape(filters)), plan_params(filters)
+
+
+def plan_cache_info():
+    info = plan_sql.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "plans": info.currsize, "max_plans": info.maxsize}
@@ -0,0 +1,103 @@
+"""
+Consistency check for the denormalized location type columns.
+
+location.location_type, building_LID and building_name store what every
+listing used to work out per row from buildings / nonbuildings / rooms (a CASE
+over three LEFT JOINs, plus a second join to location for the building name).
+Triggers on the subtype tables keep them in sync (SyncLocationType in
+Procedures.sql), but two things can still make them drift: renaming a
+building with a plain UPDATE instead of RenameLocation (a trigger on location
+can't update its rooms' rows) and rows written with the triggers dropped or
+skipped (@skip_location_type_sync) that don't carry the right values. So:
+
+    python location_types.py check     # count / list rows that disagree with the subtype tables
+    python location_types.py rebuild   # recompute every row (RebuildLocationTypes)
+"""
+import os
+import sys
+
+# What the columns should hold, derived from the subtype tables the old way
+MISMATCH_SQL = """
+SELECT
+    L.LID,
+    L.name,
+    L.location_type,
+    L.building_LID,
+    L.building_name,
+    CASE
+        WHEN B.LID IS NOT NULL THEN 'Building'
+        WHEN NB.LID IS NOT NULL THEN 'Non-building'
+        ELSE 'Room'
+    END AS expected_type,
+    IF(B.LID IS NULL AND NB.LID IS NULL, R.building_LID, NULL) AS expected_building_LID,
+    IF(B.LID IS NULL AND NB.LID IS NULL, BL.name, NULL) AS expected_building_name
+FROM location L
+LEFT JOIN buildings B ON B.LID = L.LID
+LEFT JOIN nonbuildings NB ON NB.LID = L.LID
+LEFT JOIN rooms R ON R.LID = L.LID
+LEFT JOIN location BL ON BL.LID = R.building_LID
+HAVING NOT (location_type <=> expected_type
+            AND building_LID <=> expected_building_LID
+            AND building_name <=> expected_building_name)
+"""
+
+
+def check(conn, sample=20):
+    """Return (number of inconsistent locations, the first `sample` of them as dicts)."""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(MISMATCH_SQL)
+        count = 0
+        rows = []
+        for row in cursor:
+            count += 1
+            if len(rows) < sample:
+                rows.append(row)
+        return count, rows
+    finally:
+        cursor.close()
+
+
+def rebuild(conn):
+    """Recompute the columns of every location; returns the number of rows that changed."""
+    cursor = conn.cursor()
+    try:
+        cursor.callproc("RebuildLocationTypes")
+        changed = 0
+        for result in cursor.stored_results():
+            changed = result.fetchone()[0]
+        conn.commit()
+        return changed
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] not in (["check"], ["rebuild"]):
+        sys.exit("usage: python location_types.py check|rebuild")
+
+    import mysql.connector
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    conn = mysql.connector.connect(
+        host="localhost",
+        user=os.environ.get("DB_USER"),
+        password=os.environ.get("DB_PASSWORD"),
+        database="campus_insider"
+    )
+    try:
+        if sys.argv[1] == "rebuild":
+            print(f"Rebuilt location types; {rebuild(conn)} locations changed")
+        else:
+            count, rows = check(conn)
+            for row in rows:
+                print(f"  LID {row['LID']} {row['name']!r}: "
+                      f"{row['location_type']} / {row['building_LID']} / {row['building_name']!r}, expected "
+                      f"{row['expected_type']} / {row['expected_building_LID']} / {row['expected_building_name']!r}")
+            if count:
+                sys.exit(f"{count} locations disagree with the subtype tables; "
+                         f"run `python location_types.py rebuild`")
+            print("Location types are consistent")
+    finally:
+        conn.close()
@@ -0,0 +1,38 @@
+"""
+Helpers for keyset (cursor) pagination.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and then
+base64url-encoded so the client can treat it as an opaque string.
+"""
+import base64
+import json
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor string cannot be decoded."""
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor back into a list of `size` sort-key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as err:
+        raise InvalidCursor(f"Malformed cursor: {err}") from err
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+def clamp_limit(limit, default=50, maximum=MAX_PAGE_SIZE):
+    """Return a page size between 1 and `maximum`."""
+    if limit is None:
+        return default
+    return max(1, min(limit, maximum))
@@ -0,0 +1,222 @@
+"""
+bcrypt hashing on a bounded process pool.
+
+Hashing a password is deliberately slow, pure CPU work. Done inline it holds
+a request thread (and its DB connection) for the whole time, so a burst of
+logins starves every other endpoint. Here it runs in a small process pool:
+
+  * at most `max_pending` hashes can be queued or running; beyond that
+    check() / hash() raise HasherBusy straight away (the API answers 429).
+    A hash keeps its slot until the pool has finished it, also when its
+    caller gave up after HASH_TIMEOUT, and calibration takes a slot too
+  * the bcrypt cost is picked from a target latency: the pool times one
+    hash at the minimum cost (BCRYPT_MIN_ROUNDS, default 12) and adds a
+    round (doubling the work) for as long as the result stays within
+    BCRYPT_TARGET_MS
+  * verify() also hands back a fresh hash when the stored one uses a lower
+    cost than the current one, so logins upgrade old hashes transparently
+
+Settings (.env): BCRYPT_TARGET_MS, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS,
+BCRYPT_ROUNDS (fixed cost, skips calibration), HASH_WORKERS,
+HASH_MAX_PENDING and HASH_TIMEOUT.
+
+Hashes are standard $2b$ bcrypt strings, interchangeable with Flask-Bcrypt's.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import bcrypt
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+# ------------------------------------------------------------
+# Worker functions (run in the pool processes)
+# ------------------------------------------------------------
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(stored_hash, password):
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+def _time_hash(rounds):
+    start = time.perf_counter()
+    _hash("calibration", rounds)
+    return time.perf_counter() - start
+
+
+def hash_rounds(stored_hash):
+    """Cost factor of a $2b$<rounds>$... hash (None if it isn't one)."""
+    parts = stored_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """
+    workers      -- pool processes
+    max_pending  -- hashes queued or running before HasherBusy
+    target_ms    -- hash latency the cost factor is calibrated to
+    rounds       -- fixed cost factor; None calibrates on first use
+    timeout      -- seconds a caller waits for its hash
+    """
+
+    def __init__(self, workers=2, max_pending=16, target_ms=250, min_rounds=12, max_rounds=16,
+                 rounds=None, timeout=30.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.target_ms = target_ms
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.timeout = timeout
+        self._rounds = rounds
+
+        self._lock = threading.Lock()
+        self._calibrate_lock = threading.Lock()  # first users wait for one calibration
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None  # started on first use, not at import (reloader, scripts)
+        self._in_flight = 0
+        self._counters = {"hashes": 0, "checks": 0, "rejected": 0, "rehashed": 0, "busy_time": 0.0}
+
+    @classmethod
+    def from_env(cls):
+        rounds = os.environ.get("BCRYPT_ROUNDS")
+        workers = int(os.environ.get("HASH_WORKERS", max(1, min(4, (os.cpu_count() or 2) // 2))))
+        return cls(
+            workers=workers,
+            max_pending=int(os.environ.get("HASH_MAX_PENDING", workers * 8)),
+            target_ms=float(os.environ.get("BCRYPT_TARGET_MS", 250)),
+            min_rounds=int(os.environ.get("BCRYPT_MIN_ROUNDS", 12)),
+            max_rounds=int(os.environ.get("BCRYPT_MAX_ROUNDS", 16)),
+            rounds=int(rounds) if rounds else None,
+            timeout=float(os.environ.get("HASH_TIMEOUT", 30)),
+        )
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, fn, *args):
+        """Start fn on the pool in a slot, which is only released when the pool is done with it."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise HasherBusy("Too many password operations in progress")
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+
+        def done(_):
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                self._counters["busy_time"] += time.perf_counter() - start
+
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def _run(self, fn, *args):
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The work still occupies the pool, so its slot stays taken until it finishes
+            raise HasherBusy("Password operation timed out")
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    @property
+    def rounds(self):
+        """Current cost factor (calibrates on first access unless fixed)."""
+        if self._rounds is None:
+            with self._calibrate_lock:
+                if self._rounds is None:
+                    self.calibrate()
+        return self._rounds
+
+    def calibrate(self):
+        """Pick the highest cost whose hash time stays within target_ms on the pool."""
+        seconds = self._run(_time_hash, self.min_rounds)
+        extra = math.floor(math.log2(max(self.target_ms / 1000 / seconds, 1)))
+        self._rounds = max(self.min_rounds, min(self.max_rounds, self.min_rounds + extra))
+        return self._rounds
+
+    def hash(self, password):
+        """bcrypt hash at the current cost; raises HasherBusy when the queue is full."""
+        self._count("hashes")
+        return self._run(_hash, password, self.rounds)
+
+    def check(self, stored_hash, password):
+        """True if password matches stored_hash; raises HasherBusy when the queue is full."""
+        self._count("checks")
+        return self._run(_check, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """True if stored_hash was made with a lower cost than the current one."""
+        rounds = hash_rounds(stored_hash)
+        return rounds is not None and rounds < self.rounds
+
+    def verify(self, stored_hash, password):
+        """
+        Check a login; returns (ok, new_hash).
+
+        new_hash is a fresh hash at the current cost when the password matched
+        but stored_hash is outdated (None otherwise, or if the pool is too busy
+        to upgrade it right now). HasherBusy is only raised for the check itself.
+        """
+        if not self.check(stored_hash, password):
+            return False, None
+        try:
+            # needs_rehash() may have to calibrate first, which takes a slot too
+            if not self.needs_rehash(stored_hash):
+                return True, None
+            new_hash = self.hash(password)
+        except HasherBusy:
+            return True, None
+        self._count("rehashed")
+        return True, new_hash
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update({
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "rounds": self._rounds,
+            "target_ms": self.target_ms,
+        })
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,131 @@
+"""
+Per-location rating aggregates from the location_rating_summary table.
+
+The table holds counts, sums, min/max, per-value histograms and tag counts for
+every rated location and is updated in the same transaction as each rating
+write (ApplyRatingToSummary in Procedures.sql), so reading a location's
+aggregates is one primary-key lookup instead of a scan of its ratings. Deletes
+that cascade into ratings (users, universities) call remove_ratings first.
+
+Rebuild from scratch (e.g. after loading ratings by hand):
+    python rating_summary.py rebuild
+"""
+import json
+import os
+import sys
+
+# rating column -> number of possible values (histogram length)
+SCORE_FIELDS = {
+    "score": 10,
+    "noise": 5,
+    "cleanliness": 5,
+    "equipment_quality": 3,
+    "wifi_strength": 3,
+}
+
+# Just enough for list views; the histograms and tag counts stay out of them
+SUMMARY_COLUMNS = "S.review_count, S.score_avg, S.score_min, S.score_max"
+
+CHUNK_SIZE = 500
+
+
+def _json(value):
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def brief_summary(row):
+    """Count / average / min / max from a row that selected SUMMARY_COLUMNS (None if never rated)."""
+    if not row.get("review_count"):
+        return None
+    return {
+        "count": row["review_count"],
+        "average_score": float(row["score_avg"]),
+        "min_score": row["score_min"],
+        "max_score": row["score_max"],
+    }
+
+
+def full_summary(row):
+    """Everything in a location_rating_summary row, with averages worked out from the histograms."""
+    if not row or not row["review_count"]:
+        return None
+    averages = {}
+    histograms = {}
+    for field, size in SCORE_FIELDS.items():
+        hist = _json(row[f"{field}_hist"]) or [0] * size
+        rated = sum(hist)  # sub-scores are nullable, so each has its own count
+        histograms[field] = {str(value): hist[value - 1] for value in range(1, size + 1)}
+        averages[field] = round(row[f"{field}_sum"] / rated, 2) if rated else None
+    return {
+        "count": row["review_count"],
+        "average": averages,
+        "min_score": row["score_min"],
+        "max_score": row["score_max"],
+        "histograms": histograms,
+        "equipment_tags": {t: n for t, n in (_json(row["equipment_tag_counts"]) or {}).items() if n > 0},
+        "accessibility_tags": {t: n for t, n in (_json(row["accessibility_tag_counts"]) or {}).items() if n > 0},
+    }
+
+
+def load_summaries(cursor, lids, chunk_size=CHUNK_SIZE):
+    """Return {LID: full summary} for the given locations (unrated locations are left out)."""
+    lids = list(dict.fromkeys(lids))
+    summaries = {}
+    for i in range(0, len(lids), chunk_size):
+        chunk = lids[i:i + chunk_size]
+        cursor.execute(
+            f"SELECT * FROM location_rating_summary WHERE LID IN ({', '.join(['%s'] * len(chunk))})",
+            chunk
+        )
+        for row in cursor.fetchall():
+            summary = full_summary(row)
+            if summary:
+                summaries[row["LID"]] = summary
+    return summaries
+
+
+def apply_rating(cursor, rid, sign=1):
+    """Add (sign=1) or remove (sign=-1) a rating and its tags; runs in the caller's transaction."""
+    cursor.callproc("ApplyRatingToSummary", [rid, sign])
+
+
+def remove_ratings(cursor, uid=None, university_id=None):
+    """Take out the ratings a user's (or a university's users') delete will cascade away."""
+    cursor.callproc("RemoveRatingsFromSummary", [uid, university_id])
+
+
+def rebuild(conn):
+    """Recompute every summary from the ratings table; returns the number of rated locations."""
+    cursor = conn.cursor()
+    try:
+        cursor.callproc("RebuildLocationRatingSummary")
+        count = 0
+        for result in cursor.stored_results():
+            count = result.fetchone()[0]
+        return count
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python rating_summary.py rebuild")
+
+    import mysql.connector
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    conn = mysql.connector.connect(
+        host="localhost",
+        user=os.environ.get("DB_USER"),
+        password=os.environ.get("DB_PASSWORD"),
+        database="campus_insider"
+    )
+    try:
+        print(f"Rebuilt rating summaries for {rebuild(conn)} locations")
+    finally:
+        conn.close()
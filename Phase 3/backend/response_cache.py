@@ -0,0 +1,292 @@
+"""
+Response cache for read-heavy GET endpoints.
+
+Responses are keyed on the route plus its query args as the view reads them and tagged
+with the data they depend on (e.g. "university:<name>", "location:<LID>").
+Tags that depend on what the view loaded (e.g. the LID a name resolved to) are
+added by the view with tag(), before the response is serialized.
+Write endpoints call invalidate() with the tags they touched, so cached pages
+are dropped as soon as the data behind them changes instead of waiting for
+the TTL.
+
+Two interchangeable backends are provided: an in-process LRU with a TTL and
+a memory cap, and one for any Redis-compatible client.
+
+With a Compressor (compression.py) every stored entry also keeps its gzip /
+brotli bodies ("encodings"), so cache hits are sent compressed without
+compressing them again.
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import current_app, g, request
+
+from streaming import wants_stream
+
+
+def make_key(path, args):
+    """
+    Route plus the query args exactly as the view reads them: values are not
+    stripped or reordered (views see " Foo" and "Foo" differently), only the
+    arg names are sorted.
+    """
+    return f"{path}?{urlencode([(name, value) for name in sorted(args.keys()) for value in args.getlist(name)])}"
+
+
+class InMemoryBackend:
+    """LRU dict with per-entry TTL, an entry cap and a byte cap."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (entry, expires_at, size, tags)
+        self._tags = {}                # tag -> set of keys
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def set(self, key, entry, ttl, tags=()):
+        size = len(entry["body"]) + sum(len(body) for body in entry.get("encodings", {}).values())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (entry, time.monotonic() + ttl, size, tuple(tags))
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, _, size, tags = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class RedisBackend:
+    """
+    Backend for any Redis-compatible client (redis-py, valkey, fakeredis, ...).
+
+    Each entry is a hash with a TTL; each tag is a set of entry keys that
+    expires `tag_ttl` seconds after its last write, the longest entry TTL seen
+    (so a tag outlives its entries without piling up once nothing writes to
+    it). Eviction and the memory cap are left to the server's maxmemory policy.
+    """
+
+    def __init__(self, client, prefix="ci:cache:", tag_ttl=60):
+        self.client = client
+        self.prefix = prefix
+        self.tag_ttl = tag_ttl
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis  # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        data = self.client.hgetall(self.prefix + key)
+        if not data:
+            return None
+        encodings = {field[4:].decode("ascii"): value for field, value in data.items() if field.startswith(b"enc:")}
+        return {"body": data[b"body"], "mimetype": data[b"mimetype"].decode("utf-8"), "encodings": encodings}
+
+    def set(self, key, entry, ttl, tags=()):
+        full_key = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.hset(full_key, mapping={
+            "body": entry["body"], "mimetype": entry["mimetype"],
+            **{f"enc:{encoding}": body for encoding, body in entry.get("encodings", {}).items()},
+        })
+        pipe.expire(full_key, int(ttl))
+        self.tag_ttl = max(self.tag_ttl, int(ttl))
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            pipe.sadd(tag_key, full_key)
+            pipe.expire(tag_key, self.tag_ttl)
+        pipe.execute()
+
+    def invalidate(self, tags):
+        removed = 0
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            keys = self.client.smembers(tag_key)
+            if keys:
+                removed += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        return removed
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {"backend": "redis", "prefix": self.prefix}
+
+
+class ResponseCache:
+    """Decorator-based cache for Flask GET views, with hit/miss counters."""
+
+    def __init__(self, backend, default_ttl=60, enabled=True, compressor=None):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self.compressor = compressor
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    @classmethod
+    def from_env(cls, compressor=None):
+        """RESPONSE_CACHE_BACKEND=memory|redis, plus TTL / size settings from .env."""
+        default_ttl = int(os.environ.get("RESPONSE_CACHE_TTL", 60))
+        if os.environ.get("RESPONSE_CACHE_BACKEND", "memory") == "redis":
+            backend = RedisBackend.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+                                            tag_ttl=default_ttl)
+        else:
+            backend = InMemoryBackend(
+                max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 1024)),
+                max_bytes=int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            )
+        return cls(
+            backend,
+            default_ttl=default_ttl,
+            enabled=os.environ.get("RESPONSE_CACHE_ENABLED", "1").lower() not in ("0", "false", "no"),
+            compressor=compressor,
+        )
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def cached(self, ttl=None, tags=None):
+        """
+        Cache successful GET responses of the wrapped view.
+
+        tags -- list of tags, or a function (args) -> tags computed from the
+                request args; the view adds any others with tag()
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                # Streamed (NDJSON) responses are never cached or served from the cache
+                if not self.enabled or request.method != "GET" or wants_stream():
+                    return view(*args, **kwargs)
+
+                key = make_key(request.path, request.args)
+                entry = self.lookup(key)
+                if entry is not None:
+                    response = current_app.response_class(entry["body"], status=200, mimetype=entry["mimetype"])
+                    if self.compressor is not None:
+                        self.compressor.use_variants(response, entry.get("encodings"))
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                response = current_app.make_response(view(*args, **kwargs))
+                # Coalesced copies were already stored by their leader
+                if (response.status_code == 200 and not response.direct_passthrough and not response.is_streamed
+                        and "X-Coalesced" not in response.headers):
+                    entry_tags = [*(tags(request.args) if callable(tags) else (tags or ())),
+                                  *g.pop("response_cache_tags", ())]
+                    stored = self.store(key, response.get_data(), response.mimetype, ttl, entry_tags)
+                    if self.compressor is not None:
+                        self.compressor.use_variants(response, stored["encodings"])
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def tag(self, *tags):
+        """Add tags to the response the current view is building."""
+        g.setdefault("response_cache_tags", []).extend(tags)
+
+    def lookup(self, key):
+        """Cached entry ({"body", "mimetype"}) for a make_key() key, or None; counts the hit / miss."""
+        entry = self.backend.get(key)
+        self._count("hits" if entry is not None else "misses")
+        return entry
+
+    def store(self, key, body, mimetype, ttl=None, tags=()):
+        """Store a response body (and its compressed forms); returns the stored entry."""
+        entry = {"body": body, "mimetype": mimetype}
+        if self.compressor is not None:
+            entry["encodings"] = self.compressor.variants(body, mimetype)
+        self.backend.set(key, entry, ttl or self.default_ttl, tags)
+        self._count("stores")
+        return entry
+
+    def invalidate(self, *tags):
+        """Drop every cached response tagged with any of the given tags."""
+        removed = self.backend.invalidate(tags)
+        self._count("invalidations", removed)
+        return removed
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats.update(self.backend.stats())
+        return stats
+
+
+def university_tag(name):
+    return f"university:{(name or '').strip().lower()}"
+
+
+def location_tag(lid):
+    return f"location:{lid}"
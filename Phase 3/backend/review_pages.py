@@ -0,0 +1,214 @@
+"""
+Keyset-paginated review listings and a hot cache of their first pages.
+
+/api/reviews and /api/locations/<lid>/reviews page through a location's
+reviews in one of these orders, each a (sort column, RID) keyset backed by
+an index of ratings whose LID prefix makes every page a short range read
+(see Indices.sql):
+
+    -date   newest first (default)     idx_ratings_lid_date  (LID, date, RID)
+    date    oldest first
+    -score  best first                 idx_ratings_lid_score (LID, score, RID)
+    score   worst first
+
+ratings.date is a DATE, so RID breaks the ties between reviews of the same
+day. It is also nullable: reviews without a date come last newest-first and
+first oldest-first, where MySQL sorts NULLs, and their cursor value is null.
+The cursor is the (sort value, RID) of the last review on the page.
+
+/api/locationRatings pages its reviews the same way (page_clause()) when it
+is given a limit or a cursor.
+
+First pages are what the review pane asks for all the time, so they are kept
+in a small LRU per (LID, sort, page size) that add_review() clears for its
+location (REVIEW_PAGE_CACHE_TTL seconds, REVIEW_PAGE_CACHE_MAX_ENTRIES pages).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from pagination import InvalidCursor, clamp_limit, decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# sort -> (column, direction)
+SORTS = {
+    "-date": ("date", "DESC"),
+    "date": ("date", "ASC"),
+    "-score": ("score", "DESC"),
+    "score": ("score", "ASC"),
+}
+DEFAULT_SORT = "-date"
+
+# Sort columns that can be NULL
+NULLABLE = {"date"}
+
+
+def page_args(args):
+    """
+    (sort, after, page_size) from the query args of a review listing;
+    page_size is None when neither limit nor cursor is given. Raises
+    InvalidCursor / ValueError with a message for the client.
+    """
+    limit = args.get("limit", type=int)
+    page_cursor = args.get("cursor")
+    sort = args.get("sort", DEFAULT_SORT)
+
+    if sort not in SORTS:
+        raise ValueError("Invalid sort, expected '-date', 'date', '-score' or 'score'")
+
+    after = None
+    if page_cursor:
+        after = check_cursor(decode_cursor(page_cursor, 2), sort)
+
+    if limit is None and page_cursor is None:
+        return sort, after, None
+    return sort, after, clamp_limit(limit, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+
+def keyset_condition(sort, after, alias="r"):
+    """(condition, params) matching the reviews that come after `after` in `sort` order."""
+    column, direction = SORTS[sort]
+    column, rid = f"{alias}.{column}", f"{alias}.RID"
+    op = "<" if direction == "DESC" else ">"
+    value, last_rid = after
+
+    if value is None:
+        # After a review without a date: the rest of the NULLs, then (oldest first) every dated review
+        condition = f"({column} IS NULL AND {rid} {op} %s)"
+        if direction == "ASC":
+            condition = f"({column} IS NOT NULL OR {condition})"
+        return condition, [last_rid]
+
+    # Spelled out rather than as a row comparison so it stays a range on the index
+    condition = f"{column} {op} %s OR ({column} = %s AND {rid} {op} %s)"
+    if direction == "DESC" and SORTS[sort][0] in NULLABLE:
+        condition += f" OR {column} IS NULL"
+    return f"({condition})", [value, value, last_rid]
+
+
+def page_clause(sort=DEFAULT_SORT, after=None, page_size=None, alias="r"):
+    """
+    (sql, params) to append to a query of reviews already filtered by a WHERE:
+    the keyset condition, the ORDER BY and, with a page size, a LIMIT of one
+    extra row to tell whether there is a next page.
+    """
+    column, direction = SORTS[sort]
+    sql, params = "", []
+    if after is not None:
+        condition, params = keyset_condition(sort, after, alias)
+        sql += f" AND {condition}"
+    sql += f" ORDER BY {alias}.{column} {direction}, {alias}.RID {direction}"
+    if page_size is not None:
+        sql += " LIMIT %s"
+        params.append(page_size + 1)
+    return sql, params
+
+
+def reviews_query(lids, sort=DEFAULT_SORT, after=None, page_size=None):
+    """
+    (sql, params) listing the reviews of the given LIDs in `sort` order.
+
+    after     -- decoded cursor: (sort value, RID) of the last review already sent
+    page_size -- None for every review
+    """
+    sql = f"""
+    SELECT
+        r.RID,
+        u.username,
+        u.role AS role,
+        r.score,
+        r.noise,
+        r.cleanliness,
+        r.equipment_quality,
+        r.wifi_strength,
+        r.extra_comments AS comment,
+        r.date
+    FROM ratings r
+    JOIN users u ON r.UID = u.uid
+    WHERE r.LID IN ({', '.join(['%s'] * len(lids))})
+    """
+    clause, params = page_clause(sort, after, page_size)
+    return sql + clause, list(lids) + params
+
+
+def split_page(rows, sort, page_size):
+    """(rows of the page, next_cursor) from the page_size + 1 rows a page query returns."""
+    if page_size is None or len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, review_cursor(rows[-1], sort)
+
+
+def check_cursor(after, sort):
+    """Reject cursors whose values can't be a (sort value, RID) of this sort."""
+    value, rid = after
+    column = SORTS[sort][0]
+    if column == "date":
+        valid_value = isinstance(value, str) or value is None
+    else:
+        valid_value = isinstance(value, int) and not isinstance(value, bool)
+    if not valid_value or not isinstance(rid, int) or isinstance(rid, bool):
+        raise InvalidCursor("Malformed cursor")
+    return after
+
+
+def review_cursor(last, sort):
+    """next_cursor pointing after the given review row."""
+    return encode_cursor([last[SORTS[sort][0]], last["RID"]])
+
+
+class FirstPageCache:
+    """(LID, sort, page size) -> (reviews, next_cursor) of the first page, in an LRU."""
+
+    def __init__(self, ttl=120, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (LID, sort, page size) -> (page, expires_at)
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttl=float(os.environ.get("REVIEW_PAGE_CACHE_TTL", 120)),
+            max_entries=int(os.environ.get("REVIEW_PAGE_CACHE_MAX_ENTRIES", 512)),
+        )
+
+    def get(self, lid, sort, page_size):
+        key = (lid, sort, page_size)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return item[0]
+            if item is not None:
+                del self._entries[key]
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, lid, sort, page_size, page):
+        key = (lid, sort, page_size)
+        with self._lock:
+            self._entries[key] = (page, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def forget(self, lid=None):
+        """Drop the cached pages of one location (all of them if None)."""
+        with self._lock:
+            if lid is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == lid]:
+                    del self._entries[key]
+            self._counters["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
@@ -0,0 +1,108 @@
+"""
+Write path of /api/addReview: one lookup statement, one transaction, one commit.
+
+A review used to cost a user query, a location query, the rating INSERT, one
+INSERT per tag and the summary update. Now:
+
+    1. SUBMIT_LOOKUP_SQL -- user (uid, role), location (LID) and its university
+                            name in one statement, the location addressed by
+                            LID or by "<name> at <university>" (name_key index;
+                            an exact name match wins, otherwise the key must
+                            match exactly one location)
+    2. INSERT INTO ratings
+    3. one multi-row INSERT per tag table (skipped when there are no tags)
+    4. ApplyRatingToSummary (location_rating_summary, rating_summary.py)
+    5. COMMIT
+
+so the rating, its tags and the aggregates are written together or not at all.
+"""
+from datetime import datetime
+
+from location_lookup import choose, name_key
+from rating_summary import apply_rating
+
+SCORE_COLUMNS = ("score", "noise", "cleanliness", "equipment_quality", "wifi_strength")
+
+INSERT_RATING_SQL = """
+INSERT INTO ratings
+(UID, LID, score, noise, cleanliness, equipment_quality, wifi_strength, extra_comments, date)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def lookup_sql(by_lid, n_names=0):
+    """
+    uid, role, LID, university_name and exact_name for a username and a
+    location, given by LID (params: LID, username) or by location name,
+    university name and n_names name keys (params: name, university,
+    *name keys, username). Addressed by name, every location whose name_key
+    matches is a row, exact name matches first. LID is NULL when the location
+    doesn't exist; there is no row at all when the user doesn't.
+    """
+    if by_lid:
+        exact, location, limit = "1", "L.LID = %s", "LIMIT 1"
+    else:
+        exact = "L.name = %s"
+        location = (f"L.university_id IN (SELECT university_id FROM university WHERE name = %s) "
+                    f"AND L.name_key IN ({', '.join(['%s'] * n_names)})")
+        limit = ""
+    return f"""
+SELECT u.uid, u.role, L.LID, U.name AS university_name, {exact} AS exact_name
+FROM users u
+LEFT JOIN location L ON {location}
+LEFT JOIN university U ON U.university_id = L.university_id
+WHERE u.username = %s
+ORDER BY exact_name DESC, L.LID
+{limit}
+"""
+
+
+def lookup(cursor, username, lid=None, university=None, location=None):
+    """
+    The row of lookup_sql() (a dict; cursor must be a dictionary cursor) or
+    None if there is no such user. A name resolves as location_lookup.choose()
+    does (exact match first); anything else raises AmbiguousLocation.
+    """
+    if lid is not None:
+        cursor.execute(lookup_sql(True), (lid, username))
+        rows = cursor.fetchall()
+        return rows[0] if rows else None
+
+    cursor.execute(lookup_sql(False, 1), (location, university, name_key(location), username))
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    lid = choose(location, [(row["LID"], bool(row["exact_name"])) for row in rows if row["LID"] is not None])
+    return next((row for row in rows if row["LID"] == lid), rows[0])
+
+
+def insert_tags(cursor, table, column, rid, tags):
+    """All of a rating's tags of one kind in a single INSERT (duplicates dropped)."""
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return
+    cursor.execute(
+        f"INSERT INTO {table} (RID, {column}) VALUES {', '.join(['(%s, %s)'] * len(tags))}",
+        [value for tag in tags for value in (rid, tag)]
+    )
+
+
+def insert_review(cursor, uid, lid, data, equipment_tags=(), accessibility_tags=(), when=None):
+    """
+    Insert a rating, its tags and its share of the location's summary in the
+    caller's transaction; returns the RID. The caller commits (or rolls back).
+    """
+    cursor.execute(INSERT_RATING_SQL, (
+        uid, lid,
+        *(data[column] for column in SCORE_COLUMNS),
+        data.get("comment", ""),
+        when or datetime.now(),
+    ))
+    rid = cursor.lastrowid
+
+    insert_tags(cursor, "rating_equipment", "equipment_tag", rid, equipment_tags)
+    insert_tags(cursor, "rating_accessibility", "accessibility_tag", rid, accessibility_tags)
+
+    # Count the review (and its tags) in location_rating_summary
+    apply_rating(cursor, rid)
+    return rid
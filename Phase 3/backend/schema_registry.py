@@ -0,0 +1,147 @@
+"""
+Registry of the schema's fixed vocabularies (ENUM columns and CHECK ... IN lists).
+
+INFORMATION_SCHEMA lookups are slow and take metadata locks, so the values are
+read once, kept in memory, and re-read only every `check_interval` seconds to
+detect a schema change. Each vocabulary carries a strong ETag derived from its
+values, so clients can revalidate cheaply with If-None-Match.
+
+An ENUM column missing from INFORMATION_SCHEMA (wrong schema name, table not
+created yet) raises SchemaMismatch instead of loading an empty vocabulary, which
+would reject every value checked against it.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+# vocabulary name -> (table, column)
+ENUM_COLUMNS = {
+    "equipment_tags": ("rating_equipment", "equipment_tag"),
+    "accessibility_tags": ("rating_accessibility", "accessibility_tag"),
+    "room_type": ("rooms", "room_type"),
+    "room_size": ("rooms", "room_size"),
+    "request_status": ("room_requests", "status"),
+}
+
+# users.role is a VARCHAR restricted by CHECK (role IN (...)) rather than an ENUM
+CHECK_COLUMNS = {
+    "role": ("users", "role"),
+}
+
+# Used if the server is too old to expose CHECK_CONSTRAINTS (MySQL < 8.0.16)
+FALLBACK_VALUES = {
+    "role": ["Student", "Faculty", "Visitor"],
+}
+
+log = logging.getLogger(__name__)
+
+_QUOTED = re.compile(r"'((?:[^'\\]|''|\\.)*)'")
+
+
+def parse_quoted_list(text):
+    """Pull the quoted values out of "enum('a','b')" or "(`role` in (_utf8mb4'a',...))"."""
+    return [v.replace("''", "'").replace("\\'", "'") for v in _QUOTED.findall(text)]
+
+
+def _etag(values):
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+class SchemaMismatch(Exception):
+    """INFORMATION_SCHEMA has no values for some of the vocabularies."""
+
+    def __init__(self, names):
+        super().__init__(f"No ENUM values found for: {', '.join(names)}")
+        self.names = names
+
+
+class SchemaRegistry:
+    """
+    Loads every vocabulary with two INFORMATION_SCHEMA queries.
+
+    load_enum_rows()  -> rows with TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
+    load_check_rows() -> rows with TABLE_NAME, CHECK_CLAUSE
+    """
+
+    def __init__(self, load_enum_rows, load_check_rows, check_interval=300):
+        self._load_enum_rows = load_enum_rows
+        self._load_check_rows = load_check_rows
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._vocabularies = {}  # name -> list of values
+        self._etags = {}         # name -> etag
+        self.version = None      # etag over every vocabulary
+        self.reloads = 0
+
+    def _read(self):
+        by_column = {}
+        for row in self._load_enum_rows():
+            by_column[(row["TABLE_NAME"], row["COLUMN_NAME"])] = parse_quoted_list(row["COLUMN_TYPE"])
+
+        vocabularies = {}
+        for name, key in ENUM_COLUMNS.items():
+            vocabularies[name] = by_column.get(key, [])
+        missing = [name for name, values in vocabularies.items() if not values]
+        if missing:
+            raise SchemaMismatch(missing)
+
+        check_rows = self._load_check_rows()
+        for name, (table, column) in CHECK_COLUMNS.items():
+            values = None
+            for row in check_rows or ():
+                clause = row["CHECK_CLAUSE"]
+                if row["TABLE_NAME"] == table and re.search(rf"`{column}`\s+in\s*\(", clause, re.IGNORECASE):
+                    values = parse_quoted_list(clause)
+                    break
+            vocabularies[name] = values if values else list(FALLBACK_VALUES.get(name, []))
+
+        return vocabularies
+
+    def refresh(self, force=False):
+        """Re-read the vocabularies if the check interval has passed; swap them in if they changed."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            if not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return False
+            try:
+                vocabularies = self._read()
+            except SchemaMismatch as err:
+                if self.version is None:
+                    raise
+                # Keep serving what the last good read found; try again next interval
+                log.warning("Keeping the previous vocabularies: %s", err)
+                self._checked_at = time.monotonic()
+                return False
+            self._checked_at = time.monotonic()
+            version = _etag(vocabularies)
+            if version == self.version:
+                return False
+            self._vocabularies = vocabularies
+            self._etags = {name: _etag(values) for name, values in vocabularies.items()}
+            self.version = version
+            self.reloads += 1
+            return True
+
+    def get(self, name):
+        self.refresh()
+        return self._vocabularies.get(name, [])
+
+    def etag(self, name):
+        self.refresh()
+        return self._etags.get(name)
+
+    def all(self):
+        self.refresh()
+        return dict(self._vocabularies)
+
+    def invalid_values(self, name, values):
+        """Return the values that are not part of the vocabulary (empty list if all are valid)."""
+        allowed = set(self.get(name))
+        return [v for v in values if v not in allowed]
@@ -0,0 +1,70 @@
+"""
+Pluggable JSON serializer for Flask responses.
+
+JSON_SERIALIZER=orjson (the default) serializes responses with `orjson`
+(pinned in requirements.txt), several times faster than the stdlib encoder on
+the large location listings; JSON_SERIALIZER=stdlib keeps Flask's own encoder,
+as does an environment where orjson is missing. Both produce the same JSON values: keys sorted,
+dates and datetimes as HTTP dates and Decimals as strings, like Flask's
+default provider. Only the byte layout differs (orjson writes non-ASCII
+characters as UTF-8 instead of \\u escapes).
+
+Serialization time is recorded either way (Server-Timing "serialize", /metrics).
+"""
+import datetime
+import decimal
+import os
+import time
+
+from werkzeug.http import http_date
+
+from instrumentation import TimedJSONProvider, record_serialize_time
+
+try:
+    import orjson  # in requirements.txt; tolerated missing for scripts and old venvs
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    """The types orjson leaves to us, converted the way Flask's provider does."""
+    if isinstance(o, datetime.date):  # datetimes too
+        return http_date(o)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(TimedJSONProvider):
+    """TimedJSONProvider with dumps() / response() done by orjson."""
+
+    OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps_bytes(self, obj, indent=False):
+        start = time.perf_counter()
+        try:
+            return orjson.dumps(obj, default=_default,
+                                option=self.OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        finally:
+            record_serialize_time(time.perf_counter() - start)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() - {"indent", "separators"}:
+            # Options orjson doesn't have (e.g. a custom cls): the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        # Bytes straight into the response, no str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def provider_from_env(app):
+    """The JSON provider selected by JSON_SERIALIZER (orjson if available, else stdlib)."""
+    if os.environ.get("JSON_SERIALIZER", "orjson").lower() == "orjson" and orjson is not None:
+        return OrjsonProvider(app)
+    return TimedJSONProvider(app)
@@ -0,0 +1,152 @@
+"""
+Prefix autocomplete for university names.
+
+Names are kept in sorted arrays so a prefix lookup is a bisect plus a short
+forward scan. Besides the full name, every later word start is indexed as well
+("southern maine", "maine", ...) so typing a distinctive word finds the
+university without the "University of" part. Matches on the full name rank
+ahead of matches on a later word.
+"""
+import bisect
+import threading
+
+from text_search import normalize
+
+
+class _SortedPrefixIndex:
+    """Two sorted lists of (key, university_id): full-name keys and later-word keys."""
+
+    def __init__(self):
+        self.names = []
+        self.words = []
+
+    @classmethod
+    def build(cls, universities):
+        """Index (university_id, name) pairs with one sort per list (add() is for single inserts)."""
+        index = cls()
+        for university_id, name in universities:
+            full, later = cls._keys(name)
+            index.names.append((full, university_id))
+            index.words.extend((key, university_id) for key in later)
+        index.names.sort()
+        index.words.sort()
+        return index
+
+    @staticmethod
+    def _keys(name):
+        norm = normalize(name)
+        words = norm.split()
+        later = {" ".join(words[i:]) for i in range(1, len(words))}
+        return norm, later
+
+    def add(self, university_id, name):
+        full, later = self._keys(name)
+        bisect.insort(self.names, (full, university_id))
+        for key in later:
+            bisect.insort(self.words, (key, university_id))
+
+    def remove(self, university_id, name):
+        full, later = self._keys(name)
+        self._delete(self.names, (full, university_id))
+        for key in later:
+            self._delete(self.words, (key, university_id))
+
+    @staticmethod
+    def _delete(entries, entry):
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def match(self, prefix, k):
+        found = []
+        seen = set()
+        for entries in (self.names, self.words):
+            i = bisect.bisect_left(entries, (prefix,))
+            while i < len(entries) and len(found) < k:
+                key, uid = entries[i]
+                if not key.startswith(prefix):
+                    break
+                if uid not in seen:
+                    seen.add(uid)
+                    found.append(uid)
+                i += 1
+            if len(found) >= k:
+                break
+        return found
+
+
+class UniversitySuggester:
+    """
+    In-memory university autocomplete, optionally filtered by state.
+
+    Loaded once from MySQL on first use and patched by the admin endpoints;
+    invalidate() forces a reload on the next lookup.
+    """
+
+    def __init__(self, load_universities):
+        self._load_universities = load_universities
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._all = _SortedPrefixIndex()
+        self._by_state = {}  # lowercased state -> _SortedPrefixIndex
+        self._universities = {}  # university_id -> (name, state)
+
+    def warm(self):
+        """Load the university list now instead of on the first lookup."""
+        self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            universities = {}
+            by_state = {}
+            for row in self._load_universities():
+                universities[row["university_id"]] = (row["name"], row["state"])
+                by_state.setdefault(row["state"].lower(), []).append((row["university_id"], row["name"]))
+            self._universities = universities
+            self._all = _SortedPrefixIndex.build((uid, name) for uid, (name, _) in universities.items())
+            self._by_state = {state: _SortedPrefixIndex.build(pairs) for state, pairs in by_state.items()}
+            self._loaded = True
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def _add(self, university_id, name, state):
+        self._universities[university_id] = (name, state)
+        self._all.add(university_id, name)
+        self._by_state.setdefault(state.lower(), _SortedPrefixIndex()).add(university_id, name)
+
+    def add(self, university_id, name, state):
+        with self._lock:
+            if self._loaded and university_id not in self._universities:
+                self._add(university_id, name, state)
+
+    def remove(self, university_id):
+        with self._lock:
+            if not self._loaded or university_id not in self._universities:
+                return
+            name, state = self._universities.pop(university_id)
+            self._all.remove(university_id, name)
+            self._by_state[state.lower()].remove(university_id, name)
+
+    def suggest(self, prefix, state="", k=10):
+        """Return up to k {"university_id", "university", "state"} dicts for the prefix."""
+        self._ensure_loaded()
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            index = self._by_state.get(state.lower()) if state else self._all
+            if index is None:
+                return []
+
+            results = []
+            for uid in index.match(prefix, k):
+                name, uni_state = self._universities[uid]
+                results.append({"university_id": uid, "university": name, "state": uni_state})
+        return results
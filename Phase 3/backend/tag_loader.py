@@ -0,0 +1,53 @@
+"""
+Batched loader for review tags.
+
+Instead of one query per review and per tag table, all tags for a set of RIDs
+are fetched with a single `WHERE RID IN (...)` query per tag table (split into
+chunks for very large sets) and stitched back onto the review dicts.
+"""
+
+# review key -> (table, column)
+TAG_TABLES = {
+    "equipment_tags": ("rating_equipment", "equipment_tag"),
+    "accessibility_tags": ("rating_accessibility", "accessibility_tag"),
+}
+
+# Keeps the IN list (and the packet size) bounded for rooms with thousands of reviews
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def load_tags(cursor, rids, chunk_size=CHUNK_SIZE):
+    """Return {rid: {"equipment_tags": [...], "accessibility_tags": [...]}} for the given RIDs."""
+    rids = list(dict.fromkeys(rids))  # de-duplicate, keep order
+    tags = {rid: {key: [] for key in TAG_TABLES} for rid in rids}
+    if not rids:
+        return tags
+
+    for key, (table, column) in TAG_TABLES.items():
+        for chunk in _chunks(rids, chunk_size):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"SELECT RID, {column} FROM {table} WHERE RID IN ({placeholders}) ORDER BY RID, {column}",
+                chunk
+            )
+            for row in cursor.fetchall():
+                if isinstance(row, dict):
+                    rid, tag = row["RID"], row[column]
+                else:
+                    rid, tag = row
+                tags[rid][key].append(tag)
+
+    return tags
+
+
+def attach_tags(cursor, reviews, rid_key="RID", chunk_size=CHUNK_SIZE):
+    """Add equipment_tags / accessibility_tags lists to each review dict in place."""
+    tags = load_tags(cursor, [r[rid_key] for r in reviews], chunk_size)
+    for review in reviews:
+        review.update(tags[review[rid_key]])
+    return reviews
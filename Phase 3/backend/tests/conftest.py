@@ -0,0 +1,146 @@
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND)
+
+# app.py reads these at import time
+os.environ.setdefault("AUTH_SECRET_KEY", "test-secret")
+os.environ.setdefault("DB_PORT", "3306")
+
+
+class FakeCursor:
+    """Driver cursor stand-in: every execute() is logged and answered by the FakeDB's responder."""
+
+    def __init__(self, db, dictionary=False, **kwargs):
+        self.db = db
+        self.dictionary = dictionary
+        self.rows = []
+        self.lastrowid = None
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.db.statements.append((" ".join(sql.split()), params))
+        self.rows = list(self.db.respond(sql, params) or [])
+        self.rowcount = len(self.rows)
+        self.lastrowid = self.db.next_id()
+
+    def executemany(self, sql, seq_params):
+        for params in seq_params:
+            self.execute(sql, params)
+
+    def callproc(self, name, args=()):
+        self.db.statements.append((f"CALL {name}", list(args)))
+        return args
+
+    def stored_results(self):
+        return []
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchmany(self, size=1):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self.db, **kwargs)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        self.db.rollbacks += 1
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+# What INFORMATION_SCHEMA.COLUMNS lists for the ENUM columns schema_registry reads
+ENUM_ROWS = [
+    {"TABLE_NAME": "rating_equipment", "COLUMN_NAME": "equipment_tag",
+     "COLUMN_TYPE": "enum('whiteboard','projector','computers')"},
+    {"TABLE_NAME": "rating_accessibility", "COLUMN_NAME": "accessibility_tag",
+     "COLUMN_TYPE": "enum('elevator_access','ramp_access')"},
+    {"TABLE_NAME": "rooms", "COLUMN_NAME": "room_type", "COLUMN_TYPE": "enum('study room','classroom')"},
+    {"TABLE_NAME": "rooms", "COLUMN_NAME": "room_size", "COLUMN_TYPE": "enum('small','medium','large')"},
+    {"TABLE_NAME": "room_requests", "COLUMN_NAME": "status", "COLUMN_TYPE": "enum('pending','approved')"},
+]
+
+
+class FakeDB:
+    """
+    Replaces both connection pools of app.py. Set `responder` to a function
+    (sql, params) -> rows; `statements` lists every (sql, params) executed.
+    The ENUM vocabulary query is answered with ENUM_ROWS.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.responder = lambda sql, params: []
+        self._ids = 0
+
+    def respond(self, sql, params):
+        if "FROM INFORMATION_SCHEMA.COLUMNS" in sql:
+            return ENUM_ROWS
+        return self.responder(sql, params)
+
+    def next_id(self):
+        self._ids += 1
+        return self._ids
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def executed(self, fragment):
+        """Statements containing `fragment`."""
+        return [s for s in self.statements if fragment in s[0]]
+
+
+@pytest.fixture
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture
+def fake_db(app_module, monkeypatch):
+    db = FakeDB()
+    for pool in (app_module.db_pool, app_module.webapp_pool):
+        pool.dispose()
+        monkeypatch.setattr(pool, "_connect", db.connect)
+    app_module.response_cache.clear()
+    app_module.location_resolver.forget()
+    app_module.review_first_pages.forget()
+    yield db
+    for pool in (app_module.db_pool, app_module.webapp_pool):
+        pool.dispose()
+
+
+@pytest.fixture
+def client(app_module, fake_db):
+    return app_module.app.test_client()
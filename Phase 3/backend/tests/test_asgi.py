@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import aiomysql
+import pytest
+
+from asgi import CampusInsiderASGI
+from db_pool import PoolTimeout
+
+
+def get(application, path, query=b""):
+    """Run one GET through the ASGI app; returns (status, JSON body)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}
+    asyncio.run(application(scope, receive, send))
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return sent[0]["status"], json.loads(body)
+
+
+def failing_app(error):
+    async def handler(args):
+        raise error
+    return CampusInsiderASGI(None, {"/api/native": (handler, lambda args, payload: [])}, None)
+
+
+@pytest.mark.parametrize("error, status, message", [
+    (aiomysql.OperationalError(2013, "Lost connection to MySQL server during query"), 500,
+     "Lost connection to MySQL server during query"),
+    (aiomysql.ProgrammingError(1146, "Table 'campus_insider.location' doesn't exist"), 500, "doesn't exist"),
+    (PoolTimeout("pool exhausted"), 503, "Database busy, please retry"),
+])
+def test_database_errors_become_json(fake_db, error, status, message):
+    got_status, body = get(failing_app(error), "/api/native", b"q=1")
+    assert got_status == status
+    assert message in body["error"]
+
+
+def test_errors_are_not_cached(app_module, fake_db):
+    application = failing_app(aiomysql.OperationalError(2013, "Lost connection"))
+    stores = app_module.response_cache.stats()["stores"]
+    assert get(application, "/api/native", b"q=2")[0] == 500
+    assert app_module.response_cache.stats()["stores"] == stores
@@ -0,0 +1,57 @@
+import logging
+
+from auth_tokens import AuthTokens
+
+
+def test_missing_secret_is_logged_as_a_warning(monkeypatch, caplog, capsys):
+    monkeypatch.delenv("AUTH_SECRET_KEY", raising=False)
+    with caplog.at_level(logging.WARNING, logger="auth_tokens"):
+        tokens = AuthTokens.from_env()
+
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+    assert "AUTH_SECRET_KEY is not set" in caplog.records[0].getMessage()
+    assert capsys.readouterr().out == ""
+    # The random key still signs and verifies within the process
+    assert tokens._serializer.loads(tokens._serializer.dumps({"uid": 1})) == {"uid": 1}
+
+
+def test_configured_secret_logs_nothing(monkeypatch, caplog):
+    monkeypatch.setenv("AUTH_SECRET_KEY", "s3cret")
+    with caplog.at_level(logging.WARNING, logger="auth_tokens"):
+        AuthTokens.from_env()
+    assert caplog.records == []
+
+
+USER = {"uid": 7, "username": "alice", "role": "admin", "university_id": 1}
+
+
+def test_demotion_applies_to_a_token_issued_in_the_same_second(monkeypatch):
+    tokens = AuthTokens("s3cret")
+    # Freeze the second-resolution clock itsdangerous signs with
+    monkeypatch.setattr("itsdangerous.timed.time.time", lambda: 1_700_000_000.5)
+    token = tokens.issue(USER)
+    tokens.role_changed(7, "Student")
+    assert tokens.verify(token)["role"] == "Student"
+
+    # A token issued after the change, still within that second, keeps its own role
+    again = tokens.issue({**USER, "role": "Student"})
+    assert tokens.verify(again)["role"] == "Student"
+    assert "iat" not in tokens.verify(again)
+
+
+def test_logout_revokes_a_token_issued_in_the_same_second(monkeypatch):
+    tokens = AuthTokens("s3cret")
+    monkeypatch.setattr("itsdangerous.timed.time.time", lambda: 1_700_000_000.5)
+    token = tokens.issue(USER)
+    tokens.revoke(7)
+    assert tokens.verify(token) is None
+    assert tokens.verify(tokens.issue(USER)) is not None  # logging back in works
+
+
+def test_tokens_without_iat_are_caught_in_their_second(monkeypatch):
+    tokens = AuthTokens("s3cret")
+    monkeypatch.setattr("itsdangerous.timed.time.time", lambda: 1_700_000_000.5)
+    legacy = tokens._serializer.dumps({k: USER[k] for k in ("uid", "username", "role", "university_id")})
+    monkeypatch.setattr("auth_tokens.time.time_ns", lambda: 1_700_000_000_900_000_000)
+    tokens.revoke(7)
+    assert tokens.verify(legacy) is None
@@ -0,0 +1,56 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, jsonify, request
+
+from coalesce import Coalescer
+
+
+def make_app():
+    """A view that blocks until released and answers with the raw `name` arg it read."""
+    app = Flask(__name__)
+    coalescer = Coalescer(timeout=5)
+    release = threading.Event()
+    calls = []
+
+    @app.route("/echo")
+    @coalescer.coalesced()
+    def echo():
+        calls.append(request.args.get("name"))
+        release.wait(5)
+        return jsonify({"name": request.args.get("name")})
+
+    return app, coalescer, release, calls
+
+
+def fetch_concurrently(app, release, calls, urls, leaders):
+    def get(url):
+        return app.test_client().get(url)
+
+    with ThreadPoolExecutor(len(urls)) as pool:
+        futures = [pool.submit(get, url) for url in urls]
+        deadline = time.monotonic() + 2
+        while len(calls) < leaders and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)  # let the followers join the flight
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_identical_requests_share_one_computation():
+    app, coalescer, release, calls = make_app()
+    responses = fetch_concurrently(app, release, calls, ["/echo?name=Foo"] * 4, leaders=1)
+
+    assert calls == ["Foo"]
+    assert sorted(r.headers.get("X-Coalesced", "-") for r in responses) == ["-", "HIT", "HIT", "HIT"]
+    assert coalescer.stats()["routes"]["/echo"]["coalesced"] == 3
+
+
+def test_padded_arg_is_not_given_the_trimmed_response():
+    app, coalescer, release, calls = make_app()
+    responses = fetch_concurrently(app, release, calls, ["/echo?name=Foo", "/echo?name=%20Foo"], leaders=2)
+
+    assert sorted(calls) == [" Foo", "Foo"]
+    assert sorted(r.get_json()["name"] for r in responses) == [" Foo", "Foo"]
+    assert "X-Coalesced" not in responses[0].headers and "X-Coalesced" not in responses[1].headers
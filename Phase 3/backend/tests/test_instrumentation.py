@@ -0,0 +1,114 @@
+import logging
+import re
+
+import pytest
+from flask import Flask, jsonify
+
+from conftest import FakeDB
+from instrumentation import PerformanceMonitor, normalize_sql, redact_params
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries, (\d+) rows", serialize;dur=([\d.]+), total;dur=([\d.]+)$'
+)
+
+
+@pytest.fixture
+def monitored():
+    """A small app with its own PerformanceMonitor; /rows/<n> runs one query per row."""
+    app = Flask(__name__)
+    monitor = PerformanceMonitor(slow_ms=10_000)
+    monitor.init_app(app)
+    db = FakeDB()
+    db.responder = lambda sql, params: [{"n": 1}]
+
+    @app.route("/rows/<int:n>")
+    def rows(n):
+        cursor = monitor.wrap(db.connect(), None).cursor(dictionary=True)
+        out = []
+        for i in range(n):
+            cursor.execute("SELECT n FROM t WHERE id = %s", (i,))
+            out += cursor.fetchall()
+        return jsonify(out)
+
+    @app.route("/metrics")
+    def metrics():
+        return monitor.render([("db_pool_idle", "Idle connections.", {(("pool", "main"),): 3})])
+
+    return app.test_client(), monitor
+
+
+def server_timing(response):
+    match = SERVER_TIMING.match(response.headers["Server-Timing"])
+    assert match, response.headers["Server-Timing"]
+    return int(match.group(1)), int(match.group(2)), float(match.group(3)), float(match.group(4))
+
+
+def test_server_timing_counts_statements_and_rows(monitored):
+    client, _ = monitored
+    statements, rows, serialize, total = server_timing(client.get("/rows/3"))
+    assert (statements, rows) == (3, 3)
+    assert 0 <= serialize <= total
+
+
+def test_server_timing_on_requests_without_queries(monitored):
+    client, _ = monitored
+    assert server_timing(client.get("/rows/0"))[:2] == (0, 0)
+    # Even on a 404
+    assert server_timing(client.get("/nowhere"))[:2] == (0, 0)
+
+
+def test_metrics_aggregate_per_endpoint(monitored):
+    client, _ = monitored
+    for n in (1, 2, 30):
+        client.get(f"/rows/{n}")
+    client.get("/nowhere")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert 'http_requests_total{endpoint="rows",method="GET",status="200"} 3' in text
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 1' in text
+    assert 'sql_statements_total{endpoint="rows"} 33' in text
+    assert 'db_rows_fetched_total{endpoint="rows"} 33' in text
+    # Histogram buckets are cumulative: 1 and 2 statements are <= 2, 30 falls in le="50"
+    assert 'sql_statements_per_request_bucket{endpoint="rows",le="2"} 2' in text
+    assert 'sql_statements_per_request_bucket{endpoint="rows",le="20"} 2' in text
+    assert 'sql_statements_per_request_bucket{endpoint="rows",le="50"} 3' in text
+    assert 'sql_statements_per_request_count{endpoint="rows"} 3' in text
+    assert 'http_request_duration_seconds_count{endpoint="rows"} 3' in text
+    assert 'db_pool_idle{pool="main"} 3' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+
+
+def test_every_sample_line_is_well_formed(monitored):
+    client, _ = monitored
+    client.get("/rows/2")
+    sample = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? -?[\d.]+(e-?\d+)?$')
+    for line in client.get("/metrics").get_data(as_text=True).splitlines():
+        assert line.startswith("# ") or sample.match(line), line
+
+
+def test_slow_statements_are_logged_without_values(caplog):
+    app = Flask(__name__)
+    monitor = PerformanceMonitor(slow_ms=0)
+    monitor.init_app(app)
+    conn = monitor.wrap(FakeDB().connect(), None)
+    with app.test_request_context("/login"), caplog.at_level(logging.WARNING, "campus_insider.slow_query"):
+        conn.cursor().execute("SELECT * FROM users WHERE username = %s AND pw = 'x' LIMIT 10", ("alice",))
+
+    recent = monitor.slow_queries()["recent"]
+    assert recent[0]["sql"] == "SELECT * FROM users WHERE username = ? AND pw = ? LIMIT ?"
+    assert recent[0]["params"] == ["str"]
+    assert "alice" not in caplog.text
+
+
+def test_normalize_sql_collapses_in_lists():
+    assert normalize_sql("SELECT 1 FROM t -- note\n WHERE id IN (%s, %s, %s) AND x = 'a'") \
+        == "SELECT ? FROM t WHERE id IN (?, ...) AND x = ?"
+    assert redact_params({"password": "hunter2"}) == {"password": "str"}
+
+
+def test_app_reports_statements_of_the_request(client, fake_db):
+    fake_db.responder = lambda sql, params: [{"LID": 7}] if sql.startswith("SELECT LID FROM location") else []
+    response = client.get("/api/locations/7/reviews")
+    assert response.status_code == 200
+    assert server_timing(response)[0] == len(fake_db.statements) > 0
+    assert 'endpoint="lid_reviews"' in client.get("/metrics").get_data(as_text=True)
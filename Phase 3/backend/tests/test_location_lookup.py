@@ -0,0 +1,108 @@
+import pytest
+
+from location_lookup import AmbiguousLocation, LocationResolver, choose
+
+LOCATIONS = [(3, "Hall - Room 1"), (4, "Hall 1 "), (5, "BEH - Room 100"), (6, "BEH 100")]
+
+
+def name_key(name):
+    return name.replace(" - Room ", " ").strip()
+
+
+def respond(sql, params):
+    """The resolver's lookup_sql() and the review / location queries over LOCATIONS."""
+    if "L.name_key IN" in sql and "FROM users" not in sql:
+        n_names = sql.split("IN (")[1].split(")")[0].count("%s")
+        names, keys = params[:n_names], params[n_names + 1:]
+        return [{"LID": lid, "exact_name": int(name in names)}
+                for lid, name in LOCATIONS if name_key(name) in {name_key(k) for k in keys}]
+    if "WHERE L.LID = %s" in sql:
+        lid = params[0]
+        return [{"LID": lid, "location_name": dict(LOCATIONS)[lid], "location_type": "Room",
+                 "building_name": "Hall", "university_name": "U", "campus_name": "Main"}]
+    if "FROM ratings" in sql:
+        return [{"RID": 100 + lid, "LID": lid, "score": 5, "date": None} for lid in params if lid in dict(LOCATIONS)]
+    return []
+
+
+@pytest.mark.parametrize("candidates, lid", [
+    ([], None),
+    ([(3, False)], 3),
+    ([(3, False), (4, True)], 4),
+])
+def test_choose(candidates, lid):
+    assert choose("x", candidates) == lid
+
+
+@pytest.mark.parametrize("candidates", [[(3, False), (4, False)], [(3, True), (4, True)]])
+def test_choose_rejects_ambiguous_names(candidates):
+    with pytest.raises(AmbiguousLocation) as err:
+        choose("Hall 1", candidates)
+    assert err.value.lids == [3, 4]
+
+
+def test_cache_keeps_spellings_of_one_key_apart():
+    resolver = LocationResolver()
+
+    class Cursor:
+        def execute(self, sql, params):
+            self.rows = respond(sql, params)
+
+        def fetchall(self):
+            return self.rows
+
+    assert resolver.resolve(Cursor(), "U", "BEH 100") == 6
+    assert resolver.resolve(Cursor(), "U", "BEH - Room 100") == 5
+    assert resolver.resolve(Cursor(), "U", "BEH 100") == 6  # from the cache
+    assert resolver.stats()["queries"] == 2
+
+
+def test_location_ratings_rejects_ambiguous_names(client, fake_db):
+    fake_db.responder = respond
+    response = client.get("/api/locationRatings?location=Hall%201&university=U")
+    assert response.status_code == 409
+    assert response.get_json()["LIDs"] == [3, 4]
+
+
+def test_location_ratings_prefers_the_exact_name(client, fake_db):
+    fake_db.responder = respond
+    response = client.get("/api/locationRatings?location=BEH%20-%20Room%20100&university=U")
+    assert response.status_code == 200
+    assert response.get_json()["location"]["LID"] == 5
+
+
+def test_reviews_are_not_merged_across_locations(client, fake_db):
+    fake_db.responder = respond
+    response = client.get("/api/reviews?location=Hall%201&university=U")
+    assert response.status_code == 409
+
+    response = client.get("/api/reviews?location=BEH%20100&university=U")
+    assert response.status_code == 200
+    review_queries = [params for sql, params in fake_db.statements if "FROM ratings" in sql]
+    assert review_queries and all(5 not in params for params in review_queries)
+
+
+def test_delete_university_forgets_its_lookups(app_module, client, fake_db):
+    resolver = app_module.location_resolver
+    resolver.put("Gone University", ("Hall 1",), [(3, True)])
+    resolver.put("Other University", ("Hall 1",), [(9, True)])
+
+    def respond_admin(sql, params):
+        if "SELECT university_id FROM university" in sql:
+            return [(11,)]
+        if "COUNT(*)" in sql:
+            return [(0,)]
+        return []
+
+    fake_db.responder = respond_admin
+    token = app_module.auth_tokens.issue({"uid": 1, "username": "root", "role": "admin", "university_id": 1})
+    response = client.post("/api/admin/deleteUniversity", json={"name": "Gone University", "state": "ME"},
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert resolver.get("Gone University", ("Hall 1",)) is None
+    # the cascade takes its users' ratings: they leave the summaries first
+    statements = [sql for sql, _ in fake_db.statements]
+    assert statements.index("CALL RemoveRatingsFromSummary") < \
+        next(i for i, sql in enumerate(statements) if sql.startswith("DELETE FROM university"))
+    assert fake_db.executed("CALL RemoveRatingsFromSummary")[0][1] == [None, 11]
+    assert resolver.get("Other University", ("Hall 1",)) == [(9, True)]
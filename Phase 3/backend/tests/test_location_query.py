@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from location_query import build_location_search, parse_filters, plan_shape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "benchmarks"))
+import location_query_plans  # noqa: E402
+
+
+def search(**args):
+    return build_location_search(parse_filters(MultiDict({"university": "U", "state": "S", **args})))
+
+
+def test_generated_sql_matches_golden_file():
+    diff = location_query_plans.check_golden()
+    assert not diff, "location_query.py output drifted; review it and run " \
+                     "`python location_query_plans.py --update` if intended\n" + diff
+
+
+def test_rooms_join_only_when_needed():
+    assert "LEFT JOIN rooms" in search()[0]
+    assert "rooms" not in search(types="building,nonbuilding")[0]
+    assert "NULL AS room_number" in search(types="building")[0]
+    # A room filter can only match rooms, so the join is inner
+    sql = search(types="room,building", roomSizes="small")[0]
+    assert "\nJOIN rooms R" in sql and "LEFT JOIN" not in sql
+
+
+def test_rating_tables_only_with_rating_filters():
+    sql = search()[0]
+    for table in ("ratings", "rating_equipment", "rating_accessibility", "location_rating_summary", "DISTINCT"):
+        assert table not in sql
+    assert "location_rating_summary" in search(searchByRating="1", scoreMin="1", scoreMax="10")[0]
+    assert "FROM ratings R2" in search(searchByRating="1", scoreMin="8", scoreMax="10")[0]
+
+
+def test_sql_depends_only_on_filter_shape():
+    a = parse_filters(MultiDict({"university": "A", "state": "S", "roomSizes": "small"}), lids=[1, 2])
+    b = parse_filters(MultiDict({"university": "B", "state": "T", "roomSizes": "large"}), lids=[5, 6, 7])
+    assert plan_shape(a) == plan_shape(b)
+    assert build_location_search(a)[0] == build_location_search(b)[0]
+
+
+def test_every_placeholder_has_a_parameter():
+    for label, sql, params in location_query_plans.plans():
+        # pyformat substitution raises KeyError on a missing parameter
+        sql % {key: repr(value) for key, value in params.items()}
+
+
+@pytest.mark.skipif(not os.environ.get("EXPLAIN_TESTS"),
+                    reason="set EXPLAIN_TESTS=1 to EXPLAIN the plans against the MySQL database in .env")
+def test_plans_have_no_full_scans_temporary_tables_or_filesorts():
+    conn = location_query_plans.connect()
+    try:
+        flagged = [f"{label}: {row.get('table')} {', '.join(problems)}"
+                   for label, row, problems in location_query_plans.explain(conn.cursor(dictionary=True))
+                   if problems]
+    finally:
+        conn.close()
+    assert not flagged
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from password_hasher import HasherBusy, PasswordHasher, hash_rounds
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.1, rounds=4)
+    yield hasher
+    hasher.close()
+
+
+def wait_idle(hasher, seconds=5):
+    deadline = time.monotonic() + seconds
+    while hasher.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return hasher.stats()["in_flight"] == 0
+
+
+def test_minimum_cost_is_12():
+    assert PasswordHasher().min_rounds == 12
+    assert PasswordHasher.from_env().min_rounds == 12
+
+
+def test_timed_out_work_keeps_its_slot_until_it_finishes(hasher):
+    with pytest.raises(HasherBusy, match="timed out"):
+        hasher._run(time.sleep, 0.5)
+    # The sleep still occupies the only worker, so nothing else is queued behind it
+    assert hasher.stats()["in_flight"] == 1
+    with pytest.raises(HasherBusy, match="Too many"):
+        hasher.check("$2b$04$invalid", "pw")
+    assert hasher.stats()["rejected"] == 1
+
+    assert wait_idle(hasher)
+    assert hasher.check(hasher.hash("pw"), "pw")
+
+
+def test_calibration_takes_a_slot(hasher):
+    hasher._rounds = None
+    hasher.timeout = 5
+    future = hasher._submit(time.sleep, 0.3)
+    with pytest.raises(HasherBusy, match="Too many"):
+        hasher.calibrate()
+    future.result()
+
+    assert wait_idle(hasher)
+    hasher.target_ms = 1  # anything is slower than that: the floor
+    assert hasher.calibrate() == 12
+    assert hash_rounds(hasher.hash("pw")) == 12
+
+
+def test_correct_password_is_accepted_when_calibration_is_busy(hasher):
+    stored = hasher.hash("pw")
+    hasher._rounds = None
+    hasher.check = lambda stored_hash, password: True  # the check got its slot
+    future = hasher._submit(time.sleep, 0.3)           # and now the pool is full again
+    assert hasher.verify(stored, "pw") == (True, None)
+    future.result()
+
+
+def test_concurrent_first_users_calibrate_once(hasher, monkeypatch):
+    hasher._rounds = None
+    calls = []
+
+    def calibrate():
+        calls.append(1)
+        time.sleep(0.1)
+        hasher._rounds = 12
+        return 12
+
+    monkeypatch.setattr(hasher, "calibrate", calibrate)
+    threads = [threading.Thread(target=lambda: hasher.rounds) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
@@ -0,0 +1,85 @@
+from werkzeug.datastructures import MultiDict
+
+from response_cache import RedisBackend, make_key
+
+
+def test_key_keeps_values_as_the_view_reads_them():
+    assert make_key("/api/university", MultiDict([("name", " Foo")])) != \
+        make_key("/api/university", MultiDict([("name", "Foo")]))
+    assert make_key("/api/university", MultiDict([("name", "")])) != make_key("/api/university", MultiDict())
+    # getlist() order is what the view sees
+    assert make_key("/api/x", MultiDict([("tag", "a"), ("tag", "b")])) != \
+        make_key("/api/x", MultiDict([("tag", "b"), ("tag", "a")]))
+
+
+def test_key_ignores_arg_name_order_and_escapes_values():
+    assert make_key("/api/x", MultiDict([("a", "1"), ("b", "2")])) == \
+        make_key("/api/x", MultiDict([("b", "2"), ("a", "1")]))
+    assert make_key("/api/x", MultiDict([("a", "1&b=2")])) != make_key("/api/x", MultiDict([("a", "1"), ("b", "2")]))
+
+
+def test_padded_arg_is_not_served_the_trimmed_page(client, fake_db):
+    def respond(sql, params):
+        if "L.name_key IN" in sql:
+            return [{"LID": 7, "exact_name": 1}]
+        if "WHERE L.LID = %s" in sql:
+            return [{"LID": 7, "location_name": "BEH 100", "location_type": "Room", "building_name": "BEH",
+                     "university_name": "U", "campus_name": "Main"}]
+        return []
+
+    fake_db.responder = respond
+    assert client.get("/api/locationRatings?location=BEH%20100&university=U").headers["X-Cache"] == "MISS"
+    assert client.get("/api/locationRatings?location=%20BEH%20100&university=U").headers["X-Cache"] == "MISS"
+    assert client.get("/api/locationRatings?university=U&location=BEH%20100").headers["X-Cache"] == "HIT"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.calls = []
+
+    def pipeline(self):
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    def execute(self):
+        pass
+
+
+def test_redis_tag_sets_expire_with_the_longest_entry_ttl():
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix="p:", tag_ttl=60)
+    entry = {"body": b"{}", "mimetype": "application/json"}
+
+    backend.set("k1", entry, 30, tags=["university:u"])
+    assert ("expire", ("p:k1", 30)) in client.calls
+    assert ("expire", ("p:tag:university:u", 60)) in client.calls
+
+    client.calls.clear()
+    backend.set("k2", entry, 600, tags=["university:u"])
+    backend.set("k3", entry, 30, tags=["university:u"])
+    # never shortened below an entry that may still be in it
+    assert [args for name, args in client.calls if name == "expire" and args[0].startswith("p:tag:")] == \
+        [("p:tag:university:u", 600), ("p:tag:university:u", 600)]
+
+
+def test_view_tags_the_location_it_loaded_without_parsing_the_body(app_module, client, fake_db, monkeypatch):
+    def respond(sql, params):
+        if "WHERE L.LID = %s" in sql:
+            return [{"LID": 7, "location_name": "BEH 100", "location_type": "Room", "building_name": "BEH",
+                     "university_name": "U", "campus_name": "Main"}]
+        return []
+
+    def no_parsing(self, *args, **kwargs):
+        raise AssertionError("response body parsed to compute cache tags")
+
+    fake_db.responder = respond
+    monkeypatch.setattr(app_module.app.response_class, "get_json", no_parsing)
+    assert client.get("/api/locations/7/ratings").headers["X-Cache"] == "MISS"
+    assert client.get("/api/locations/7/ratings").headers["X-Cache"] == "HIT"
+
+    app_module.response_cache.invalidate("location:7")
+    assert client.get("/api/locations/7/ratings").headers["X-Cache"] == "MISS"
+    app_module.response_cache.invalidate("university:u")
+    assert client.get("/api/locations/7/ratings").headers["X-Cache"] == "MISS"
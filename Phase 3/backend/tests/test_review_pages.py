@@ -0,0 +1,132 @@
+import sqlite3
+
+import pytest
+
+import review_pages
+from pagination import InvalidCursor, decode_cursor, encode_cursor
+
+# (RID, LID, score, date); RIDs 3, 6 and 9 have no date
+REVIEWS = [
+    (1, 1, 7, "2025-03-01"), (2, 1, 7, "2025-03-01"), (3, 1, 2, None), (4, 1, 9, "2025-01-15"),
+    (5, 1, 7, "2025-06-30"), (6, 1, 5, None), (7, 2, 10, "2025-02-02"), (8, 1, 1, "2025-01-15"),
+    (9, 1, 9, None), (10, 1, 3, "2025-03-01"),
+]
+
+
+@pytest.fixture
+def db():
+    """SQLite orders NULLs like MySQL (first ascending, last descending), so the keyset SQL runs unchanged."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE users (uid INTEGER PRIMARY KEY, username TEXT, role TEXT);
+        CREATE TABLE ratings (RID INTEGER PRIMARY KEY, LID INT, UID INT, score INT, noise INT, cleanliness INT,
+                              equipment_quality INT, wifi_strength INT, extra_comments TEXT, date TEXT);
+        INSERT INTO users VALUES (1, 'alice', 'Student');
+    """)
+    conn.executemany("INSERT INTO ratings (RID, LID, UID, score, date) VALUES (?, ?, 1, ?, ?)", REVIEWS)
+    yield conn
+    conn.close()
+
+
+def fetch_page(db, sort, after, page_size):
+    sql, params = review_pages.reviews_query([1], sort, after, page_size)
+    rows = [dict(row) for row in db.execute(sql.replace("%s", "?"), params)]
+    return review_pages.split_page(rows, sort, page_size)
+
+
+def expected_order(sort):
+    rows = [r for r in REVIEWS if r[1] == 1]
+    column = 3 if sort.endswith("date") else 2
+    descending = sort.startswith("-")
+    # NULLs first ascending (so last descending), then the value, then RID
+    ordered = sorted(rows, key=lambda r: (r[column] is not None, r[column] or "", r[0]), reverse=descending)
+    return [r[0] for r in ordered]
+
+
+@pytest.mark.parametrize("sort", list(review_pages.SORTS))
+@pytest.mark.parametrize("page_size", [1, 2, 4, 20])
+def test_pages_cover_every_review_once_in_order(db, sort, page_size):
+    seen, after = [], None
+    while True:
+        reviews, next_cursor = fetch_page(db, sort, after, page_size)
+        seen += [r["RID"] for r in reviews]
+        if next_cursor is None:
+            break
+        # The cursor goes through the client as an opaque string
+        after = review_pages.check_cursor(decode_cursor(next_cursor, 2), sort)
+    assert seen == expected_order(sort)
+
+
+def test_cursor_after_a_review_without_date_is_null():
+    cursor = review_pages.review_cursor({"RID": 6, "date": None, "score": 5}, "-date")
+    assert decode_cursor(cursor, 2) == [None, 6]
+    assert review_pages.check_cursor([None, 6], "-date") == [None, 6]
+
+
+def test_null_cursor_conditions():
+    newest, params = review_pages.keyset_condition("-date", [None, 6])
+    assert newest == "(r.date IS NULL AND r.RID < %s)" and params == [6]
+    oldest, _ = review_pages.keyset_condition("date", [None, 6])
+    assert oldest == "(r.date IS NOT NULL OR (r.date IS NULL AND r.RID > %s))"
+    # score is NOT NULL: no IS NULL branch
+    assert "IS NULL" not in review_pages.keyset_condition("-score", [5, 6])[0]
+
+
+@pytest.mark.parametrize("sort, after", [
+    ("-date", [5, 1]), ("-score", ["2025-01-01", 1]), ("-score", [None, 1]), ("score", [True, 1]),
+    ("-date", ["2025-01-01", "1"]),
+])
+def test_malformed_cursors_are_rejected(sort, after):
+    with pytest.raises(InvalidCursor):
+        review_pages.check_cursor(after, sort)
+
+
+def test_first_page_cache_forgets_one_location():
+    cache = review_pages.FirstPageCache(ttl=60, max_entries=2)
+    cache.put(1, "-date", 20, ([], None))
+    cache.put(2, "-date", 20, ([], None))
+    cache.forget(1)
+    assert cache.get(1, "-date", 20) is None
+    assert cache.get(2, "-date", 20) == ([], None)
+    cache.put(3, "-date", 20, ([], None))
+    cache.put(4, "-date", 20, ([], None))
+    assert cache.stats()["evictions"] == 1
+
+
+def location_responder(n_reviews):
+    def respond(sql, params):
+        if "L.name_key IN" in sql:
+            return [{"LID": 7, "exact_name": 1}]
+        if "WHERE L.LID = %s" in sql:
+            return [{"LID": 7, "location_name": "BEH 100", "location_type": "Room", "building_name": "BEH",
+                     "university_name": "U", "campus_name": "Main"}]
+        if "FROM ratings R" in sql:
+            limit = params[-1] if "LIMIT" in sql else n_reviews
+            return [{"RID": rid, "score": 5, "date": None} for rid in range(n_reviews, 0, -1)][:limit]
+        return []
+    return respond
+
+
+def test_location_ratings_pages_with_limit(client, fake_db):
+    fake_db.responder = location_responder(5)
+    body = client.get("/api/locationRatings?location=BEH%20100&university=U&limit=2").get_json()
+
+    assert [r["RID"] for r in body["ratings"]] == [5, 4]
+    assert decode_cursor(body["next_cursor"], 2) == [None, 4]
+    reviews_sql, params = fake_db.executed("FROM ratings R")[0]
+    assert reviews_sql.endswith("ORDER BY R.date DESC, R.RID DESC LIMIT %s") and params == [7, 3]
+
+
+def test_location_ratings_without_limit_sends_every_review(client, fake_db):
+    fake_db.responder = location_responder(5)
+    body = client.get("/api/locationRatings?location=BEH%20100&university=U").get_json()
+    assert len(body["ratings"]) == 5
+    assert "next_cursor" not in body
+
+
+def test_location_ratings_rejects_bad_cursor(client, fake_db):
+    bad = encode_cursor([3, 4])  # a score where a date belongs
+    response = client.get(f"/api/locations/7/ratings?cursor={bad}")
+    assert response.status_code == 400
+    assert fake_db.statements == []
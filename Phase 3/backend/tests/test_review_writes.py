@@ -0,0 +1,63 @@
+import pytest
+
+import review_writes
+
+REVIEW = {"username": "alice", "score": 8, "noise": 2, "cleanliness": 4, "equipment_quality": 2,
+          "wifi_strength": 3, "university": "U"}
+
+
+def locations_responder(*locations):
+    """Answer the addReview lookup as MySQL would for these (LID, name, name_key) locations."""
+    def respond(sql, params):
+        if "FROM users u" not in sql:
+            return []
+        name, _, key, _ = params
+        rows = [{"uid": 1, "role": "Student", "LID": lid, "university_name": "U", "exact_name": int(n == name)}
+                for lid, n, k in locations if k == key]
+        rows.sort(key=lambda row: (-row["exact_name"], row["LID"]))
+        return rows or [{"uid": 1, "role": "Student", "LID": None, "university_name": None, "exact_name": None}]
+    return respond
+
+
+def rating_lids(fake_db):
+    return [params[1] for sql, params in fake_db.statements if sql.startswith("INSERT INTO ratings")]
+
+
+def test_exact_name_wins_over_other_key_matches(client, fake_db):
+    fake_db.responder = locations_responder((3, "BEH 100", "BEH 100"), (4, "BEH - Room 100", "BEH 100"))
+    response = client.post("/api/addReview", json={**REVIEW, "location": "BEH - Room 100"})
+    assert response.status_code == 200
+    assert rating_lids(fake_db) == [4]
+
+
+def test_single_key_match_is_used(client, fake_db):
+    fake_db.responder = locations_responder((4, "BEH - Room 100", "BEH 100"))
+    response = client.post("/api/addReview", json={**REVIEW, "location": "BEH 100"})
+    assert response.status_code == 200
+    assert rating_lids(fake_db) == [4]
+
+
+@pytest.mark.parametrize("name, locations", [
+    # the same name twice (e.g. on two campuses): two exact matches
+    ("Hall - Room 1", [(3, "Hall - Room 1", "Hall 1"), (4, "Hall - Room 1", "Hall 1")]),
+    # the short form of two different names: no exact match, two key matches
+    ("Hall 1", [(3, "Hall - Room 1", "Hall 1"), (4, "Hall 1 ", "Hall 1")]),
+])
+def test_ambiguous_name_is_rejected(client, fake_db, name, locations):
+    fake_db.responder = locations_responder(*locations)
+    response = client.post("/api/addReview", json={**REVIEW, "location": name})
+    assert response.status_code == 409
+    assert response.get_json()["LIDs"] == [3, 4]
+    assert rating_lids(fake_db) == []
+    assert fake_db.commits == 0
+
+
+def test_unknown_location_is_not_found(client, fake_db):
+    fake_db.responder = locations_responder((3, "Hall - Room 1", "Hall 1"))
+    response = client.post("/api/addReview", json={**REVIEW, "location": "Hall 2"})
+    assert response.status_code == 404
+
+
+def test_lookup_by_lid_skips_name_matching():
+    sql = review_writes.lookup_sql(True)
+    assert "L.LID = %s" in sql and "LIMIT 1" in sql and "name_key" not in sql
@@ -0,0 +1,33 @@
+import pytest
+
+from schema_registry import FALLBACK_VALUES, SchemaMismatch, SchemaRegistry
+from conftest import ENUM_ROWS
+
+
+def registry(enum_rows):
+    return SchemaRegistry(lambda: enum_rows[0], lambda: [], check_interval=0)
+
+
+def test_vocabularies_come_from_information_schema():
+    schema = registry([ENUM_ROWS])
+    assert schema.get("equipment_tags") == ["whiteboard", "projector", "computers"]
+    assert schema.get("role") == FALLBACK_VALUES["role"]
+    assert schema.invalid_values("equipment_tags", ["projector", "laser"]) == ["laser"]
+
+
+def test_missing_enum_column_fails_the_first_load():
+    schema = registry([[row for row in ENUM_ROWS if row["COLUMN_NAME"] != "equipment_tag"]])
+    with pytest.raises(SchemaMismatch) as err:
+        schema.invalid_values("equipment_tags", ["projector"])
+    assert err.value.names == ["equipment_tags"]
+
+
+def test_empty_reload_keeps_the_previous_vocabularies():
+    rows = [ENUM_ROWS]
+    schema = registry(rows)
+    version = schema.version if schema.refresh() else None
+
+    rows[0] = []  # e.g. the schema was renamed under the app
+    assert not schema.refresh()
+    assert schema.version == version
+    assert schema.invalid_values("equipment_tags", ["projector"]) == []
@@ -0,0 +1,26 @@
+import json
+
+
+def test_streamed_university_holds_one_connection(app_module, client, fake_db):
+    in_use = []
+
+    def respond(sql, params):
+        if "FROM university" in sql and "wiki_url" in sql:
+            return [{"university_id": 1, "name": "U", "state": "ME", "wiki_url": None}]
+        if "FROM campus" in sql:
+            return [{"campus_name": "Main"}]
+        if "FROM location L" in sql:
+            # Runs inside the streamed body
+            in_use.append(app_module.db_pool.stats()["in_use"])
+            return [{"LID": 1, "location_name": "Hall", "location_type": "Building", "campus_name": "Main",
+                     "building_name": None, "room_number": None, "room_type": None, "room_size": None}]
+        return []
+
+    fake_db.responder = respond
+    response = client.get("/api/university?name=U&state=ME&stream=1")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert lines[0]["university_info"][0]["name"] == "U"
+    assert in_use == [1]
+    assert app_module.db_pool.stats()["in_use"] == 0
@@ -0,0 +1,35 @@
+import bisect
+
+import suggest
+from suggest import UniversitySuggester, _SortedPrefixIndex
+
+UNIVERSITIES = [
+    {"university_id": 1, "name": "University of Southern Maine", "state": "Maine"},
+    {"university_id": 2, "name": "University of Maine", "state": "Maine"},
+    {"university_id": 3, "name": "Southern New Hampshire University", "state": "New Hampshire"},
+]
+
+
+def test_build_matches_one_insert_at_a_time():
+    built = _SortedPrefixIndex.build((row["university_id"], row["name"]) for row in UNIVERSITIES)
+    inserted = _SortedPrefixIndex()
+    for row in reversed(UNIVERSITIES):
+        inserted.add(row["university_id"], row["name"])
+    assert built.names == inserted.names
+    assert built.words == inserted.words
+
+
+def test_load_sorts_once_instead_of_inserting(monkeypatch):
+    inserts = []
+    insort = bisect.insort
+    monkeypatch.setattr(suggest.bisect, "insort", lambda *args: inserts.append(args) or insort(*args))
+    suggester = UniversitySuggester(lambda: UNIVERSITIES)
+    suggester.warm()
+    assert inserts == []
+
+    assert [r["university_id"] for r in suggester.suggest("southern")] == [3, 1]
+    assert [r["university_id"] for r in suggester.suggest("maine", state="maine")] == [1, 2]
+
+    suggester.add(4, "Maine Maritime Academy", "Maine")
+    assert inserts
+    assert [r["university_id"] for r in suggester.suggest("maine", state="Maine")] == [4, 1, 2]
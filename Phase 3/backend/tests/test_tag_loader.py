@@ -0,0 +1,88 @@
+import pytest
+
+from tag_loader import TAG_TABLES, attach_tags, load_tags
+
+
+class CountingCursor:
+    """Counts execute() calls and answers tag queries from a {rid: (equipment, accessibility)} map."""
+
+    def __init__(self, tags):
+        self.tags = tags
+        self.executes = 0
+        self.rows = []
+
+    def execute(self, sql, params):
+        self.executes += 1
+        index = 0 if "rating_equipment" in sql else 1
+        self.rows = [(rid, tag) for rid in params for tag in self.tags.get(rid, ((), ()))[index]]
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+
+def reviews(n):
+    return [{"RID": rid} for rid in range(1, n + 1)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 50, 500])
+def test_query_count_does_not_grow_with_reviews(n):
+    cursor = CountingCursor({rid: (["whiteboard", "projector"], ["elevator_access"]) for rid in range(1, n + 1)})
+    attach_tags(cursor, reviews(n))
+    assert cursor.executes == len(TAG_TABLES)
+
+
+def test_chunks_add_one_query_per_table_per_chunk():
+    cursor = CountingCursor({})
+    load_tags(cursor, range(1, 1001), chunk_size=500)
+    assert cursor.executes == 2 * len(TAG_TABLES)
+
+
+def test_no_reviews_runs_no_queries():
+    cursor = CountingCursor({})
+    assert attach_tags(cursor, []) == []
+    assert cursor.executes == 0
+
+
+def test_tags_are_stitched_onto_their_reviews():
+    cursor = CountingCursor({1: (["projector"], []), 3: ([], ["ramps_available", "elevator_access"])})
+    result = attach_tags(cursor, reviews(3))
+    assert result == [
+        {"RID": 1, "equipment_tags": ["projector"], "accessibility_tags": []},
+        {"RID": 2, "equipment_tags": [], "accessibility_tags": []},
+        {"RID": 3, "equipment_tags": [], "accessibility_tags": ["ramps_available", "elevator_access"]},
+    ]
+
+
+def test_dictionary_rows_are_accepted():
+    class DictCursor(CountingCursor):
+        def fetchall(self):
+            column = "equipment_tag" if self.rows and self.rows[0][1] == "projector" else "accessibility_tag"
+            rows, self.rows = self.rows, []
+            return [{"RID": rid, column: tag} for rid, tag in rows]
+
+    cursor = DictCursor({1: (["projector"], [])})
+    assert attach_tags(cursor, reviews(1))[0]["equipment_tags"] == ["projector"]
+
+
+@pytest.mark.parametrize("n", [1, 40])
+def test_location_ratings_statement_count_is_constant(client, fake_db, n):
+    def respond(sql, params):
+        if "L.name_key IN" in sql:
+            return [{"LID": 7, "exact_name": 1}]
+        if "WHERE L.LID = %s" in sql:
+            return [{"LID": 7, "location_name": "BEH 100", "location_type": "Room", "building_name": "BEH",
+                     "university_name": "U", "campus_name": "Main"}]
+        if "FROM ratings R" in sql:
+            return [{"RID": rid, "user_type": "u", "role": "Student", "user_university": "U", "user_state": "S",
+                     "score": 5, "noise": 1, "cleanliness": 1, "equipment_quality": 1, "wifi_strength": 1,
+                     "comment": ""} for rid in range(1, n + 1)]
+        return []
+
+    fake_db.responder = respond
+    response = client.get("/api/locationRatings?location=BEH%20100&university=U")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["ratings"]) == n
+    # name lookup, location, summary, reviews and one query per tag table, whatever n is
+    assert len(fake_db.statements) == 4 + len(TAG_TABLES)
@@ -0,0 +1,138 @@
+import threading
+
+from text_search import SearchIndexes, TrigramIndex
+
+
+class Tables:
+    """university / location rows behind the index loaders; `gate` holds the location loader."""
+
+    def __init__(self):
+        self.universities = [{"university_id": 1, "name": "University of Southern Maine", "state": "Maine"}]
+        self.locations = [{"LID": 1, "name": "Glickman Library", "university_id": 1}]
+        self.loads = []
+        self.gate = None
+        self.entered = threading.Event()
+        self.fail = False
+
+    def load_universities(self, since):
+        return [row for row in self.universities if row["university_id"] > since]
+
+    def load_locations(self, since):
+        self.loads.append(since)
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("database down")
+        return [row for row in self.locations if row["LID"] > since]
+
+
+def wait_for_refresh():
+    for thread in threading.enumerate():
+        if thread.name == "search-index":
+            thread.join(5)
+
+
+def names(index, query):
+    return set(index.search_locations({1}, query))
+
+
+def test_first_refresh_builds_on_the_request_thread():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations, ttl=300, poll=15)
+    index.refresh_if_stale()
+    assert tables.loads == [0]
+    assert names(index, "glickman") == {1}
+    assert index.search_universities("southern maine")[0]["name"] == "University of Southern Maine"
+
+    index.refresh_if_stale()  # fresh: nothing to do
+    assert tables.loads == [0]
+
+
+def test_stale_index_catches_up_in_the_background():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations, ttl=300, poll=0)
+    index.refresh_if_stale()
+
+    tables.locations.append({"LID": 2, "name": "Abromson Center", "university_id": 1})
+    tables.universities.append({"university_id": 2, "name": "Bowdoin College", "state": "Maine"})
+    tables.gate = threading.Event()
+    index.refresh_if_stale()  # returns while the loader is blocked
+    assert names(index, "glickman") == {1}
+    assert not names(index, "abromson")
+
+    tables.gate.set()
+    wait_for_refresh()
+    assert tables.loads == [0, 1]  # only rows above the highest LID indexed
+    assert names(index, "abromson") == {2}
+    assert index.lookup_university_ids("Bowdoin College") == {2}
+
+
+def test_full_rebuild_after_ttl_drops_deleted_rows():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations, ttl=0, poll=0)
+    index.refresh_if_stale()
+
+    tables.locations = [{"LID": 1, "name": "Sullivan Gym", "university_id": 1}]
+    index.refresh_if_stale()
+    wait_for_refresh()
+    assert tables.loads == [0, 0]
+    assert names(index, "sullivan") == {1}
+    assert not names(index, "glickman")
+
+
+def test_failed_refresh_keeps_serving_the_previous_index():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations, ttl=0, poll=0)
+    index.refresh_if_stale()
+
+    tables.fail = True
+    index.refresh_if_stale()
+    wait_for_refresh()
+    assert names(index, "glickman") == {1}
+
+
+def test_patches_made_during_a_rebuild_survive_it():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations, ttl=0, poll=0)
+    index.refresh_if_stale()
+
+    tables.gate = threading.Event()
+    tables.entered.clear()
+    index.refresh_if_stale()
+    assert tables.entered.wait(5)
+    # The rebuild has loaded the old university list; the admin endpoints change it meanwhile
+    index.add_university(3, "Maine College of Art", "Maine")
+    index.remove_university(1)
+    tables.gate.set()
+    wait_for_refresh()
+
+    assert index.lookup_university_ids("Maine College of Art") == {3}
+    assert index.lookup_university_ids("University of Southern Maine") == set()
+    assert index.search_locations({1}, "glickman") == {}
+
+
+def test_location_patches_never_mutate_an_index_readers_hold():
+    tables = Tables()
+    index = SearchIndexes(tables.load_universities, tables.load_locations)
+    index.refresh_if_stale()
+
+    held = index.locations[1]
+    index.add_location(1, 5, "Woodbury Campus Center")
+    assert names(index, "woodbury") == {5}
+    assert len(held) == 1
+
+    index.remove_location(1, 1)
+    assert not names(index, "glickman")
+    index.add_location(2, 6, "Hawthorne Hall")
+    assert set(index.search_locations({2}, "hawthorne")) == {6}
+
+
+def test_trigram_index_copy_is_independent():
+    original = TrigramIndex()
+    original.add(1, "Glickman Library")
+    clone = original.copy()
+    clone.add(2, "Glickman Annex")
+    clone.remove(1)
+    assert [doc for doc, _, _ in original.search("glickman")] == [1]
+    assert [doc for doc, _, _ in clone.search("glickman")] == [2]
@@ -0,0 +1,327 @@
+"""
+In-process trigram search for university and location names.
+
+`LIKE '%q%'` cannot use a B-tree index, so every search keystroke scanned the
+whole table. Instead we keep a trigram index of the names in memory: a query
+is split into trigrams, candidate documents are those sharing trigrams with it,
+and candidates are ranked by how much of the query they cover (so prefixes and
+names with a typo or two still match), with bonuses for prefix and substring
+matches.
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+log = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse everything that is not a letter or digit."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(normalized, partial_last=False):
+    """
+    Word trigrams padded as "  word " so word starts and ends get their own grams.
+
+    With partial_last the final word is not end-padded, because while the user is
+    still typing it is only a prefix.
+    """
+    words = normalized.split()
+    grams = set()
+    for i, word in enumerate(words):
+        tail = "" if partial_last and i == len(words) - 1 else " "
+        padded = f"  {word}{tail}"
+        for j in range(len(padded) - 2):
+            grams.add(padded[j:j + 3])
+    return grams
+
+
+class TrigramIndex:
+    """Trigram postings for a set of (doc_id, text, payload) documents."""
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._docs = {}  # doc_id -> (normalized text, trigram set, payload)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def copy(self):
+        """An independent index with the same documents (patch the copy, then swap it in)."""
+        clone = TrigramIndex()
+        clone._postings = defaultdict(set, {gram: set(ids) for gram, ids in self._postings.items()})
+        clone._docs = dict(self._docs)
+        return clone
+
+    def add(self, doc_id, text, payload=None):
+        self.remove(doc_id)
+        norm = normalize(text)
+        grams = trigrams(norm)
+        self._docs[doc_id] = (norm, grams, payload)
+        for gram in grams:
+            self._postings[gram].add(doc_id)
+
+    def remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for gram in doc[1]:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, query, limit=20, where=None, min_coverage=0.5):
+        """
+        Return up to `limit` (doc_id, payload, score) tuples, best first.
+
+        where        -- optional predicate on the payload (e.g. a state filter)
+        min_coverage -- fraction of the query's trigrams a name must contain
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        q_grams = trigrams(q, partial_last=True)
+        postings = self._postings
+        # Counting over the chained postings runs in C (Counter fast path)
+        hits = Counter(chain.from_iterable(postings[g] for g in q_grams if g in postings))
+        need = min_coverage * len(q_grams)
+
+        # Queries this short have almost no trigrams, so also catch plain substrings
+        if len(q) < 3:
+            for doc_id, (norm, _, _) in self._docs.items():
+                if doc_id not in hits and q in norm:
+                    hits[doc_id] = need
+
+        scored = []
+        docs = self._docs
+        for doc_id, shared in hits.items():
+            if shared < need:
+                continue
+            norm, grams, payload = docs[doc_id]
+            if where is not None and not where(payload):
+                continue
+
+            score = shared / len(q_grams)
+            if norm.startswith(q):
+                score += 0.5
+            elif q in norm:
+                score += 0.25
+            # Among equally good matches prefer the tighter (shorter) name
+            score += 0.1 * shared / len(grams) if grams else 0
+            scored.append((score, doc_id, payload))
+
+        best = heapq.nlargest(limit, scored, key=lambda t: t[0])
+        return [(doc_id, payload, round(score, 4)) for score, doc_id, payload in best]
+
+
+class SearchIndexes:
+    """
+    University and per-university location indexes, loaded lazily from MySQL.
+
+    The first search builds the indexes on the request thread; after that they
+    are refreshed by a background thread while requests keep searching the
+    current ones. Every `poll` seconds rows with an ID above the highest one
+    indexed are added (the loader scripts and stored procedures insert with
+    increasing IDs), and every `ttl` seconds everything is rebuilt so renames
+    and deletes show up too. The admin endpoints patch the indexes directly.
+
+    Readers never lock: every change builds new structures (patching copies of
+    the affected indexes) and swaps them in.
+    """
+
+    def __init__(self, load_universities, load_locations, ttl=300, poll=15):
+        # load_*(since) -> rows with an ID above `since`
+        self._load_universities = load_universities
+        self._load_locations = load_locations
+        self.ttl = ttl
+        self.poll = poll
+        self._lock = threading.Lock()        # guards swaps and patches
+        self._build_lock = threading.Lock()  # one full build at a time
+        self._built_at = None
+        self._checked_at = None
+        self._refreshing = False
+        self._pending = None  # patches made while a rebuild is loading, replayed on top of it
+        self._max_university_id = 0
+        self._max_lid = 0
+
+        self.universities = TrigramIndex()
+        self.locations = {}                         # university_id -> index
+        self.university_ids = defaultdict(set)      # lowercased name -> {university_id}
+        self._university_keys = {}                  # university_id -> (name, state)
+
+    def refresh_if_stale(self):
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.poll and now - self._built_at < self.ttl:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="search-index", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            if time.monotonic() - self._built_at >= self.ttl:
+                self.rebuild()
+            else:
+                self.catch_up()
+        except Exception:
+            log.exception("search index refresh failed; serving the previous index")
+        finally:
+            self._checked_at = time.monotonic()
+            self._refreshing = False
+
+    def rebuild(self):
+        with self._build_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        with self._lock:
+            self._pending = []
+        try:
+            universities = TrigramIndex()
+            university_ids = defaultdict(set)
+            university_keys = {}
+            for row in self._load_universities(0):
+                self._index_university(universities, university_ids, university_keys, row)
+
+            locations = defaultdict(TrigramIndex)
+            for row in self._load_locations(0):
+                locations[row["university_id"]].add(row["LID"], row["name"])
+
+            # Swap in whole structures so readers never see a half-built index
+            with self._lock:
+                self.universities = universities
+                self.university_ids = university_ids
+                self._university_keys = university_keys
+                self.locations = dict(locations)
+                self._max_university_id = max(university_keys, default=0)
+                self._max_lid = max((lid for index in locations.values() for lid in index._docs), default=0)
+                for patch in self._pending:
+                    patch()
+                self._built_at = self._checked_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def catch_up(self):
+        """Index the universities and locations inserted since the last build or catch-up."""
+        universities = self._load_universities(self._max_university_id)
+        locations = self._load_locations(self._max_lid)
+        if universities:
+            self._patch(lambda: self._add_universities(universities))
+        if locations:
+            self._patch(lambda: self._add_locations(locations))
+
+    @staticmethod
+    def _index_university(index, ids, keys, row):
+        index.add(row["university_id"], row["name"], {"name": row["name"], "state": row["state"]})
+        key = row["name"].lower()
+        ids[key] = ids[key] | {row["university_id"]}  # never mutate a set readers may hold
+        keys[row["university_id"]] = (row["name"], row["state"])
+
+    # ------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------
+    def _patch(self, patch):
+        with self._lock:
+            patch()
+            if self._pending is not None:
+                self._pending.append(patch)
+
+    def _add_universities(self, rows):
+        universities = self.universities.copy()
+        ids = defaultdict(set, self.university_ids)
+        keys = dict(self._university_keys)
+        for row in rows:
+            self._index_university(universities, ids, keys, row)
+        self.universities, self.university_ids, self._university_keys = universities, ids, keys
+        self._max_university_id = max(self._max_university_id, *(row["university_id"] for row in rows))
+
+    def _add_locations(self, rows):
+        locations = dict(self.locations)
+        copied = set()
+        for row in rows:
+            uni_id = row["university_id"]
+            if uni_id not in copied:
+                locations[uni_id] = locations[uni_id].copy() if uni_id in locations else TrigramIndex()
+                copied.add(uni_id)
+            locations[uni_id].add(row["LID"], row["name"])
+        self.locations = locations
+        self._max_lid = max(self._max_lid, *(row["LID"] for row in rows))
+
+    def add_university(self, university_id, name, state):
+        row = {"university_id": university_id, "name": name, "state": state}
+        self._patch(lambda: self._add_universities([row]))
+
+    def remove_university(self, university_id):
+        def patch():
+            universities = self.universities.copy()
+            universities.remove(university_id)
+            ids = defaultdict(set, self.university_ids)
+            keys = dict(self._university_keys)
+            key = keys.pop(university_id, None)
+            if key is not None:
+                ids[key[0].lower()] = ids[key[0].lower()] - {university_id}
+            locations = dict(self.locations)
+            locations.pop(university_id, None)
+            self.universities, self.university_ids, self._university_keys = universities, ids, keys
+            self.locations = locations
+        self._patch(patch)
+
+    def add_location(self, university_id, lid, name):
+        self._patch(lambda: self._add_locations([{"university_id": university_id, "LID": lid, "name": name}]))
+
+    def remove_location(self, university_id, lid):
+        def patch():
+            if university_id in self.locations:
+                index = self.locations[university_id].copy()
+                index.remove(lid)
+                self.locations = {**self.locations, university_id: index}
+        self._patch(patch)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def search_universities(self, query, state="", limit=20):
+        where = None
+        if state:
+            state = state.lower()
+            where = lambda p: state in p["state"].lower()
+        return [payload for _, payload, _ in self.universities.search(query, limit=limit, where=where)]
+
+    def lookup_university_ids(self, name, state=""):
+        """IDs of the universities called `name` (optionally only in `state`)."""
+        ids = self.university_ids.get(name.lower(), set())
+        if state:
+            ids = {uid for uid in ids if self._university_keys[uid][1].lower() == state.lower()}
+        return ids
+
+    def search_locations(self, university_ids, query, limit=1000):
+        """Return {LID: score} for the best matching locations of the given universities."""
+        matches = {}
+        for uni_id in university_ids:
+            index = self.locations.get(uni_id)
+            if index is None:
+                continue
+            for lid, _, score in index.search(query, limit=limit):
+                matches[lid] = score
+        return matches
@@ -0,0 +1,353 @@
+"""
+Endpoint latency benchmark with JSON baselines and a regression check.
+
+Drives every read and write endpoint of the API against a running server:
+
+  reads   /api/search, /api/university, /api/locationSearch (one case per
+          filter combination of location_query_plans.py), /api/reviews,
+          /api/locationRatings, /api/locations/<lid>/ratings and
+          /api/locations/<lid>/reviews
+  writes  /api/register, /api/addReview and /api/request-room
+
+Every case sends a fixed number of requests at each concurrency level and
+reports p50/p95/p99 latency, throughput and SQL statements per request (read
+from the Server-Timing header). GETs carry a unique `_bench` arg so the
+response cache doesn't answer them (--allow-cache to leave it on).
+
+The university, its busiest location and a building are discovered through
+the API, so the same run works on the real data or on any data set from
+generate_dataset.py. Writes add users, reviews and room requests, so point it
+at a throwaway database (or pass --skip-writes).
+
+Run it once per data set size and keep the results as baselines:
+    python generate_dataset.py --scale 1 --mysql
+    python endpoint_bench.py --dataset sf1 --university "..." --state "..." --save baselines/sf1.json
+
+and after a change, compare against them (exit status 1 on a regression):
+    python endpoint_bench.py --dataset sf1 --university "..." --state "..." --compare baselines/sf1.json
+"""
+import argparse
+import datetime
+import http.client
+import itertools
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from location_query_plans import CASES as SEARCH_CASES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries')
+
+
+# ============================================================
+# Cases
+# ============================================================
+class Case:
+    """
+    One endpoint call. request(n) returns (method, path, JSON body or None)
+    for the n-th request; on_success(n, response body) records what later
+    cases depend on (registered users).
+    """
+
+    def __init__(self, name, request, write=False, on_success=None):
+        self.name = name
+        self.request = request
+        self.write = write
+        self.on_success = on_success
+
+
+def get(path, args):
+    return "GET", f"{path}?{urlencode(args, doseq=True)}", None
+
+
+def discover(base_url, university, state):
+    """University fixtures: every distinct location name, the most reviewed one and a building."""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    conn.request("GET", "/api/university?" + urlencode({"name": university, "state": state}))
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    if response.status != 200:
+        sys.exit(f"Could not load {university} ({state}): {body}")
+
+    locations = body["locations"]
+    names = list(dict.fromkeys(loc["unformatted_name"] for loc in locations))
+    busiest = max(locations, key=lambda loc: (loc["rating_summary"] or {}).get("count", 0))
+    building = next((loc for loc in locations if loc["location_type"] == "Building"), None)
+    return {
+        "university": university,
+        "state": state,
+        "names": names,
+        "hot": busiest["unformatted_name"],
+        "hot_lid": busiest.get("LID"),
+        "building": building,
+        "query": busiest["unformatted_name"].split()[0],
+    }
+
+
+def build_cases(fixtures, run_id):
+    uni, state = fixtures["university"], fixtures["state"]
+    hot = fixtures["hot"]
+    users = []  # usernames registered by the register case, in order
+    cases = [
+        Case("search", lambda n: get("/api/search", {"q": uni[: 4 + n % 8]})),
+        Case("university", lambda n: get("/api/university", {"name": uni, "state": state})),
+        Case("university page", lambda n: get("/api/university", {"name": uni, "state": state, "limit": 50,
+                                                                  "includeTotal": 1})),
+    ]
+    for label, (extra, lids) in SEARCH_CASES.items():
+        args = {"university": uni, "state": state, **extra}
+        if lids is not None:
+            args["q"] = fixtures["query"]
+        cases.append(Case(f"locationSearch: {label}", lambda n, args=args: get("/api/locationSearch", args)))
+    cases += [
+        Case("reviews (busiest)", lambda n: get("/api/reviews", {"location": hot, "university": uni})),
+        Case("reviews page (busiest)", lambda n: get("/api/reviews", {"location": hot, "university": uni,
+                                                                     "limit": 20, "sort": "-score"})),
+        Case("locationRatings (busiest)", lambda n: get("/api/locationRatings", {"location": hot, "university": uni})),
+    ]
+    if fixtures["hot_lid"] is not None:
+        cases.append(Case("locations/<lid>/ratings (busiest)",
+                          lambda n: get(f"/api/locations/{fixtures['hot_lid']}/ratings", {})))
+        cases.append(Case("locations/<lid>/reviews (busiest, first page)",
+                          lambda n: get(f"/api/locations/{fixtures['hot_lid']}/reviews", {})))
+
+    # Writes: register creates the users that addReview and request-room use.
+    # Review n pairs user n % len(users) with location n // len(users), so no
+    # (user, location) pair is rated twice.
+    def register(n):
+        return "POST", "/api/register", {"username": f"bench_{run_id}_{n}", "password": "benchmark",
+                                         "role": "Student", "university": uni, "state": state}
+
+    def registered(n, body):
+        users.append(f"bench_{run_id}_{n}")
+
+    def add_review(n):
+        user = users[n % len(users)]
+        location = fixtures["names"][(n // len(users)) % len(fixtures["names"])]
+        return "POST", "/api/addReview", {
+            "username": user, "location": location, "university": uni, "score": 1 + n % 10,
+            "noise": 1 + n % 5, "cleanliness": 1 + n % 5, "equipment_quality": 1 + n % 3,
+            "wifi_strength": 1 + n % 3, "comment": "benchmark review",
+            "equipment_tags": ["whiteboard", "projector"], "accessibility_tags": ["elevator_access"],
+        }
+
+    def request_room(n):
+        building = fixtures["building"]
+        return "POST", "/api/request-room", {
+            "room_name": f"Bench Room {run_id}-{n}", "university_name": uni, "state": state,
+            "campus_name": building["campus_name"], "building_name": building["unformatted_name"],
+            "requested_by_username": users[n % len(users)],
+        }
+
+    cases += [
+        Case("register", register, write=True, on_success=registered),
+        Case("addReview", add_review, write=True),
+    ]
+    if fixtures["building"] is not None:
+        cases.append(Case("request-room", request_room, write=True))
+    return cases
+
+
+# ============================================================
+# Runner
+# ============================================================
+def run_case(base_url, case, concurrency, requests, first, allow_cache):
+    """Send requests n = first .. first + requests - 1 from `concurrency` keep-alive connections."""
+    parts = urlsplit(base_url)
+    numbers = iter(range(first, first + requests))
+    lock = threading.Lock()
+    latencies = []
+    queries = []
+    errors = {}
+
+    def connect():
+        return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+
+    def user():
+        conn = connect()
+        while True:
+            with lock:
+                n = next(numbers, None)
+            if n is None:
+                break
+            method, path, body = case.request(n)
+            headers = {}
+            if body is not None:
+                body = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            elif not allow_cache:
+                path += f"&_bench={n}"
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as err:
+                status = type(err).__name__
+                conn.close()
+                conn = connect()
+            elapsed = (time.perf_counter() - start) * 1000
+
+            with lock:
+                if status in (200, 201):
+                    latencies.append(elapsed)
+                    match = SERVER_TIMING_QUERIES.search(response.getheader("Server-Timing", ""))
+                    if match:
+                        queries.append(int(match.group(1)))
+                    if case.on_success:
+                        case.on_success(n, payload)
+                else:
+                    errors[status] = errors.get(status, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=user) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2) if latencies else None
+
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": {str(k): v for k, v in errors.items()},
+        "req_per_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "queries": round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================
+# Baseline comparison
+# ============================================================
+def compare(baseline, current, threshold, min_delta_ms):
+    """
+    Regressions of current against baseline, per case and concurrency level:
+    p95 slower by more than threshold (and min_delta_ms), throughput lower by
+    more than threshold, or more SQL statements per request.
+    """
+    regressions = []
+    print(f"\n{'case':<40}{'users':>6}{'p95 ms':>18}{'req/s':>18}{'queries':>12}")
+    for name, rows in current["results"].items():
+        before = {row["concurrency"]: row for row in baseline["results"].get(name, [])}
+        for row in rows:
+            old = before.get(row["concurrency"])
+            if old is None or not old["ok"] or not row["ok"]:
+                continue
+            problems = []
+            if (row["p95_ms"] > old["p95_ms"] * (1 + threshold)
+                    and row["p95_ms"] - old["p95_ms"] > min_delta_ms):
+                problems.append("p95")
+            if row["req_per_s"] < old["req_per_s"] * (1 - threshold):
+                problems.append("throughput")
+            if row["queries"] is not None and old["queries"] is not None and row["queries"] > old["queries"] + 0.5:
+                problems.append("queries")
+            print(f"{name:<40}{row['concurrency']:>6}"
+                  f"{old['p95_ms']:>9} -> {row['p95_ms']!s:<6}{old['req_per_s']:>9} -> {row['req_per_s']!s:<6}"
+                  f"{old['queries']!s:>5} -> {row['queries']!s:<4}{'  REGRESSION: ' + ', '.join(problems) if problems else ''}")
+            if problems:
+                regressions.append((name, row["concurrency"], problems))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--university", default="University of Southern Maine")
+    parser.add_argument("--state", default="Maine")
+    parser.add_argument("--dataset", default="real", help="label of the data set the server runs on")
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per case and level")
+    parser.add_argument("--warmup", type=int, default=10, help="unrecorded requests per case")
+    parser.add_argument("--cases", help="only run cases whose name matches this regex")
+    parser.add_argument("--skip-writes", action="store_true")
+    parser.add_argument("--allow-cache", action="store_true", help="don't bust the response cache")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    fixtures = discover(args.url, args.university, args.state)
+    run_id = format(int(time.time()), "x")
+    all_cases = build_cases(fixtures, run_id)
+    cases = [c for c in all_cases
+             if not (c.write and args.skip_writes) and (not args.cases or re.search(args.cases, c.name))]
+    if any(c.write for c in cases) and not any(c.name == "register" for c in cases):
+        # addReview and request-room write as the users register creates
+        cases.insert(0, next(c for c in all_cases if c.name == "register"))
+
+    results = {
+        "meta": {
+            "dataset": args.dataset,
+            "url": args.url,
+            "university": args.university,
+            "revision": git_revision(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "concurrency": levels,
+            "requests": args.requests,
+            "allow_cache": args.allow_cache,
+        },
+        "results": {},
+    }
+
+    print(f"{'case':<40}{'users':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}  errors")
+    numbers = itertools.count(step=args.warmup + args.requests)
+    for case in cases:
+        results["results"][case.name] = []
+        for concurrency in levels:
+            first = next(numbers)
+            if args.warmup:
+                run_case(args.url, case, min(concurrency, args.warmup), args.warmup, first, args.allow_cache)
+            row = run_case(args.url, case, concurrency, args.requests, first + args.warmup, args.allow_cache)
+            results["results"][case.name].append(row)
+            print(f"{case.name:<40}{concurrency:>6}{row['req_per_s']:>9}{row['p50_ms']!s:>9}{row['p95_ms']!s:>9}"
+                  f"{row['p99_ms']!s:>9}{row['queries']!s:>9}  {row['errors'] or '-'}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["dataset"] != args.dataset:
+            sys.exit(f"Baseline is for data set {baseline['meta']['dataset']!r}, not {args.dataset!r}")
+        regressions = compare(baseline, results, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare} (revision {baseline['meta']['revision']})")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+"""
+Seeded synthetic data set for campus_insider, sized by a scale factor.
+
+The only real data is USM (about 1.3k rooms) and the college list, which is
+too small to tell whether a query or index holds up. This generates
+universities, campuses, buildings, rooms, nonbuildings, users, ratings and
+rating tags with the skew real traffic has:
+
+  * universities differ in size (Zipf), and so do buildings (a few big halls
+    hold most of the rooms)
+  * location popularity within a university is Zipfian, so a handful of
+    rooms collect most of the reviews
+  * user activity is heavy-tailed (most users write a few reviews, some
+    write hundreds)
+  * review dates bunch around the academic calendar (start of term,
+    midterms, finals) instead of being spread evenly
+  * scores and sub-ratings are correlated per location
+
+Scale factor 1 is about 10 universities, 13k locations, 5k users, 90k
+ratings and 190k tag rows; everything grows linearly. The same --seed and
+--scale always produce the same rows (without --mysql the script only
+generates them and prints the row counts and a digest to check that).
+
+Every FK, UNIQUE and CHECK constraint of "Combined Campus Insider.sql" is
+respected; ENUM and CHECK vocabularies are read from that file. IDs are
+assigned explicitly, above the current maximum of each table, so the rows
+can be loaded next to existing data with multi-row INSERTs and FK / unique
+checks switched off for the session (--checks keeps them on). Location rows
+carry their location_type / building_LID / building_name, so the per-row
+SyncLocationType triggers are skipped for the session too. The rating
+summaries are rebuilt afterwards.
+
+    python generate_dataset.py --scale 1 --seed 42            # dry run
+    python generate_dataset.py --scale 10 --seed 42 --mysql   # load into the .env database
+
+Synthetic users can log in with the password "synthetic".
+"""
+import argparse
+import datetime
+import hashlib
+import itertools
+import os
+import random
+import re
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(HERE, "..", "..", "Phase 2", "schema-implementation", "Combined Campus Insider.sql")
+
+# Rows per unit of scale
+UNIVERSITIES = 10
+LOCATIONS = 13000
+USERS = 5000
+REVIEWS_PER_USER = 20        # mean; heavy-tailed
+MAX_REVIEWS_PER_USER = 300
+
+UNIVERSITY_SKEW = 0.8        # Zipf exponents
+BUILDING_SKEW = 0.7
+LOCATION_SKEW = 1.07
+TAG_SKEW = 1.0
+
+HOME_UNIVERSITY_SHARE = 0.9  # reviews written about the user's own university
+BURST_SHARE = 0.65           # reviews dated around an academic-calendar burst
+BURST_DAYS = 4               # mean distance from the burst date
+COMMENT_SHARE = 0.35
+
+# bcrypt of "synthetic" (cost 10); hashing per user would dominate the run
+PASSWORD_HASH = "$2b$10$YvqX2kDcHuUZReGL6fLpLOalSQYdmCNkFy06nmlYsLSfOEOH4/IFy"
+
+# Insert order; parents before children
+TABLES = {
+    "university": ("university_id", "name", "state", "wiki_url"),
+    "campus": ("campus_name", "university_id"),
+    "location": ("LID", "name", "campus_name", "university_id", "location_type", "building_LID", "building_name"),
+    "buildings": ("LID",),
+    "nonbuildings": ("LID", "description"),
+    "rooms": ("LID", "building_LID", "room_number", "room_type", "room_size"),
+    "users": ("uid", "username", "password", "university_id", "role"),
+    "ratings": ("RID", "score", "date", "noise", "cleanliness", "equipment_quality", "wifi_strength",
+                "extra_comments", "UID", "LID"),
+    "rating_equipment": ("RID", "equipment_tag"),
+    "rating_accessibility": ("RID", "accessibility_tag"),
+}
+
+# (month, day) of the yearly review bursts: term start, midterms, finals
+BURSTS = [(1, 20), (3, 10), (5, 5), (9, 5), (10, 15), (12, 10)]
+
+STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+    "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+    "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+    "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+    "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming",
+]
+PLACES = [
+    "Ashford", "Bayview", "Bramble", "Cedar Falls", "Clearwater", "Eastbrook", "Fairhaven", "Glenwood",
+    "Granite Hill", "Harborview", "Highland", "Kingsbridge", "Lakeshore", "Maple Ridge", "Millbrook",
+    "Northfield", "Oakmont", "Pinecrest", "Riverside", "Rockport", "Silver Lake", "Southport",
+    "Stonebridge", "Westbrook", "Willow Creek", "Winterhaven",
+]
+KINDS = ["University", "State University", "College", "Institute of Technology", "Community College"]
+CAMPUSES = ["Main", "North", "South", "East", "West", "Downtown", "Riverside", "Medical"]
+NAMESAKES = [
+    "Abbott", "Baxter", "Bennett", "Carver", "Dalton", "Ellis", "Fletcher", "Garrison", "Hale",
+    "Hastings", "Irving", "Jensen", "Keller", "Lawson", "Merrill", "Nolan", "Osborne", "Porter",
+    "Quincy", "Reed", "Sawyer", "Thornton", "Upton", "Vance", "Whitman", "York",
+]
+BUILDING_KINDS = ["Hall", "Library", "Science Center", "Student Center", "Arts Center", "Gymnasium",
+                  "Engineering Building", "Commons", "Annex", "Tower"]
+OUTDOOR = ["Quad", "Green", "Courtyard", "Garden", "Parking Lot", "Athletic Field", "Plaza", "Amphitheater"]
+ROOM_TYPE_WEIGHTS = {
+    "classroom": 45, "study room": 15, "meeting room": 10, "computer room": 8, "science lab": 8,
+    "facility": 8, "store": 3, "venue": 3,
+}
+ROOM_SIZE_WEIGHTS = {"small": 35, "medium": 45, "large": 20}
+ROLE_WEIGHTS = {"Student": 80, "Faculty": 12, "Visitor": 8}
+COMMENT_OPENINGS = [
+    "Great spot to study.", "Pretty quiet most of the day.", "Gets crowded around finals.",
+    "Chairs are uncomfortable.", "Wifi drops out in the back.", "Good natural light.",
+    "Not enough outlets.", "Clean and well kept.", "Projector is hit or miss.", "Hard to find the first time.",
+]
+COMMENT_DETAILS = [
+    "Would come back.", "Best in the mornings.", "Avoid it after 2pm.", "Bring headphones.",
+    "Staff are helpful.", "The heating is always on full.", "Usually easy to get a seat.", "",
+]
+
+
+# ============================================================
+# Vocabularies from the schema file
+# ============================================================
+def schema_vocabularies(path=SCHEMA_FILE):
+    """ENUM values per column name and the users.role CHECK list, parsed from the schema DDL."""
+    with open(path, "r", encoding="utf-8") as f:
+        ddl = f.read()
+    vocab = {
+        column: re.findall(r"'([^']*)'", body)
+        for column, body in re.findall(r"(\w+)\s+ENUM\s*\(([^)]*)\)", ddl)
+    }
+    vocab["role"] = re.findall(r"'([^']*)'", re.search(r"role\s+IN\s*\(([^)]*)\)", ddl).group(1))
+    return vocab
+
+
+def weighted(values, weights):
+    """(values, weights) restricted to the values the schema allows."""
+    kept = [v for v in values if v in weights]
+    return kept, [weights[v] for v in kept]
+
+
+def zipf_cum_weights(n, skew):
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+# ============================================================
+# Generator
+# ============================================================
+class DatasetGenerator:
+    """
+    scale     -- scale factor (1 = about 310k rows)
+    seed      -- RNG seed; same seed and scale give the same rows
+    start_ids -- current maximum university_id / LID / uid / RID (0 for an empty database)
+    taken     -- (name, state) pairs already in the university table
+    """
+
+    def __init__(self, scale=1.0, seed=42, start_ids=None, taken=(), end=datetime.date(2025, 12, 15), years=4):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.start_ids = {"university": 0, "location": 0, "users": 0, "ratings": 0, **(start_ids or {})}
+        self.taken = set(taken)
+        self.end = end
+        self.start = end - datetime.timedelta(days=365 * years)
+        self.vocab = schema_vocabularies()
+        self.room_types = weighted(self.vocab["room_type"], ROOM_TYPE_WEIGHTS)
+        self.room_sizes = weighted(self.vocab["room_size"], ROOM_SIZE_WEIGHTS)
+        self.roles = weighted(self.vocab["role"], ROLE_WEIGHTS)
+        self.universities = []  # (university_id, LIDs by popularity, cum weights, {LID: quality})
+
+    # --------------------------------------------------------
+    # Helpers
+    # --------------------------------------------------------
+    def _distinct(self, population, cum_weights, k):
+        """k distinct picks from a Zipf-weighted population (k is small next to it)."""
+        picked = set()
+        while len(picked) < k:
+            picked.update(self.rng.choices(population, cum_weights=cum_weights, k=k - len(picked)))
+        return picked
+
+    def _split(self, total, n, skew, minimum):
+        weights = [1 / (rank ** skew) for rank in range(1, n + 1)]
+        scale = total / sum(weights)
+        return [max(minimum, round(w * scale)) for w in weights]
+
+    def _review_date(self):
+        rng = self.rng
+        if rng.random() < BURST_SHARE:
+            month, day = rng.choice(BURSTS)
+            burst = datetime.date(rng.randint(self.start.year, self.end.year), month, day)
+            date = burst + datetime.timedelta(days=round(rng.expovariate(1 / BURST_DAYS)))
+        else:
+            date = self.start + datetime.timedelta(days=rng.randrange((self.end - self.start).days + 1))
+        return min(max(date, self.start), self.end)
+
+    def _university_name(self, index):
+        rng = self.rng
+        for attempt in itertools.count():
+            name = f"{rng.choice(PLACES)} {rng.choice(KINDS)}"
+            if attempt:
+                name += f" {index + attempt}"
+            state = rng.choice(STATES)
+            if (name, state) not in self.taken:
+                self.taken.add((name, state))
+                return name, state
+
+    # --------------------------------------------------------
+    # Tables
+    # --------------------------------------------------------
+    def generate(self, sink):
+        """Feed every row to sink.add(table, row), in insert order per table."""
+        self._locations(sink)
+        self._users_and_ratings(sink)
+
+    def _locations(self, sink):
+        rng = self.rng
+        n_unis = max(1, round(UNIVERSITIES * self.scale))
+        sizes = self._split(LOCATIONS * self.scale, n_unis, UNIVERSITY_SKEW, 60)
+        rng.shuffle(sizes)
+        lid = self.start_ids["location"]
+
+        for index, size in enumerate(sizes):
+            uni_id = self.start_ids["university"] + index + 1
+            name, state = self._university_name(index)
+            sink.add("university", (uni_id, name, state, None))
+
+            campuses = rng.sample(CAMPUSES, min(len(CAMPUSES), 1 + int(rng.expovariate(1.2))))
+            for campus in campuses:
+                sink.add("campus", (campus, uni_id))
+
+            n_buildings = max(2, round(size * 0.04))
+            n_outdoor = max(1, round(size * 0.03))
+            n_rooms = max(1, size - n_buildings - n_outdoor)
+            lids = []
+
+            buildings = []  # (LID, campus, floors, name)
+            names = set()
+            for _ in range(n_buildings):
+                lid += 1
+                campus = campuses[min(len(campuses) - 1, int(rng.expovariate(1.5)))]
+                building = f"{rng.choice(NAMESAKES)} {rng.choice(BUILDING_KINDS)}"
+                while building in names:
+                    building = f"{rng.choice(NAMESAKES)} {rng.choice(NAMESAKES)} {rng.choice(BUILDING_KINDS)}"
+                names.add(building)
+                sink.add("location", (lid, building, campus, uni_id, "Building", None, None))
+                sink.add("buildings", (lid,))
+                buildings.append((lid, campus, rng.randint(1, 6), building))
+                lids.append(lid)
+
+            for i in range(n_outdoor):
+                lid += 1
+                campus = rng.choice(campuses)
+                place = f"{rng.choice(NAMESAKES)} {rng.choice(OUTDOOR)}"
+                sink.add("location", (lid, place, campus, uni_id, "Non-building", None, None))
+                sink.add("nonbuildings", (lid, f"Outdoor space on the {campus} campus."))
+                lids.append(lid)
+
+            # Rooms: a few big buildings hold most of them
+            rng.shuffle(buildings)
+            cum = zipf_cum_weights(len(buildings), BUILDING_SKEW)
+            next_number = {}  # (building LID, floor) -> next room number
+            study_rooms = {}  # building LID -> count
+            for building_lid, campus, floors, building in rng.choices(buildings, cum_weights=cum, k=n_rooms):
+                lid += 1
+                room_type = rng.choices(*self.room_types)[0]
+                room_size = rng.choices(*self.room_sizes)[0]
+                if room_type == "study room" and rng.random() < 0.5:
+                    study_rooms[building_lid] = study_rooms.get(building_lid, 0) + 1
+                    room_name, room_number = f"Study Room {study_rooms[building_lid]}", None
+                else:
+                    floor = rng.randint(0, floors)
+                    number = next_number.get((building_lid, floor), 1)
+                    next_number[(building_lid, floor)] = number + 1
+                    room_number = f"{floor}{number:02d}"
+                    room_name = f"Room {room_number}"
+                sink.add("location", (lid, room_name, campus, uni_id, "Room", building_lid, building))
+                sink.add("rooms", (lid, building_lid, room_number, room_type, room_size))
+                lids.append(lid)
+
+            # Popularity order and per-location quality (drives correlated ratings)
+            rng.shuffle(lids)
+            quality = {l: (rng.gauss(0, 1), rng.gauss(0, 1), rng.gauss(0, 1)) for l in lids}
+            self.universities.append((uni_id, lids, zipf_cum_weights(len(lids), LOCATION_SKEW), quality))
+
+    def _users_and_ratings(self, sink):
+        rng = self.rng
+        uni_ids = list(range(len(self.universities)))
+        uni_cum = list(itertools.accumulate(len(lids) for _, lids, _, _ in self.universities))
+        equipment = list(self.vocab["equipment_tag"])
+        accessibility = list(self.vocab["accessibility_tag"])
+        rng.shuffle(equipment)
+        rng.shuffle(accessibility)
+        equipment_cum = zipf_cum_weights(len(equipment), TAG_SKEW)
+        accessibility_cum = zipf_cum_weights(len(accessibility), TAG_SKEW)
+        # paretovariate(1.5) has mean 3
+        review_scale = REVIEWS_PER_USER / 3
+
+        rid = self.start_ids["ratings"]
+        for uid in range(self.start_ids["users"] + 1, self.start_ids["users"] + round(USERS * self.scale) + 1):
+            home = rng.choices(uni_ids, cum_weights=uni_cum)[0]
+            role = rng.choices(*self.roles)[0]
+            sink.add("users", (uid, f"synth_{uid}", PASSWORD_HASH, self.universities[home][0], role))
+
+            target = home if rng.random() < HOME_UNIVERSITY_SHARE else rng.choices(uni_ids, cum_weights=uni_cum)[0]
+            _, lids, cum, quality = self.universities[target]
+            k = min(MAX_REVIEWS_PER_USER, len(lids) // 2, max(1, int(rng.paretovariate(1.5) * review_scale)))
+
+            for lid in sorted(self._distinct(lids, cum, k)):
+                rid += 1
+                q_score, q_noise, q_kit = quality[lid]
+                comment = None
+                if rng.random() < COMMENT_SHARE:
+                    comment = f"{rng.choice(COMMENT_OPENINGS)} {rng.choice(COMMENT_DETAILS)}".strip()
+                sink.add("ratings", (
+                    rid,
+                    min(10, max(1, round(6.5 + 1.8 * q_score + rng.gauss(0, 1.5)))),
+                    self._review_date(),
+                    min(5, max(1, round(2.5 + q_noise + rng.gauss(0, 0.8)))),
+                    min(5, max(1, round(2.5 - 0.6 * q_score + rng.gauss(0, 0.8)))),
+                    min(3, max(1, round(2 - 0.6 * q_kit + rng.gauss(0, 0.5)))),
+                    min(3, max(1, round(1.8 - 0.4 * q_kit + rng.gauss(0, 0.6)))),
+                    comment,
+                    uid,
+                    lid,
+                ))
+                for tag in sorted(self._distinct(equipment, equipment_cum, rng.choices(range(5), [30, 25, 20, 15, 10])[0])):
+                    sink.add("rating_equipment", (rid, tag))
+                for tag in sorted(self._distinct(accessibility, accessibility_cum, rng.choices(range(3), [55, 30, 15])[0])):
+                    sink.add("rating_accessibility", (rid, tag))
+
+
+# ============================================================
+# Sinks
+# ============================================================
+class CountingSink:
+    """Dry run: row counts and a digest of every row, to check the output is deterministic."""
+
+    def __init__(self):
+        self.counts = dict.fromkeys(TABLES, 0)
+        self._digest = hashlib.sha256()
+
+    def add(self, table, row):
+        self.counts[table] += 1
+        self._digest.update(f"{table}{row!r}".encode("utf-8"))
+
+    def close(self):
+        pass
+
+    def digest(self):
+        return self._digest.hexdigest()[:16]
+
+
+class MySQLSink(CountingSink):
+    """Multi-row INSERTs of batch_size rows; all buffers are flushed (parents first) when one fills up."""
+
+    def __init__(self, conn, batch_size=5000):
+        super().__init__()
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_size = batch_size
+        self._buffers = {table: [] for table in TABLES}
+
+    def add(self, table, row):
+        super().add(table, row)
+        buffer = self._buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for table, rows in self._buffers.items():
+            if not rows:
+                continue
+            columns = TABLES[table]
+            placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+            self.cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([placeholders] * len(rows)),
+                [v for row in rows for v in row]
+            )
+            rows.clear()
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+
+
+def start_ids(cursor):
+    ids = {}
+    for table, column in (("university", "university_id"), ("location", "LID"), ("users", "uid"), ("ratings", "RID")):
+        cursor.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}")
+        ids[table] = cursor.fetchone()[0]
+    cursor.execute("SELECT MAX(CAST(SUBSTRING(username, 7) AS UNSIGNED)) FROM users WHERE username LIKE 'synth\\_%'")
+    # usernames are synth_<uid>; never reuse one from an earlier load
+    ids["users"] = max(ids["users"], cursor.fetchone()[0] or 0)
+    cursor.execute("SELECT name, state FROM university")
+    return ids, cursor.fetchall()
+
+
+def connect():
+    import dotenv
+    import mysql.connector
+    dotenv.load_dotenv(dotenv_path=".env")
+    return mysql.connector.connect(
+        host="localhost",
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database="campus_insider"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="scale factor (1 = about 310k rows)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mysql", action="store_true", help="load into the database configured in .env")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT")
+    parser.add_argument("--checks", action="store_true", help="keep FK / unique checks on while loading")
+    parser.add_argument("--skip-summary", action="store_true", help="don't rebuild location_rating_summary")
+    args = parser.parse_args()
+
+    conn = None
+    if args.mysql:
+        conn = connect()
+        cursor = conn.cursor()
+        ids, taken = start_ids(cursor)
+        if not args.checks:
+            cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        # Location rows are written with their type columns (see TABLES)
+        cursor.execute("SET @skip_location_type_sync = 1")
+        sink = MySQLSink(conn, args.batch_size)
+    else:
+        ids, taken = None, ()
+        sink = CountingSink()
+
+    started = time.perf_counter()
+    try:
+        DatasetGenerator(args.scale, args.seed, ids, taken).generate(sink)
+        sink.close()
+        elapsed = time.perf_counter() - started
+        total = sum(sink.counts.values())
+        for table, count in sink.counts.items():
+            print(f"{table:<22}{count:>12,}")
+        print(f"{'total':<22}{total:>12,}  in {elapsed:.1f}s ({total / elapsed * 60:,.0f} rows/min)  digest {sink.digest()}")
+
+        if conn is not None:
+            cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+            cursor.execute("SET @skip_location_type_sync = NULL")
+            if not args.skip_summary:
+                start = time.perf_counter()
+                cursor.callproc("RebuildLocationRatingSummary")
+                conn.commit()
+                print(f"Rebuilt location_rating_summary in {time.perf_counter() - start:.1f}s")
+            for table in TABLES:
+                cursor.execute(f"ANALYZE TABLE {table}")
+                cursor.fetchall()
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Load test for the API, run the same way against the Flask and the ASGI server.
+
+Each virtual user keeps one HTTP/1.1 keep-alive connection and loops over a
+mix of read endpoints (/api/university, /api/locationRatings,
+/api/locationSearch) for the given duration. A unique `_lt` query arg is
+added to every request so the response cache doesn't turn the run into a
+cache benchmark (pass --allow-cache to leave it on).
+
+Start both servers against the same database, e.g.
+    cd backend && python app.py                          # Flask, port 5000
+    cd backend && uvicorn asgi:application --port 8000   # ASGI
+
+then
+    python load_test.py --target flask=http://127.0.0.1:5000 \\
+                        --target asgi=http://127.0.0.1:8000 \\
+                        --concurrency 10,50,200 --duration 15
+"""
+import argparse
+import http.client
+import itertools
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+def build_paths(args):
+    university = {"name": args.university, "state": args.state}
+    return [
+        "/api/university?" + urlencode(university),
+        "/api/university?" + urlencode({**university, "limit": 50, "includeTotal": 1}),
+        "/api/locationRatings?" + urlencode({"location": args.location, "university": args.university}),
+        "/api/locationSearch?" + urlencode({"university": args.university, "state": args.state}),
+    ]
+
+
+def run_level(base_url, paths, concurrency, duration, allow_cache):
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + duration
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    errors = {}
+
+    def user(worker):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        mine = []
+        for i in itertools.cycle(range(len(paths))):
+            if time.monotonic() >= deadline:
+                break
+            path = paths[(i + worker) % len(paths)]
+            if not allow_cache:
+                path += f"&_lt={next(counter)}"
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as err:
+                status = type(err).__name__
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            elapsed = (time.perf_counter() - start) * 1000
+            if status == 200:
+                mine.append(elapsed)
+            else:
+                with lock:
+                    errors[status] = errors.get(status, 0) + 1
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=user, args=(w,)) for w in range(concurrency)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.monotonic() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2) if latencies else None
+
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="label=base_url, repeatable")
+    parser.add_argument("--concurrency", default="10,50,200", help="comma-separated virtual user counts")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency level")
+    parser.add_argument("--university", default="University of Southern Maine")
+    parser.add_argument("--state", default="Maine")
+    parser.add_argument("--location", default="Glickman Family Library")
+    parser.add_argument("--allow-cache", action="store_true", help="don't bust the response cache")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    paths = build_paths(args)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    results = {}
+
+    print(f"{'target':<10}{'users':>7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  errors")
+    for target in args.target:
+        label, _, url = target.partition("=")
+        results[label] = []
+        for concurrency in levels:
+            row = run_level(url, paths, concurrency, args.duration, args.allow_cache)
+            results[label].append(row)
+            print(f"{label:<10}{concurrency:>7}{row['req_per_s']:>10}{row['p50_ms']!s:>10}"
+                  f"{row['p95_ms']!s:>10}{row['p99_ms']!s:>10}  {row['errors'] or '-'}")
+
+    if len(results) > 1:
+        labels = list(results)
+        base = labels[0]
+        for other in labels[1:]:
+            for a, b in zip(results[base], results[other]):
+                if a["req_per_s"]:
+                    print(f"{other} vs {base} at {a['concurrency']} users: "
+                          f"{b['req_per_s'] / a['req_per_s']:.2f}x throughput")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
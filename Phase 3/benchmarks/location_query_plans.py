@@ -0,0 +1,162 @@
+"""
+Plan listing for /api/locationSearch (location_query.py).
+
+Prints the SQL generated for a set of representative filter combinations.
+The expected listing is checked in as location_query_plans.sql: --check exits
+with status 1 (showing a diff) when the builder's output drifts from it, and
+--update rewrites it after an intended change. With --mysql each query is also
+run through EXPLAIN against the database configured in .env; rows that use a
+full table scan, a temporary table or a filesort are flagged and make the run
+exit with status 1. backend/tests/test_location_query.py runs both checks.
+
+    python location_query_plans.py [--check | --update] [--mysql]
+"""
+import argparse
+import difflib
+import os
+import sys
+
+from werkzeug.datastructures import MultiDict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "backend"))
+
+from location_query import build_location_search, parse_filters, plan_cache_info  # noqa: E402
+
+GOLDEN = os.path.join(HERE, "location_query_plans.sql")
+UNIVERSITY = "University of Southern Maine"
+STATE = "Maine"
+
+FULL_RANGES = {
+    "scoreMin": 1, "scoreMax": 10, "noiseMin": 1, "noiseMax": 5,
+    "cleanlinessMin": 1, "cleanlinessMax": 5, "equipment_qualityMin": 1, "equipment_qualityMax": 3,
+    "wifi_strengthMin": 1, "wifi_strengthMax": 3,
+}
+
+# label -> (request args, LIDs from the name index or None)
+CASES = {
+    "university only": ({}, None),
+    "name query": ({}, [12, 7, 31]),
+    "buildings only": ({"types": "building,nonbuilding"}, None),
+    "rooms of one size": ({"types": "room", "roomSizes": "small"}, None),
+    "rooms by type and number": ({"types": "room", "roomTypes": "study,classroom", "roomNumber": "101"}, None),
+    "building and campus": ({"campus": "Portland", "building": "Glickman"}, None),
+    "rated only (full ranges)": ({"searchByRating": "1", **FULL_RANGES}, None),
+    "score >= 8": ({"searchByRating": "1", **FULL_RANGES, "scoreMin": 8}, None),
+    "tags": ({"searchByRating": "1", **FULL_RANGES,
+              "equipmentTags": ["whiteboard", "projector"], "accessibilityTags": ["elevator"]}, None),
+    "everything": ({"types": "room,building", "roomSizes": "small,medium", "building": "Library",
+                    "searchByRating": "1", **FULL_RANGES, "noiseMax": 2,
+                    "equipmentTags": ["outlets"]}, [3, 4, 5, 6, 7, 8, 9, 10, 11]),
+}
+
+
+def request_args(university, state, extra):
+    args = MultiDict({"university": university, "state": state})
+    for key, value in extra.items():
+        if isinstance(value, list):
+            args.setlist(key, value)
+        else:
+            args[key] = str(value)
+    return args
+
+
+def flags(row):
+    """Warnings for one EXPLAIN row (dictionary cursor)."""
+    found = []
+    if row.get("type") == "ALL":
+        found.append(f"full scan of {row.get('table')}")
+    extra = row.get("Extra") or ""
+    if "Using temporary" in extra:
+        found.append("temporary table")
+    if "Using filesort" in extra:
+        found.append("filesort")
+    return found
+
+
+def plans(university=UNIVERSITY, state=STATE):
+    """(label, sql, params) for every case."""
+    for label, (extra, lids) in CASES.items():
+        filters = parse_filters(request_args(university, state, extra), lids=lids)
+        yield (label, *build_location_search(filters))
+
+
+def listing(university=UNIVERSITY, state=STATE):
+    """The SQL and parameters of every case as text (the format of the golden file)."""
+    return "".join(f"-- {label}\n{sql};\n-- params: {params}\n\n" for label, sql, params in plans(university, state))
+
+
+def check_golden():
+    """Unified diff between the golden file and the current listing ('' when they match)."""
+    with open(GOLDEN, "r", encoding="utf-8") as f:
+        expected = f.read()
+    return "".join(difflib.unified_diff(expected.splitlines(True), listing().splitlines(True),
+                                        "location_query_plans.sql", "location_query.py"))
+
+
+def explain(cursor, university=UNIVERSITY, state=STATE):
+    """Yield (label, EXPLAIN row, problems) for every case (dictionary cursor)."""
+    for label, sql, params in plans(university, state):
+        cursor.execute("EXPLAIN " + sql, params)
+        for row in cursor.fetchall():
+            yield label, row, flags(row)
+
+
+def connect():
+    import dotenv
+    import mysql.connector
+    dotenv.load_dotenv(dotenv_path=".env")
+    return mysql.connector.connect(
+        host="localhost",
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database="campus_insider"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="exit 1 if the SQL differs from the golden file")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden file")
+    parser.add_argument("--mysql", action="store_true", help="EXPLAIN every plan against MySQL")
+    parser.add_argument("--university", default=UNIVERSITY)
+    parser.add_argument("--state", default=STATE)
+    args = parser.parse_args()
+
+    failed = False
+    if args.update:
+        with open(GOLDEN, "w", encoding="utf-8", newline="\n") as f:
+            f.write(listing())
+        print(f"wrote {GOLDEN}")
+    elif args.check:
+        diff = check_golden()
+        if diff:
+            print(diff)
+            print("-- the generated SQL differs from location_query_plans.sql (run with --update if intended)")
+            failed = True
+        else:
+            print("-- generated SQL matches location_query_plans.sql")
+    elif not args.mysql:
+        print(listing(args.university, args.state), end="")
+        print(f"-- plan cache: {plan_cache_info()}")
+
+    if args.mysql:
+        conn = connect()
+        warnings = 0
+        current = None
+        for label, row, problems in explain(conn.cursor(dictionary=True), args.university, args.state):
+            if label != current:
+                print(f"-- {label}")
+                current = label
+            warnings += bool(problems)
+            print(f"--   {row.get('table')!s:<8} type={row.get('type')!s:<7} key={row.get('key')!s:<28}"
+                  f" rows={row.get('rows')!s:<6}{'  !! ' + ', '.join(problems) if problems else ''}")
+        conn.close()
+        print(f"-- {warnings} EXPLAIN rows flagged")
+        failed = failed or warnings > 0
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
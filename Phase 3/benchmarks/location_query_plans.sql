@@ -0,0 +1,166 @@
+-- university only
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s);
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine'}
+
+-- name query
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.LID IN (%(lid_0)s, %(lid_1)s, %(lid_2)s, %(lid_3)s, %(lid_4)s, %(lid_5)s, %(lid_6)s, %(lid_7)s);
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'lid_0': 12, 'lid_1': 7, 'lid_2': 31, 'lid_3': 31, 'lid_4': 31, 'lid_5': 31, 'lid_6': 31, 'lid_7': 31}
+
+-- buildings only
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    NULL AS room_number,
+    NULL AS room_type,
+    NULL AS room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.location_type IN ('Building', 'Non-building');
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine'}
+
+-- rooms of one size
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.location_type IN ('Room')
+  AND R.room_size IN (%(size_0)s);
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'size_0': 'small'}
+
+-- rooms by type and number
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.location_type IN ('Room')
+  AND R.room_type IN (%(room_type_0)s, %(room_type_1)s)
+  AND R.room_number = %(room_number)s;
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'room_type_0': 'study', 'room_type_1': 'classroom', 'room_number': '101'}
+
+-- building and campus
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.campus_name LIKE %(campus)s
+  AND L.building_name LIKE %(building)s;
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'campus': '%Portland%', 'building': '%Glickman%'}
+
+-- rated only (full ranges)
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND EXISTS (SELECT 1 FROM location_rating_summary S WHERE S.LID = L.LID AND S.review_count > 0);
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine'}
+
+-- score >= 8
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND EXISTS (SELECT 1 FROM ratings R2 WHERE R2.LID = L.LID AND R2.score BETWEEN %(score_min)s AND %(score_max)s);
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'score_min': 8, 'score_max': 10}
+
+-- tags
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+LEFT JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND EXISTS (SELECT 1 FROM ratings R2 WHERE R2.LID = L.LID AND EXISTS (SELECT 1 FROM rating_equipment RE WHERE RE.RID = R2.RID AND RE.equipment_tag IN (%(equipment_0)s, %(equipment_1)s)) AND EXISTS (SELECT 1 FROM rating_accessibility RA WHERE RA.RID = R2.RID AND RA.accessibility_tag IN (%(accessibility_0)s)));
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'equipment_0': 'whiteboard', 'equipment_1': 'projector', 'accessibility_0': 'elevator'}
+
+-- everything
+SELECT
+    L.LID,
+    L.name AS location_name,
+    L.location_type,
+    R.room_number,
+    R.room_type,
+    R.room_size,
+    L.building_name,
+    L.campus_name
+FROM location L
+JOIN rooms R ON R.LID = L.LID
+WHERE L.university_id IN (SELECT U.university_id FROM university U WHERE U.name = %(university)s AND U.state = %(state)s)
+  AND L.LID IN (%(lid_0)s, %(lid_1)s, %(lid_2)s, %(lid_3)s, %(lid_4)s, %(lid_5)s, %(lid_6)s, %(lid_7)s, %(lid_8)s, %(lid_9)s, %(lid_10)s, %(lid_11)s, %(lid_12)s, %(lid_13)s, %(lid_14)s, %(lid_15)s)
+  AND L.location_type IN ('Building', 'Room')
+  AND R.room_size IN (%(size_0)s, %(size_1)s)
+  AND L.building_name LIKE %(building)s
+  AND EXISTS (SELECT 1 FROM ratings R2 WHERE R2.LID = L.LID AND R2.noise BETWEEN %(noise_min)s AND %(noise_max)s AND EXISTS (SELECT 1 FROM rating_equipment RE WHERE RE.RID = R2.RID AND RE.equipment_tag IN (%(equipment_0)s)));
+-- params: {'university': 'University of Southern Maine', 'state': 'Maine', 'lid_0': 3, 'lid_1': 4, 'lid_2': 5, 'lid_3': 6, 'lid_4': 7, 'lid_5': 8, 'lid_6': 9, 'lid_7': 10, 'lid_8': 11, 'lid_9': 11, 'lid_10': 11, 'lid_11': 11, 'lid_12': 11, 'lid_13': 11, 'lid_14': 11, 'lid_15': 11, 'size_0': 'small', 'size_1': 'medium', 'equipment_0': 'outlets', 'building': '%Library%', 'noise_min': 1, 'noise_max': 2}
+
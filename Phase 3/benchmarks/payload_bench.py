@@ -0,0 +1,164 @@
+"""
+Benchmark: JSON serialization time and bytes on the wire for large responses.
+
+Builds /api/university-shaped payloads (thousands of locations) and
+/api/reviews-shaped ones (with DATE values), then compares Flask's stdlib encoder with
+orjson (serialization.py) and the identity / gzip / brotli sizes and
+compression times (compression.py) of the result:
+
+    python payload_bench.py [--locations 500,5000,20000] [--rounds 20]
+
+With --url the same comparison is made against a running server instead: each
+path is fetched with every Accept-Encoding and the bytes received and the
+"serialize" entry of Server-Timing are reported (start the server once with
+JSON_SERIALIZER=stdlib and once without to compare serializers):
+
+    python payload_bench.py --url http://127.0.0.1:5000 \\
+        --path "/api/university?name=...&state=..." --path "/api/locationSearch?university=...&state=..."
+"""
+import argparse
+import datetime
+import http.client
+import os
+import re
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "backend"))
+
+from flask import Flask  # noqa: E402
+
+from compression import Compressor  # noqa: E402
+from instrumentation import TimedJSONProvider  # noqa: E402
+from serialization import OrjsonProvider, orjson  # noqa: E402
+
+SERVER_TIMING_SERIALIZE = re.compile(r"serialize;dur=([\d.]+)")
+
+
+def university_payload(n):
+    """Shape of /api/university with n locations (the same repetitive strings as real data)."""
+    locations = []
+    for i in range(n):
+        building = f"Building {i // 40}"
+        room = str(100 + i % 40)
+        locations.append({
+            "LID": i + 1,
+            "location_name": f"{building} - Room {room}",
+            "unformatted_name": f"{building} {room}",
+            "location_type": "Room",
+            "campus_name": "Main Campus",
+            "building_name": building,
+            "room_number": room,
+            "rating_summary": {"count": 3 + i % 17, "average_score": 6.5,
+                               "min_score": 1, "max_score": 10} if i % 3 else None,
+        })
+    return {
+        "university_info": [{"university_id": 1, "name": "Benchmark University", "state": "Maine",
+                             "wiki_url": "https://en.wikipedia.org/wiki/Benchmark_University"}],
+        "campuses": [{"campus_name": "Main Campus"}],
+        "locations": locations,
+    }
+
+
+def reviews_payload(n):
+    """Shape of /api/reviews with n reviews (dates as the driver returns them)."""
+    day = datetime.date(2025, 1, 1)
+    return {"reviews": [{
+        "RID": i + 1, "username": f"user{i % 500}", "role": "Student", "score": 1 + i % 10,
+        "noise": 1 + i % 5, "cleanliness": 1 + i % 5, "equipment_quality": 1 + i % 3, "wifi_strength": 1 + i % 3,
+        "comment": "Quiet in the mornings, the projector works and there are enough outlets.",
+        "date": day + datetime.timedelta(days=i % 365),
+        "equipment_tags": ["whiteboard", "projector"], "accessibility_tags": ["elevator_access"],
+    } for i in range(n)]}
+
+
+def median_ms(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3), result
+
+
+def run_local(args):
+    app = Flask(__name__)
+    providers = {"stdlib": TimedJSONProvider(app)}
+    if orjson is not None:
+        providers["orjson"] = OrjsonProvider(app)
+    else:
+        print("orjson is not installed; only the stdlib encoder is measured")
+    compressor = Compressor(min_size=0, level=args.level)
+
+    payloads = [(f"university ({n} locations)", university_payload(n)) for n in args.locations]
+    payloads += [(f"reviews ({n})", reviews_payload(n)) for n in args.reviews]
+
+    print(f"{'payload':<30}{'serializer':>11}{'dumps ms':>10}{'bytes':>11}"
+          + "".join(f"{e + ' bytes':>12}{e + ' ms':>9}" for e in compressor.encodings))
+    with app.app_context():
+        for label, payload in payloads:
+            baseline = None
+            for name, provider in providers.items():
+                ms, body = median_ms(lambda: provider.response(payload).get_data(), args.rounds)
+                line = f"{label:<30}{name:>11}{ms:>10}{len(body):>11}"
+                for encoding in compressor.encodings:
+                    enc_ms, compressed = median_ms(lambda: compressor.encode(body, encoding), max(1, args.rounds // 4))
+                    line += f"{len(compressed):>12}{enc_ms:>9}"
+                if baseline is None:
+                    baseline = ms
+                elif ms:
+                    line += f"  {baseline / ms:.1f}x faster"
+                print(line)
+
+
+def run_remote(args):
+    parts = urlsplit(args.url)
+    encodings = ["identity", "gzip", "br"]
+    print(f"{'path':<60}{'encoding':>10}{'bytes':>11}{'serialize ms':>14}{'total ms':>10}")
+    for path in args.path:
+        for encoding in encodings:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+            # Bust the response cache so the server serializes every time
+            samples, serialize, size, got = [], [], 0, None
+            for n in range(args.rounds):
+                sep = "&" if "?" in path else "?"
+                start = time.perf_counter()
+                conn.request("GET", f"{path}{sep}_pb={time.time_ns()}{n}", headers={"Accept-Encoding": encoding})
+                response = conn.getresponse()
+                size = len(response.read())
+                samples.append((time.perf_counter() - start) * 1000)
+                got = response.getheader("Content-Encoding") or "identity"
+                match = SERVER_TIMING_SERIALIZE.search(response.getheader("Server-Timing", ""))
+                if match:
+                    serialize.append(float(match.group(1)))
+            conn.close()
+            print(f"{path[:59]:<60}{got:>10}{size:>11}"
+                  f"{round(statistics.median(serialize), 2) if serialize else '-':>14}"
+                  f"{round(statistics.median(samples), 2):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", default="500,5000,20000", help="comma-separated location counts")
+    parser.add_argument("--reviews", default="1000", help="comma-separated review counts")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--level", type=int, default=6, help="compression level (COMPRESS_LEVEL)")
+    parser.add_argument("--url", help="measure a running server instead")
+    parser.add_argument("--path", action="append", default=[], help="path to fetch with --url, repeatable")
+    args = parser.parse_args()
+    args.locations = [int(n) for n in args.locations.split(",") if n]
+    args.reviews = [int(n) for n in args.reviews.split(",") if n]
+
+    if args.url:
+        if not args.path:
+            sys.exit("--url needs at least one --path")
+        run_remote(args)
+    else:
+        run_local(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Review submission throughput: reviews/second under concurrent submitters.
+
+Registers a pool of benchmark users, then posts /api/addReview from N
+concurrent keep-alive connections for every combination of
+
+  addressing  -- "name" (location + university, as the frontend sends it) or
+                 "LID" (the location's primary key)
+  tags        -- number of equipment + accessibility tags per review
+
+and reports reviews/s, p50/p95/p99 latency and SQL statements per review (from
+the Server-Timing header). Review n pairs user n % --users with location
+n // --users, so no (user, location) pair is rated twice; the run needs
+--users x (number of locations) to be at least the number of reviews it sends.
+
+It writes users and reviews, so point it at a throwaway database, e.g. one
+loaded by generate_dataset.py:
+    python review_write_bench.py --university "..." --state "..." --concurrency 1,10,50 --tags 0,4,12
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from endpoint_bench import Case, run_case
+
+
+def vocabulary(base_url, path):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    conn.request("GET", path)
+    body = json.loads(conn.getresponse().read())
+    conn.close()
+    return body["tags"]
+
+
+def locations(base_url, university, state):
+    """(name, LID) of every location of the university."""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    conn.request("GET", "/api/university?" + urlencode({"name": university, "state": state}))
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    if response.status != 200:
+        sys.exit(f"Could not load {university} ({state}): {body}")
+    return [(loc["unformatted_name"], loc["LID"]) for loc in body["locations"]]
+
+
+def review_case(name, users, targets, university, addressing, equipment, accessibility):
+    """addReview with `len(equipment) + len(accessibility)` tags, addressed by name or LID."""
+    def request(n):
+        location, lid = targets[(n // len(users)) % len(targets)]
+        body = {
+            "username": users[n % len(users)], "score": 1 + n % 10, "noise": 1 + n % 5,
+            "cleanliness": 1 + n % 5, "equipment_quality": 1 + n % 3, "wifi_strength": 1 + n % 3,
+            "comment": "benchmark review", "equipment_tags": equipment, "accessibility_tags": accessibility,
+        }
+        if addressing == "LID":
+            body["LID"] = lid
+        else:
+            body.update(location=location, university=university)
+        return "POST", "/api/addReview", body
+    return Case(name, request, write=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--university", default="University of Southern Maine")
+    parser.add_argument("--state", default="Maine")
+    parser.add_argument("--users", type=int, default=100, help="benchmark users to register")
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated numbers of submitters")
+    parser.add_argument("--reviews", type=int, default=200, help="reviews per case and level")
+    parser.add_argument("--tags", default="0,4,12", help="comma-separated tag counts per review")
+    parser.add_argument("--addressing", default="name,LID", help="'name', 'LID' or both")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    tag_counts = [int(t) for t in args.tags.split(",")]
+    addressing = args.addressing.split(",")
+
+    targets = locations(args.url, args.university, args.state)
+    equipment_vocab = vocabulary(args.url, "/api/equipmentTags")
+    accessibility_vocab = vocabulary(args.url, "/api/accessibilityTags")
+
+    total = len(levels) * len(tag_counts) * len(addressing) * args.reviews
+    if total > args.users * len(targets):
+        sys.exit(f"{total} reviews need more (user, location) pairs than {args.users} users x "
+                 f"{len(targets)} locations; raise --users")
+
+    # Users to review as
+    run_id = format(int(time.time()), "x")
+    users = []
+    register = Case("register", lambda n: ("POST", "/api/register", {
+        "username": f"rw_{run_id}_{n}", "password": "benchmark", "role": "Student",
+        "university": args.university, "state": args.state,
+    }), write=True, on_success=lambda n, body: users.append(f"rw_{run_id}_{n}"))
+    run_case(args.url, register, 10, args.users, 0, True)
+    if not users:
+        sys.exit("Could not register any benchmark users")
+    users.sort()
+
+    results = {}
+    first = 0
+    print(f"{'case':<32}{'submitters':>11}{'reviews/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'queries':>9}  errors")
+    for mode in addressing:
+        for n_tags in tag_counts:
+            # Split the tags between the two tables, as a reviewer would
+            equipment = equipment_vocab[:(n_tags + 1) // 2]
+            accessibility = accessibility_vocab[:n_tags // 2]
+            name = f"addReview ({mode}, {n_tags} tags)"
+            case = review_case(name, users, targets, args.university, mode, equipment, accessibility)
+            results[name] = []
+            for concurrency in levels:
+                row = run_case(args.url, case, concurrency, args.reviews, first, True)
+                first += args.reviews
+                results[name].append(row)
+                print(f"{name:<32}{concurrency:>11}{row['req_per_s']:>11}{row['p50_ms']!s:>9}"
+                      f"{row['p95_ms']!s:>9}{row['p99_ms']!s:>9}{row['queries']!s:>9}  {row['errors'] or '-'}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
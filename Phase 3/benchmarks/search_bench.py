@@ -0,0 +1,128 @@
+"""
+Benchmark: trigram search index vs. the old LIKE '%q%' path for university search.
+
+Uses the full US_Colleges.json dataset for the index and runs the real
+/api/search LIKE query against the database configured in .env (load it with
+the Phase 2 scripts first). Without a database, --scan emulates the LIKE path
+with an in-process substring scan instead; that only shows the cost of the
+matching itself, not of MySQL's full table scan, so quote the default numbers.
+
+    python search_bench.py [--scan] [--rounds 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "backend"))
+
+from text_search import SearchIndexes  # noqa: E402
+
+DATA = os.path.join(HERE, "..", "..", "Phase 2", "web-scraping", "data", "US_Colleges.json")
+
+# What a user types into the Register page autocomplete, keystroke by keystroke
+QUERIES = [
+    "u", "un", "uni", "univ", "university of s", "university of southern m",
+    "southern maine", "mit", "harv", "stanfrd", "comunity college", "texas a&m",
+    "college of", "institute of technology", "new york", "bowdoin",
+]
+
+LIKE_SQL = """
+    SELECT DISTINCT u.name AS university, u.state
+    FROM university u
+    LEFT JOIN campus c ON u.university_id = c.university_id
+    WHERE u.name LIKE %s
+    LIMIT 20
+"""
+
+
+def load_rows():
+    with open(DATA, "r", encoding="utf-8") as f:
+        colleges = json.load(f)
+    return [
+        {"university_id": i, "name": c["name"].strip(), "state": c["state"].strip()}
+        for i, c in enumerate(colleges, 1)
+    ]
+
+
+def time_queries(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        for q in QUERIES:
+            start = time.perf_counter()
+            fn(q)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scan", action="store_true",
+                        help="emulate the LIKE path in process instead of querying MySQL")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = load_rows()
+    print(f"Dataset: {len(rows)} universities from US_Colleges.json")
+
+    start = time.perf_counter()
+    index = SearchIndexes(lambda since: [r for r in rows if r["university_id"] > since],
+                          lambda since: [], ttl=10 ** 9, poll=10 ** 9)
+    index.refresh_if_stale()
+    print(f"Index build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    trigram = time_queries(lambda q: index.search_universities(q, limit=20), args.rounds)
+
+    if not args.scan:
+        import dotenv
+        import mysql.connector
+        dotenv.load_dotenv(dotenv_path=".env")
+        conn = mysql.connector.connect(
+            host="localhost",
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            database="campus_insider"
+        )
+        cursor = conn.cursor()
+
+        def like(q):
+            cursor.execute(LIKE_SQL, (f"%{q}%",))
+            return [{"name": name, "state": state} for name, state in cursor.fetchall()]
+
+        label = "LIKE (MySQL)"
+    else:
+        def like(q):
+            needle = q.lower()
+            out = []
+            for row in rows:
+                if needle in row["name"].lower():
+                    out.append(row)
+                    if len(out) == 20:
+                        break
+            return out
+
+        label = "LIKE (in-process scan)"
+
+    like_stats = time_queries(like, args.rounds)
+
+    print(f"{'path':<26}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name, stats in ((label, like_stats), ("trigram index", trigram)):
+        print(f"{name:<26}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['mean_ms']:>10}")
+
+    # Relevance spot check: what each path returns for a misspelled query
+    q = "univ of sothern main"
+    print(f"\nTop 3 for '{q}':")
+    print("  trigram:", [r["name"] for r in index.search_universities(q, limit=3)])
+    print("  LIKE:   ", [r["name"] for r in like(q)[:3]] or "no results")
+
+
+if __name__ == "__main__":
+    main()
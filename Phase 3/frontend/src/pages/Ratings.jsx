@@ -20,6 +20,9 @@ const Ratings = () => {
 
   const [ratings, setRatings] = useState([]);
   const [locationInfo, setLocationInfo] = useState(null);
+  const [summary, setSummary] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null); // reviews are loaded a page at a time
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [message, setMessage] = useState(null);
   const [showForm, setShowForm] = useState(false); // <-- NEW
@@ -39,20 +42,26 @@ const Ratings = () => {
     comment: "testing comment",
   });
 
-  // Fetch ratings
+  const REVIEWS_PER_PAGE = 20;
+
+  const ratingsUrl = (cursor) =>
+    `/api/locationRatings?location=${encodeURIComponent(
+      locationName
+    )}&university=${encodeURIComponent(universityName)}&limit=${REVIEWS_PER_PAGE}` +
+    (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+
+  // Fetch the location, its rating summary and the first page of reviews
   useEffect(() => {
     if (!locationName || !universityName) return;
 
     setLoading(true);
-    fetch(
-      `/api/locationRatings?location=${encodeURIComponent(
-        locationName
-      )}&university=${encodeURIComponent(universityName)}`
-    )
+    fetch(ratingsUrl(null))
       .then((res) => res.json())
       .then((data) => {
         setLocationInfo(data.location);
+        setSummary(data.summary);
         setRatings(data.ratings || []);
+        setNextCursor(data.next_cursor || null);
         setLoading(false);
       })
       .catch((err) => {
@@ -61,6 +70,26 @@ const Ratings = () => {
       });
   }, [locationName, universityName]);
 
+  // Next page of reviews
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+
+    setLoadingMore(true);
+    fetch(ratingsUrl(nextCursor))
+      .then((res) => res.json())
+      .then((data) => {
+        if (data.error) throw new Error(data.error);
+        const shown = new Set(ratings.map((r) => r.RID));
+        setRatings([...ratings, ...(data.ratings || []).filter((r) => !shown.has(r.RID))]);
+        setNextCursor(data.next_cursor || null);
+        setLoadingMore(false);
+      })
+      .catch((err) => {
+        console.error(err);
+        setLoadingMore(false);
+      });
+  };
+
   // Submit new review
   const handleSubmitReview = (e) => {
     e.preventDefault();
@@ -92,6 +121,7 @@ const Ratings = () => {
         // Server MUST return user role in `data.role`
         const newEntry = {
           ...payload,
+          RID: data.RID,
           role: user.role, // <-- NEW
         };
 
@@ -104,15 +134,16 @@ const Ratings = () => {
       });
   };
 
-  // Compute average score
+  // Average score: from the summary, since only some of the reviews are loaded
   const totalScore =
-    ratings.length === 0
+    summary?.average?.score ??
+    (ratings.length === 0
       ? 0
       : Math.round(
           (ratings.reduce((sum, r) => sum + Number(r.score), 0) /
             ratings.length) *
             100
-        ) / 100;
+        ) / 100);
   function formatTag(tag) {
     return tag.replace(/_/g, " ");
   }
@@ -265,6 +296,15 @@ const Ratings = () => {
   </div>
 ))}
 
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="w-full px-6 py-3 bg-white/10 hover:bg-white/20 rounded-xl border border-white/20"
+            >
+              {loadingMore ? "Loading..." : "Load more reviews"}
+            </button>
+          )}
         </div>
 
         {/* === Add Review Section Toggle Button === */}
@@ -24,7 +24,7 @@ const Register = () => {
 
   const navigate = useNavigate();
 
-  // Hit /api/search as user types
+  // Hit /api/universities/suggest as user types
   const handleSearch = async (q) => {
     setUniversityQuery(q);
 
@@ -34,7 +34,7 @@ const Register = () => {
     }
 
     try {
-      const res = await fetch(`/api/search?q=${encodeURIComponent(q)}`);
+      const res = await fetch(`/api/universities/suggest?q=${encodeURIComponent(q)}`);
       const data = await res.json();
       setUniversityResults(data.results || []);
     } catch (err) {
@@ -52,7 +52,7 @@ const Register = () => {
       return;
     }
   
-    const res = await fetch(`/api/search?q=${encodeURIComponent(value)}`);
+    const res = await fetch(`/api/universities/suggest?q=${encodeURIComponent(value)}`);
     const data = await res.json();
     setUniversityResults(data.results || []);
   };